@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Columnar (Parquet) analytics export of candidate data.
+
+Candidate records and their flattened technical responses are written as
+two Hive-partitioned Parquet datasets with typed columns and
+dictionary-encoded categorical columns (tech names, status, difficulty):
+
+    analytics/candidates/date=YYYY-MM-DD/part-<run>.parquet
+    analytics/responses/date=YYYY-MM-DD/part-<run>.parquet
+
+Each run appends one part per day for records saved since the previous run,
+so analytical scans read only the columns and days they need. A candidate
+saved again later appears again with a higher version; load_candidates()
+keeps the latest version of each record.
+
+Requires the optional pyarrow package (pip install pyarrow).
+
+Usage:
+    python analytics_export.py export [--full]
+    python analytics_export.py summary [--since 2025-07-01]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+WATERMARK_FILE = "_watermark.json"
+
+
+def _require_pyarrow() -> Any:
+    """Import pyarrow, explaining how to install it if it is missing."""
+    try:
+        import pyarrow
+        import pyarrow.dataset  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ImportError("The analytics export needs pyarrow. Run: pip install pyarrow")
+    return pyarrow
+
+
+def _schemas() -> Dict[str, Any]:
+    """Arrow schemas of the candidates and responses datasets."""
+    pa = _require_pyarrow()
+    category = pa.dictionary(pa.int16(), pa.string())
+    return {
+        "candidates": pa.schema([
+            ("candidate_key", pa.string()),
+            ("email", pa.string()),
+            ("session_id", pa.string()),
+            ("version", pa.int32()),
+            ("name", pa.string()),
+            ("phone", pa.string()),
+            ("experience", pa.string()),
+            ("experience_years", pa.float32()),
+            ("position", pa.string()),
+            ("location", category),
+            ("interview_status", category),
+            ("submission_time", pa.timestamp("s")),
+            ("tech_stack", pa.list_(category)),
+            ("questions_answered", pa.int16()),
+        ]),
+        "responses": pa.schema([
+            ("candidate_key", pa.string()),
+            ("version", pa.int32()),
+            ("submission_time", pa.timestamp("s")),
+            ("question_number", pa.int16()),
+            ("technology", category),
+            ("difficulty", category),
+            ("question", pa.string()),
+            ("answer", pa.string()),
+        ]),
+    }
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+
+
+def flatten_record(record: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Flatten a candidate record into one candidates row and one row per answered question.
+
+    Args:
+        record: Candidate record
+
+    Returns:
+        Dict: {"candidates": [row], "responses": [rows]}
+    """
+    from candidate_index import _tech_list, parse_experience_years
+    from candidate_store import candidate_key
+
+    key = candidate_key(record)
+    submitted = _parse_time(record.get("submission_time"))
+    version = record.get("version", 1)
+    responses = []
+    for name, response in (record.get("technical_responses") or {}).items():
+        number = "".join(ch for ch in name if ch.isdigit())
+        responses.append({
+            "candidate_key": key,
+            "version": version,
+            "submission_time": submitted,
+            "question_number": int(number) if number else None,
+            "technology": response.get("technology") or None,
+            "difficulty": response.get("difficulty") or None,
+            "question": response.get("question"),
+            "answer": response.get("answer"),
+        })
+    return {
+        "candidates": [{
+            "candidate_key": key,
+            "email": str(record.get("email", "")).strip().lower() or None,
+            "session_id": record.get("session_id"),
+            "version": version,
+            "name": record.get("name"),
+            "phone": record.get("phone"),
+            "experience": record.get("experience"),
+            "experience_years": parse_experience_years(record.get("experience")),
+            "position": record.get("position"),
+            "location": record.get("location") or None,
+            "interview_status": record.get("interview_status") or None,
+            "submission_time": submitted,
+            "tech_stack": _tech_list(record.get("tech_stack")),
+            "questions_answered": len(responses),
+        }],
+        "responses": responses,
+    }
+
+
+class AnalyticsExporter:
+    """
+    Appends candidate records to day-partitioned Parquet datasets.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Root directory of the datasets
+        """
+        self.directory = directory
+        self.watermark_path = os.path.join(directory, WATERMARK_FILE)
+
+    def _read_watermark(self) -> Tuple[str, Set[str]]:
+        """Return the newest exported submission time and the records exported at that second."""
+        if not os.path.exists(self.watermark_path):
+            return "", set()
+        with open(self.watermark_path, "r") as f:
+            watermark = json.load(f)
+        return watermark.get("submission_time", ""), set(watermark.get("records", []))
+
+    def _write_watermark(self, submission_time: str, records: Set[str]) -> None:
+        temp_path = self.watermark_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"submission_time": submission_time, "records": sorted(records), "exported_at": time.time()}, f)
+        os.replace(temp_path, self.watermark_path)
+
+    def export(self, records: Iterable[Dict[str, Any]], full: bool = False) -> Dict[str, int]:
+        """
+        Append records saved since the last export, one Parquet part per day.
+
+        Args:
+            records: Candidate records (e.g. the candidate store's latest versions)
+            full: Drop the datasets and export everything again
+
+        Returns:
+            Dict: Exported candidate rows, response rows and day partitions
+        """
+        pa = _require_pyarrow()
+        import pyarrow.parquet as pq
+        from candidate_store import candidate_key
+
+        if full and os.path.exists(self.directory):
+            shutil.rmtree(self.directory)
+        os.makedirs(self.directory, exist_ok=True)
+        watermark, boundary = self._read_watermark()
+        schemas = _schemas()
+
+        # day -> dataset -> rows
+        days = {}
+        newest, newest_records = watermark, set(boundary)
+        for record in records:
+            submission_time = str(record.get("submission_time", ""))
+            if submission_time < watermark or _parse_time(submission_time) is None:
+                continue
+            record_id = f"{candidate_key(record)}@{record.get('version', 1)}"
+            if submission_time == watermark and record_id in boundary:
+                continue
+            if submission_time > newest:
+                newest, newest_records = submission_time, set()
+            if submission_time == newest:
+                newest_records.add(record_id)
+            rows = flatten_record(record)
+            day = days.setdefault(submission_time[:10], {"candidates": [], "responses": []})
+            day["candidates"].extend(rows["candidates"])
+            day["responses"].extend(rows["responses"])
+
+        run = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        counts = {"candidates": 0, "responses": 0, "days": len(days)}
+        for day, datasets in sorted(days.items()):
+            for dataset, rows in datasets.items():
+                if not rows:
+                    continue
+                partition = os.path.join(self.directory, dataset, f"date={day}")
+                os.makedirs(partition, exist_ok=True)
+                table = pa.Table.from_pylist(rows, schema=schemas[dataset])
+                pq.write_table(table, os.path.join(partition, f"part-{run}.parquet"), compression="zstd")
+                counts[dataset] += len(rows)
+
+        if newest_records != boundary or newest != watermark:
+            self._write_watermark(newest, newest_records)
+        return counts
+
+    def dataset(self, name: str) -> Any:
+        """
+        Open an exported dataset with its day partitions.
+
+        Args:
+            name: "candidates" or "responses"
+
+        Returns:
+            pyarrow.dataset.Dataset: Lazily scanned dataset
+        """
+        pa = _require_pyarrow()
+        import pyarrow.dataset as ds
+
+        schema = _schemas()[name].append(pa.field("date", pa.string()))
+        return ds.dataset(os.path.join(self.directory, name), format="parquet", partitioning="hive", schema=schema)
+
+    def load_candidates(
+        self,
+        columns: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> Any:
+        """
+        Read the latest version of every candidate record.
+
+        Only the requested columns and the day partitions in range are read.
+
+        Args:
+            columns: Columns to read (default: all)
+            since: First day to include ("YYYY-MM-DD")
+            until: Last day to include ("YYYY-MM-DD")
+
+        Returns:
+            pyarrow.Table: One row per candidate record
+        """
+        pa = _require_pyarrow()
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+
+        expression = None
+        if since:
+            expression = ds.field("date") >= since
+        if until:
+            upper = ds.field("date") <= until
+            expression = upper if expression is None else expression & upper
+
+        wanted = list(columns or _schemas()["candidates"].names)
+        read_columns = list(dict.fromkeys(wanted + ["candidate_key", "version"]))
+        table = self.dataset("candidates").to_table(columns=read_columns, filter=expression)
+
+        # A record exported again after a later save keeps only its newest version
+        latest = table.group_by("candidate_key").aggregate([("version", "max")])
+        if latest.num_rows != table.num_rows:
+            rows = pa.table({
+                "candidate_key": table["candidate_key"],
+                "version": table["version"],
+                "row": pa.array(range(table.num_rows), pa.int64())
+            }).join(latest, keys=["candidate_key"])
+            keep = rows.filter(pc.equal(rows["version"], rows["version_max"]))["row"]
+            # The join shuffles rows: take the kept row ids back in file order
+            table = table.take(keep.take(pc.sort_indices(keep)))
+        return table.select(wanted)
+
+
+def summarize(exporter: AnalyticsExporter, since: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Compute the recruiting dashboard aggregates from the candidates dataset.
+
+    Args:
+        exporter: Exporter whose datasets are read
+        since: First day to include ("YYYY-MM-DD")
+
+    Returns:
+        Dict: Candidate count, completion rate, tech frequency and experience distribution
+    """
+    import pyarrow.compute as pc
+
+    table = exporter.load_candidates(["interview_status", "tech_stack", "experience_years"], since=since)
+    total = table.num_rows
+    statuses = pc.value_counts(table["interview_status"].cast("string")).to_pylist()
+    complete = sum(item["counts"] for item in statuses if item["values"] == "complete")
+    techs = pc.value_counts(pc.list_flatten(table["tech_stack"]).cast("string")).to_pylist()
+    years = [value for value in table["experience_years"].to_pylist() if value is not None]
+    buckets = {"0-1": 0, "2-4": 0, "5-9": 0, "10+": 0}
+    for value in years:
+        bucket = "0-1" if value < 2 else "2-4" if value < 5 else "5-9" if value < 10 else "10+"
+        buckets[bucket] += 1
+    return {
+        "candidates": total,
+        "completion_rate": complete / total if total else 0.0,
+        "statuses": {item["values"]: item["counts"] for item in statuses},
+        "tech_frequency": dict(sorted(((item["values"], item["counts"]) for item in techs), key=lambda kv: -kv[1])),
+        "experience_years": buckets,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from config import ANALYTICS_EXPORT_DIR
+
+    parser = argparse.ArgumentParser(description="Export candidate data to Parquet for analytics.")
+    parser.add_argument("--path", default=ANALYTICS_EXPORT_DIR, help="Analytics dataset directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Append records saved since the last export")
+    export_parser.add_argument("--full", action="store_true", help="Rebuild the datasets from scratch")
+
+    summary_parser = subparsers.add_parser("summary", help="Print tech frequency, experience and completion stats")
+    summary_parser.add_argument("--since", help="First day to include (YYYY-MM-DD)")
+
+    args = parser.parse_args(argv)
+    try:
+        _require_pyarrow()
+    except ImportError as e:
+        print(f"[ERROR] {e}")
+        return 1
+    exporter = AnalyticsExporter(args.path)
+
+    if args.command == "export":
+        from candidate_store import open_candidate_store_reader
+
+        started = time.perf_counter()
+        counts = exporter.export(open_candidate_store_reader().scan(), full=args.full)
+        print(f"Exported {counts['candidates']} candidates and {counts['responses']} responses "
+              f"across {counts['days']} days in {time.perf_counter() - started:.2f}s")
+        return 0
+
+    print(json.dumps(summarize(exporter, since=args.since), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,35 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import re
 import time
 import json
+import functools
 import os
+import uuid
 from datetime import datetime
 from chatbot import ConversationManager
-from config import EXIT_KEYWORDS, store_user_data
+from config import (
+    EXIT_KEYWORDS,
+    VALID_TECHNOLOGIES,
+    SESSION_CHECKPOINT_DIR,
+    SESSION_CHECKPOINT_FSYNC,
+    SHOW_RENDER_STATS,
+    SHOW_SESSION_STATS,
+    SESSION_SWEEP_INTERVAL_SECONDS,
+    MESSAGE_HTML_MEMO_SIZE
+)
+from candidate_index import get_candidate_index
+from candidate_store import candidate_key as candidate_key_for, get_candidate_store
+from llm_backend import start_llm_warm_up
+from session_checkpoint import SessionCheckpoint, is_valid_session_id
+from questions import TechnicalQuestion
+from session_model import Message, Role, Transcript, deep_sizeof
+from session_registry import get_session_registry
+from utils import format_message_html
+from write_behind import QueueFullError, get_write_behind_queue
+
+# Render times kept per scope for the render stats
+RENDER_TIME_SAMPLES = 50
 
 # Set page config
 st.set_page_config(
@@ -139,10 +163,27 @@ p, div, span, h1, h2, h3, h4, h5, h6 {
 
 def initialize_session():
     """Initialize session state variables."""
+    if 'session_id' not in st.session_state:
+        # Resume the interview named in the URL after a reconnect or a worker restart
+        session_id = st.query_params.get("session")
+        if not (is_valid_session_id(session_id) and restore_session(session_id)):
+            # Identifies this interview; saves of the same session are versions of one record
+            st.session_state.session_id = uuid.uuid4().hex
+            st.query_params["session"] = st.session_state.session_id
+    if 'checkpoint' not in st.session_state:
+        st.session_state.checkpoint = SessionCheckpoint(
+            SESSION_CHECKPOINT_DIR, st.session_state.session_id, fsync=SESSION_CHECKPOINT_FSYNC
+        )
     if 'conversation_manager' not in st.session_state:
         st.session_state.conversation_manager = ConversationManager()
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+    if 'message_html' not in st.session_state:
+        # Rendered HTML of recently shown transcript messages, by position
+        st.session_state.message_html = {}
+    if 'settled_messages' not in st.session_state:
+        # Messages rendered by the last full app run (the chat fragment renders the rest)
+        st.session_state.settled_messages = 0
+    if 'render_times' not in st.session_state:
+        st.session_state.render_times = {}
     if 'user_input' not in st.session_state:
         st.session_state.user_input = ""
     if 'session_started' not in st.session_state:
@@ -157,17 +198,172 @@ def initialize_session():
         st.session_state.current_question_index = 0
     if 'reviewing_answers' not in st.session_state:
         st.session_state.reviewing_answers = False
-    if 'user_data' not in st.session_state:
-        st.session_state.user_data = {
-            "name": "",
-            "email": "",
-            "phone": "",
-            "experience": "",
-            "tech_stack": [],
-            
-            "submission_time": "",
-            "interview_status": "incomplete"
-        }
+    if 'profile_hints' not in st.session_state:
+        # Details extracted from free text for fields the conversation has not collected yet
+        st.session_state.profile_hints = {}
+    if 'interview_status' not in st.session_state:
+        st.session_state.interview_status = "incomplete"
+
+
+def restore_session(session_id):
+    """
+    Rehydrate the session state from a session's checkpoint log.
+    Args:
+        session_id: Session to resume
+    Returns:
+        bool: True if the session had a checkpoint and was restored
+    """
+    checkpoint = SessionCheckpoint(SESSION_CHECKPOINT_DIR, session_id, fsync=SESSION_CHECKPOINT_FSYNC)
+    state = checkpoint.load()
+    if not state:
+        return False
+    # Logs written before per-field deltas hold one full "manager" snapshot
+    manager_state = dict(state.get("manager", {}))
+    manager_state.update(state.get("conversation", {}))
+    for name in ("candidate_info", "technical_questions", "question_responses"):
+        if name in state:
+            manager_state[name] = state[name]
+    manager = ConversationManager()
+    manager.restore_state(manager_state, Transcript.from_records(state.get("transcript", [])))
+    st.session_state.session_id = session_id
+    st.session_state.checkpoint = checkpoint
+    st.session_state.conversation_manager = manager
+    st.session_state.profile_hints = state.get("profile_hints", {})
+    st.session_state.technical_questions = list(manager.technical_questions)
+    st.session_state.technical_responses_input = state.get("technical_responses_input", {})
+    for key, value in state.get("session", {}).items():
+        st.session_state[key] = value
+    if st.session_state.get("interview_status") == "abandoned":
+        # The session was evicted while idle and the candidate came back
+        st.session_state.interview_status = "incomplete"
+    if st.session_state.get("conversation_ended") and not manager.is_active:
+        st.session_state.conversation_summary = manager.get_conversation_summary()
+    print(f"[DEBUG] Restored session {session_id} from its checkpoint")
+    return True
+
+
+def checkpoint_session(state=None):
+    """
+    Append what changed since the last checkpoint (new messages, answers, moved fields)
+    to this session's checkpoint log.
+    Args:
+        state: Session state to checkpoint (default: the running session's)
+    """
+    state = st.session_state if state is None else state
+    checkpoint = state["checkpoint"]
+    manager = state["conversation_manager"]
+    # Only deltas: changed keys of the mappings, new items of the lists
+    checkpoint.update("conversation", {
+        "state": manager.state,
+        "current_info_field": manager.current_info_field,
+        "is_active": manager.is_active
+    })
+    checkpoint.update("candidate_info", manager.candidate_info)
+    checkpoint.append("technical_questions", manager.technical_questions, encode=TechnicalQuestion.to_dict)
+    checkpoint.update("question_responses", manager.question_responses)
+    checkpoint.append("transcript", manager.transcript, encode=Message.to_record)
+    checkpoint.set("profile_hints", state["profile_hints"])
+    checkpoint.update("technical_responses_input", state["technical_responses_input"])
+    checkpoint.update("session", {
+        "session_started": state["session_started"],
+        "conversation_ended": state["conversation_ended"],
+        "current_question_index": state["current_question_index"],
+        "interview_status": state["interview_status"]
+    })
+    try:
+        checkpoint.commit()
+    except OSError as e:
+        print("[ERROR] Failed to checkpoint session:", e)
+
+
+def running_session_state():
+    """
+    Get the running session's own state object.
+    st.session_state resolves to whichever session runs on the calling thread, so
+    the session registry keeps this object to evict the session from other threads.
+    Returns:
+        The session's state mapping
+    """
+    ctx = get_script_run_ctx()
+    return ctx.session_state if ctx is not None else st.session_state
+
+
+def session_memory(state=None):
+    """
+    Approximate the memory a session holds: its transcript, collected data, questions
+    and rendered message HTML. Objects shared by all sessions
+    (the LLM backend, the system prompt) are not counted.
+    Args:
+        state: Session state to measure (default: the running session's)
+    Returns:
+        int: Approximate bytes
+    """
+    state = st.session_state if state is None else state
+    manager = state["conversation_manager"]
+    return deep_sizeof([
+        manager.transcript,
+        manager.candidate_info,
+        manager.technical_questions,
+        manager.question_responses,
+        state["message_html"],
+        state["technical_responses_input"],
+        state["profile_hints"]
+    ], set())
+
+
+def evict_session(session_id, state):
+    """
+    Drop an idle session from memory the way reset_session does, but keep its checkpoint.
+    An interview in progress is saved as abandoned and checkpointed, so the candidate
+    can still resume it from the URL. Called from another session's run or the
+    sweeper thread, so it only uses the given state.
+    Args:
+        session_id: Session to evict
+        state: The session's state, from running_session_state()
+    """
+    try:
+        if state["session_id"] != session_id:
+            return
+    except KeyError:
+        # Already reset or evicted
+        return
+    if state["session_started"]:
+        if not state["conversation_ended"]:
+            state["interview_status"] = "abandoned"
+            save_user_data(state)
+        checkpoint_session(state)
+    keys = state.filtered_state if hasattr(state, "filtered_state") else state.keys()
+    for key in list(keys):
+        del state[key]
+
+
+def track_session():
+    """Record this session's activity and size (the background sweeper does the evicting)."""
+    registry = get_session_registry()
+    registry.start_sweeper(evict_session, SESSION_SWEEP_INTERVAL_SECONDS)
+    registry.touch(st.session_state.session_id, running_session_state(), session_memory())
+
+
+def session_run(func):
+    """
+    Mark the session as running while func runs, so the sweeper cannot evict it halfway.
+    A run that starts while its session is being evicted waits for the eviction, and
+    initialize_session then resumes the session from its checkpoint.
+    Args:
+        func: Script body or widget callback
+    Returns:
+        The wrapped function
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # The URL keeps the id when an eviction has already cleared the state
+        session_id = st.session_state.get("session_id") or st.query_params.get("session")
+        if not session_id:
+            # A new session: nothing to evict yet
+            return func(*args, **kwargs)
+        with get_session_registry().running(session_id):
+            return func(*args, **kwargs)
+    return wrapper
 
 
 def display_message(role, content, timestamp=None):
@@ -178,28 +374,61 @@ def display_message(role, content, timestamp=None):
         content: Message content
         timestamp: Optional timestamp for the message
     """
-    if timestamp is None:
-        timestamp = datetime.now().strftime("%H:%M:%S")
-    # Ensure content is properly formatted for HTML
-    content = content.replace("\n", "<br>")
-    if role == "user":
-        st.markdown(f"""
-        <div class="chat-message user">
-            <div class="message-content">
-                <b>You:</b> {content}
-            </div>
-            <div class="message-timestamp">{timestamp}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-        <div class="chat-message assistant">
-            <div class="message-content">
-                <b>Hiring Assistant:</b> {content}
-            </div>
-            <div class="message-timestamp">{timestamp}</div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(format_message_html(role, content, timestamp), unsafe_allow_html=True)
+
+
+def message_html(index):
+    """
+    Get the HTML of a transcript message, reusing it while the chat fragment reruns.
+    Messages are never edited once rendered, so their position identifies them.
+    The memo keeps at most MESSAGE_HTML_MEMO_SIZE messages and is cleared by every
+    full run, so it does not hold a second copy of the whole transcript.
+    Args:
+        index: Position of the message in the transcript
+    Returns:
+        str: HTML for st.markdown ("" for hidden messages)
+    """
+    memo = st.session_state.message_html
+    html = memo.get(index)
+    if html is None:
+        message = st.session_state.conversation_manager.transcript[index]
+        text = message.shown_text
+        role = "user" if message.role == Role.USER else "assistant"
+        html = format_message_html(role, text, message.timestamp) if text else ""
+        if len(memo) >= MESSAGE_HTML_MEMO_SIZE:
+            # Oldest entry first (dicts keep insertion order)
+            del memo[next(iter(memo))]
+        memo[index] = html
+    return html
+
+
+def display_messages(start, end):
+    """
+    Display a range of transcript messages.
+    Args:
+        start: Position of the first message
+        end: Position after the last message
+    """
+    for index in range(start, end):
+        html = message_html(index)
+        if html:
+            st.markdown(html, unsafe_allow_html=True)
+
+
+def record_render_time(scope, started):
+    """
+    Record how long a full app run or a chat fragment run took.
+    Args:
+        scope: "app" or "fragment"
+        started: time.perf_counter() value when the run started
+    """
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    samples = st.session_state.render_times.setdefault(scope, [])
+    samples.append(elapsed_ms)
+    del samples[:-RENDER_TIME_SAMPLES]
+    print(f"DEBUG: Rendered {scope} in {elapsed_ms:.1f} ms ({len(st.session_state.conversation_manager.transcript)} messages)")
+
+
 def extract_user_data(text):
     """
     Extract user data from text using keyword detection and simple heuristics.
@@ -334,56 +563,53 @@ def extract_user_data(text):
     return extracted_data
 def update_user_data(extracted_data):
     """
-    Update Streamlit session_state with extracted user data.
+    Update the profile hints with extracted user data.
     Merges tech stack and updates other fields without overwriting existing data.
+    Fields the conversation manager already collected are left to the manager.
     """
+    hints = st.session_state.profile_hints
+    collected = st.session_state.conversation_manager.candidate_info
+    for key in collected:
+        hints.pop(key, None)
     for key, value in extracted_data.items():
+        if key in collected:
+            continue
         # Always merge tech stack
         if key == "tech_stack" and isinstance(value, list):
-            existing_stack = st.session_state.user_data.get(key, [])
-            st.session_state.user_data[key] = list(set(existing_stack + value))
+            existing_stack = hints.get(key, [])
+            hints[key] = list(set(existing_stack + value))
         # Don't overwrite name if it already exists
-        elif key == "name" and st.session_state.user_data.get("name") and value:
+        elif key == "name" and hints.get("name") and value:
             # Only update if the existing name is very short (likely incomplete)
-            if len(st.session_state.user_data["name"].split()) < len(value.split()):
-                st.session_state.user_data[key] = value
+            if len(hints["name"].split()) < len(value.split()):
+                hints[key] = value
         # For other fields, only update if the value is meaningful
         elif value:
-            st.session_state.user_data[key] = value
+            hints[key] = value
+
+
+def candidate_profile(state=None):
+    """
+    Build the candidate's user data from the single copy of each field: what the
+    conversation manager collected, over hints extracted from free text.
+    Args:
+        state: Session state to read (default: the running session's)
+    Returns:
+        dict: Candidate fields and the interview status
+    """
+    state = st.session_state if state is None else state
+    profile = {"name": "", "email": "", "phone": "", "experience": "", "tech_stack": []}
+    profile.update(state["profile_hints"])
+    profile.update(state["conversation_manager"].candidate_info)
+    profile["interview_status"] = state["interview_status"]
+    return profile
 def validate_tech_stack(tech_stack_input):
     """
     Validates if the provided tech stack contains valid technologies.
     Returns (is_valid, recognized_techs).
     """
-    # Define a comprehensive list of valid technologies
-    valid_technologies = [
-        # Programming languages
-        "python", "javascript", "typescript", "java", "c#", "c++", "c", "ruby", "php", "swift", 
-        "kotlin", "go", "rust", "scala", "perl", "r", "dart", "lua", "haskell", "objective-c",
-        
-        # Web frameworks/libraries
-        "react", "angular", "vue", "svelte", "jquery", "express", "django", "flask", "spring", 
-        "asp.net", "laravel", "ruby on rails", "rails", "fastapi", "next.js", "nuxt", "gatsby",
-        
-        # Mobile frameworks
-        "react native", "flutter", "ionic", "xamarin", "android", "ios", "swift ui", "jetpack compose",
-        
-        # Databases
-        "sql", "mysql", "postgresql", "mongodb", "sqlite", "oracle", "sql server", "cassandra", 
-        "redis", "dynamodb", "firebase", "supabase", "neo4j", "couchdb", "mariadb",
-        
-        # Cloud/DevOps
-        "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "terraform", "jenkins", 
-        "circleci", "travis", "github actions", "gitlab ci", "ansible", "prometheus", "grafana",
-        
-        # AI/ML
-        "tensorflow", "pytorch", "scikit-learn", "keras", "pandas", "numpy", "matplotlib",
-        "machine learning", "deep learning", "nlp", "computer vision", "data science",
-        
-        # Other common tools/tech
-        "git", "linux", "node", "npm", "yarn", "webpack", "graphql", "rest", "soap",
-        "html", "css", "sass", "less", "bootstrap", "tailwind", "material ui"
-    ]
+    # Shared vocabulary of recognized technologies (also used by the question bank)
+    valid_technologies = VALID_TECHNOLOGIES
     
     # Normalize input
     if isinstance(tech_stack_input, str):
@@ -413,87 +639,108 @@ def validate_tech_stack(tech_stack_input):
     is_valid = match_percentage >= 0.25 and len(recognized_techs) > 0
     
     return is_valid, recognized_techs
-def save_user_data():
+def save_user_data(state=None):
     """
-    Save the user data to a JSON file.
-    Also insert the user data into Supabase.
+    Upsert the user data into the candidate store as a new version of this session's record.
+    Also queue changed versions for a batched Supabase upsert.
+    
+    Args:
+        state: Session state to save (default: the running session's)
+    
+    Returns:
+        str: Key of the saved candidate record
     """
-    # Create directory if it doesn't exist
-    data_dir = "user_data"
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-
+    state = st.session_state if state is None else state
     # Prepare data for saving
-    user_data = st.session_state.user_data.copy()
+    user_data = candidate_profile(state)
+    user_data["session_id"] = state["session_id"]
     
-    # Get current timestamp for submission time and filename
-    current_time = datetime.now()
-    user_data["submission_time"] = current_time.strftime("%Y-%m-%d %H:%M:%S")
-    # Restore date_str and time_str for filename formatting
-    date_str = current_time.strftime('%Y%m%d')
-    time_str = current_time.strftime('%H%M%S')
+    # Get current timestamp for submission time
+    user_data["submission_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     # Add technical responses
-    if st.session_state.technical_responses_input:
+    responses = state["technical_responses_input"]
+    if responses:
         technical_responses = {}
-        for i, question in enumerate(st.session_state.technical_questions):
+        for i, question in enumerate(state["technical_questions"]):
             response_key = f"response_{i}"
-            if response_key in st.session_state.technical_responses_input:
+            if response_key in responses:
                 technical_responses[f"question_{i+1}"] = {
-                    "question": question,
-                    "answer": st.session_state.technical_responses_input[response_key]
+                    "question": question.text,
+                    "technology": question.technology,
+                    "difficulty": question.difficulty,
+                    "answer": responses[response_key]
                 }
         user_data["technical_responses"] = technical_responses
 
-    # Insert into Supabase
+    # Repeated saves of unchanged data (exit, reset, manual save) write nothing
+    user_data, changed = get_candidate_store().upsert(user_data)
+    candidate_key = candidate_key_for(user_data)
+    if not changed:
+        print(f"[DEBUG] User data unchanged since version {user_data['version']}; skipping save")
+        return candidate_key
+
+    # The index can be rebuilt from the store, so a failure here must not stop the remote write
     try:
-        print("[DEBUG] Inserting user data into Supabase:", user_data)
-        store_user_data(user_data)
+        get_candidate_index().upsert(user_data)
     except Exception as e:
-        print("[ERROR] Failed to insert into Supabase:", e)
-
-    # Determine file name based on the requested format
-    if "email" in user_data and user_data["email"]:
-        # Convert email to lowercase as requested
-        email = user_data["email"].lower()
-        # Replace @ with "_at_" for better Windows compatibility
-        email = email.replace("@", "@")
-        # but it's not a good idea to use "@" in filenames, so we will replace it with "_at_"
-        filename = f"{email}_{date_str}_{time_str}.json"
-    elif "name" in user_data and user_data["name"]:
-        # Fallback to name-based filename if email is not available
-        name_part = user_data["name"].lower().replace(" ", "_")
-        filename = f"{name_part}_{date_str}_{time_str}.json"
-    else:
-        # Last resort fallback
-        filename = f"candidate_{date_str}_{time_str}.json"
+        print("[ERROR] Failed to index user data:", e)
 
-    # Save to file
-    file_path = os.path.join(data_dir, filename)
-    with open(file_path, 'w') as f:
-        json.dump(user_data, f, indent=4)
+    # Queue for a batched Supabase upsert; the background worker does the network call
+    try:
+        print("[DEBUG] Queueing user data for Supabase:", user_data)
+        get_write_behind_queue().submit(user_data)
+    except QueueFullError as e:
+        print("[ERROR] Failed to queue user data for Supabase:", e)
+    return candidate_key
 
-    return file_path
+def stream_response(stream, placeholder):
+    """
+    Render a streamed chatbot response into a placeholder as chunks arrive.
+    Args:
+        stream: Generator yielding response chunks and returning the final response
+        placeholder: Streamlit element used for the partial output
+    Returns:
+        str: The final response returned by the generator
+    """
+    partial = ""
+    while True:
+        try:
+            chunk = next(stream)
+        except StopIteration as stop:
+            return stop.value
+        partial += chunk
+        placeholder.markdown(partial + " ▌")
+@session_run
 def handle_user_input():
+    """Process user input from the text input field, then checkpoint the session."""
+    # The session may have been evicted while idle; resume it from its checkpoint
+    initialize_session()
+    was_ended = st.session_state.conversation_ended
+    _process_user_input()
+    checkpoint_session()
+    # Only the chat fragment reruns (it also refreshes the sidebar's user data);
+    # the export in the sidebar appears once, when the conversation ends
+    if st.session_state.conversation_ended != was_ended:
+        st.session_state.needs_full_rerun = True
+
+
+def _process_user_input():
     """Process user input from the text input field."""
     user_input = st.session_state.user_input
+    transcript = st.session_state.conversation_manager.transcript
     if user_input:
         # Check for exit keywords
         if any(keyword in user_input.lower() for keyword in EXIT_KEYWORDS):
             st.session_state.conversation_ended = True
             # Gracefully conclude the conversation
-            timestamp = datetime.now().strftime("%H:%M:%S")
             goodbye_message = (
                 "Thank you for taking the time to complete this interview. "
                 "We appreciate your interest in joining our team. We will review your responses "
                 "and get back to you shortly regarding the next steps."
             )
-            st.session_state.chat_history.append({
-                "role": "assistant",
-                "content": goodbye_message,
-                "timestamp": timestamp
-            })
-            st.session_state.user_data["interview_status"] = "complete"
+            transcript.add(Role.ASSISTANT, goodbye_message, context=False)
+            st.session_state.interview_status = "complete"
             save_user_data()
             st.session_state.user_input = ""
             return
@@ -502,37 +749,27 @@ def handle_user_input():
         extracted_data = extract_user_data(user_input)
         update_user_data(extracted_data)
 
-        # Add user message to chat history
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        st.session_state.chat_history.append({
-            "role": "user",
-            "content": user_input,
-            "timestamp": timestamp
-        })
-
-        # Process input and get response if conversation is active
-        if not st.session_state.conversation_ended:
+        # The conversation manager records the user message; after the end only the UI shows it
+        if st.session_state.conversation_ended:
+            transcript.add(Role.USER, user_input, context=False)
+        else:
             # Display thinking indicator
             thinking_placeholder = st.empty()
             thinking_placeholder.markdown("*Thinking...*")
             
             # Check if this is the last question about tech stack and user has confirmed their info
             is_tech_stack_confirmation = False
-            if len(st.session_state.chat_history) >= 2:
-                last_assistant_msg = None
-                for msg in reversed(st.session_state.chat_history):
-                    if msg["role"] == "assistant":
-                        last_assistant_msg = msg["content"]
-                        break
-                
-                # Check if the last message was asking for confirmation and user said yes
-                if last_assistant_msg and "Is this information correct?" in last_assistant_msg and user_input.lower() in ["yes", "correct", "that's right", "right"]:
-                    is_tech_stack_confirmation = True
+            last_assistant_msg = transcript.last(Role.ASSISTANT)
+            
+            # Check if the last message was asking for confirmation and user said yes
+            if last_assistant_msg and "Is this information correct?" in last_assistant_msg.content and user_input.lower() in ["yes", "correct", "that's right", "right"]:
+                is_tech_stack_confirmation = True
             
             # If user confirmed their info, validate tech stack before proceeding to technical questions
-            if is_tech_stack_confirmation and "tech_stack" in st.session_state.user_data:
+            candidate_info = st.session_state.conversation_manager.candidate_info
+            if is_tech_stack_confirmation and "tech_stack" in candidate_info:
                 # Validate the tech stack
-                tech_stack = st.session_state.user_data["tech_stack"]
+                tech_stack = candidate_info["tech_stack"]
                 
                 # Convert to string if it's a list
                 if isinstance(tech_stack, list):
@@ -554,13 +791,9 @@ def handle_user_input():
                     # Remove thinking indicator
                     thinking_placeholder.empty()
                     
-                    # Add response to chat history
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    st.session_state.chat_history.append({
-                        "role": "assistant",
-                        "content": invalid_tech_response,
-                        "timestamp": timestamp
-                    })
+                    # Show the exchange without adding it to the interview context
+                    transcript.add(Role.USER, user_input, context=False)
+                    transcript.add(Role.ASSISTANT, invalid_tech_response, context=False)
                     
                     # Clear input field and exit function early
                     st.session_state.user_input = ""
@@ -568,10 +801,13 @@ def handle_user_input():
                 
                 # Update tech stack with only recognized technologies
                 if recognized_techs:
-                    st.session_state.user_data["tech_stack"] = recognized_techs
+                    candidate_info["tech_stack"] = recognized_techs
             
-            # Get response from conversation manager
-            response = st.session_state.conversation_manager.process_input(user_input)
+            # Get response from conversation manager, rendering partial output as it streams in
+            response = stream_response(
+                st.session_state.conversation_manager.process_input_stream(user_input),
+                thinking_placeholder
+            )
             # Remove thinking indicator
             thinking_placeholder.empty()
 
@@ -581,71 +817,13 @@ def handle_user_input():
                 # Split response at the technical questions marker
                 clean_response = response.split("Here are your technical questions:")[0]
                 clean_response += "I've prepared some technical questions for you. I'll present them one by one."
-                # Add the modified response to chat history
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": clean_response,
-                    "timestamp": timestamp
-                })
-                
-                # Parse the questions and store them
-                questions_part = response.split("Here are your technical questions:")[1]
-                
-                # Extract questions - improved pattern to capture full questions
-                questions = []
-                # Split by numbered items
-                question_blocks = re.split(r'(\d+\.)', questions_part.strip())
-                if len(question_blocks) > 1:  # Skip the first empty item if present
-                    i = 1
-                    while i < len(question_blocks):
-                        if re.match(r'\d+\.', question_blocks[i]) and i+1 < len(question_blocks):
-                            # Combine number with text
-                            full_question = question_blocks[i] + question_blocks[i+1].strip()
-                            questions.append(full_question)
-                            i += 2
-                        else:
-                            i += 1
-                
-                # If the regex method failed, try a simpler approach
-                if not questions:
-                    question_lines = [line.strip() for line in questions_part.split('\n') if line.strip()]
-                    questions = []
-                    current_question = ""
-                    for line in question_lines:
-                        if re.match(r'^\d+\.', line):
-                            if current_question:
-                                questions.append(current_question)
-                            current_question = line
-                        elif current_question:
-                            current_question += " " + line
-                    if current_question:
-                        questions.append(current_question)
+                # Show the modified response; the questions are presented one by one instead
+                transcript[-1].display = clean_response
                 
-                # Clean up and store questions
-                clean_questions = []
-                for q in questions:
-                    # Remove assessment markers if needed but keep the main question
-                    # Extract just the question part from "1. **Question text** (Assessment note)"
-                    match = re.match(r'\d+\.\s+\*\*(.*?)\*\*\s*(?:\(.*?\))?', q)
-                    if match:
-                        clean_questions.append(match.group(1))
-                    else:
-                        # If no match, just use the whole question with minimal cleaning
-                        clean_q = re.sub(r'^\d+\.\s+', '', q)
-                        clean_questions.append(clean_q)
-                
-                # Store only if we have valid questions
-                if clean_questions:
-                    st.session_state.technical_questions = clean_questions
-            else:
-                # Regular response without technical questions
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": response,
-                    "timestamp": timestamp
-                })
+                # The conversation manager already holds the parsed questions
+                questions = st.session_state.conversation_manager.technical_questions
+                if questions:
+                    st.session_state.technical_questions = list(questions)
 
             # Check if conversation has ended
             if not st.session_state.conversation_manager.is_active:
@@ -653,38 +831,39 @@ def handle_user_input():
                 # Save conversation summary
                 summary = st.session_state.conversation_manager.get_conversation_summary()
                 st.session_state.conversation_summary = summary
-                # Update user data from summary if available
-                if "candidate_info" in summary:
-                    for key, value in summary["candidate_info"].items():
-                        if key in st.session_state.user_data and value:
-                            st.session_state.user_data[key] = value
                 # Mark interview as complete
-                st.session_state.user_data["interview_status"] = "complete"
+                st.session_state.interview_status = "complete"
                 # Save user data to file
                 save_user_data()
 
         # Clear input field
         st.session_state.user_input = ""
 
+@session_run
 def start_session():
     """Start a new chat session."""
+    initialize_session()
     st.session_state.session_started = True
     # Add initial greeting
-    greeting = st.session_state.conversation_manager.process_input("Hello")
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    st.session_state.chat_history.append({
-        "role": "assistant",
-        "content": greeting,
-        "timestamp": timestamp
-    })
+    manager = st.session_state.conversation_manager
+    manager.process_input("Hello")
+    # Only the greeting is shown, not the message that triggered it
+    manager.transcript[-2].display = ""
+    checkpoint_session()
 
 
+@session_run
 def reset_session():
     """Reset the chat session."""
+    initialize_session()
     # Save data before resetting if interview was in progress
     if st.session_state.get('session_started', False) and not st.session_state.get('conversation_ended', False):
-        st.session_state.user_data["interview_status"] = "abandoned"
+        st.session_state.interview_status = "abandoned"
         save_user_data()
+    # The next interview starts with a new session id and checkpoint log
+    st.session_state.checkpoint.discard()
+    st.query_params.pop("session", None)
+    get_session_registry().forget(st.session_state.session_id)
     for key in list(st.session_state.keys()):
         del st.session_state[key]
     initialize_session()
@@ -701,10 +880,10 @@ def export_conversation():
             "technical_responses": st.session_state.conversation_summary["technical_responses"],
             "full_conversation": [
                 {
-                    "role": msg["role"],
-                    "content": msg["content"],
-                    "timestamp": msg["timestamp"]
-                } for msg in st.session_state.chat_history
+                    "role": "user" if msg.role == Role.USER else "assistant",
+                    "content": msg.shown_text,
+                    "timestamp": msg.timestamp
+                } for msg in st.session_state.conversation_manager.transcript if msg.shown_text
             ]
         }
         # Convert to JSON
@@ -732,7 +911,7 @@ def display_technical_questions():
         # Format the question text properly with improved CSS
         st.markdown(f"""
         <div class="technical-question-container">
-            <p class="technical-question-text">{question}</p>
+            <p class="technical-question-text">{question.text}</p>
         </div>
         """, unsafe_allow_html=True)
         # Use text_area with increased height for better user experience
@@ -747,7 +926,8 @@ def display_technical_questions():
             # Store the answer in session state
             st.session_state.technical_responses_input[response_key] = st.session_state[response_key]
             st.session_state.current_question_index += 1
-            st.rerun()
+            checkpoint_session()
+            st.rerun(scope="fragment")
     elif st.session_state.technical_questions and st.session_state.current_question_index >= len(st.session_state.technical_questions):
         # Show a message when all questions are answered
         st.markdown("---")
@@ -760,7 +940,7 @@ def display_technical_questions():
             st.markdown("## Your Answers")
             for i, question in enumerate(st.session_state.technical_questions):
                 response_key = f"response_{i}"
-                st.markdown(f"**Question {i+1}:** {question}")
+                st.markdown(f"**Question {i+1}:** {question.text}")
                 st.markdown(f"**Your Answer:** {st.session_state.technical_responses_input.get(response_key, '')}")
                 st.markdown("---")
 
@@ -770,16 +950,107 @@ def save_user_data_manually():
     Function to manually save user data on demand.
     This can be triggered by a button in the UI.
     """
-    if st.session_state.user_data:
-        st.session_state.user_data["submission_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        file_path = save_user_data()
-        st.success(f"User data saved to {file_path}")
+    candidate_key = save_user_data()
+    st.success(f"User data saved for {candidate_key}")
+
+
+def display_user_data(slot):
+    """
+    Render the collected user data into its sidebar placeholder.
+    The chat fragment calls this on every rerun, so a chat turn updates the
+    sidebar without rerunning the whole app.
+    Args:
+        slot: Placeholder created in the sidebar by the last full run
+    """
+    if not st.session_state.session_started:
+        slot.empty()
+        return
+    with slot.container():
+        # Display current user data in sidebar for debugging/verification
+        st.header("Current User Data")
+        with st.expander("View Details", expanded=True):
+            for key, value in candidate_profile().items():
+                if key != "technical_responses":
+                    if isinstance(value, list):
+                        st.write(f"**{key.replace('_', ' ').title()}:** {', '.join(value)}")
+                    else:
+                        st.write(f"**{key.replace('_', ' ').title()}:** {value}")
+
+
+@st.fragment
+@session_run
+def chat_panel(user_data_slot):
+    """
+    Render the live part of the chat: new messages, technical questions, summary and input,
+    plus the sidebar's user data.
+    Interactions inside it rerun only this fragment, so earlier messages are not sent again.
+    Args:
+        user_data_slot: Sidebar placeholder for the collected user data
+    """
+    # Fragment reruns skip main(), and the session may have been evicted while idle
+    initialize_session()
+    if st.session_state.pop("needs_full_rerun", False):
+        # The conversation ended: the sidebar now offers the export
+        st.rerun()
+    started = time.perf_counter()
+    if st.session_state.session_started:
+        display_messages(st.session_state.settled_messages, len(st.session_state.conversation_manager.transcript))
+        display_technical_questions()
+        # Show summary if conversation ended
+        if st.session_state.conversation_ended and 'conversation_summary' in st.session_state:
+            st.markdown("---")
+            st.subheader("Conversation Summary")
+            with st.expander("Candidate Information", expanded=True):
+                candidate_info = st.session_state.conversation_summary["candidate_info"]
+                for key, value in candidate_info.items():
+                    if key == 'tech_stack' and isinstance(value, list):
+                        st.text_input(f"{key.title()}", ", ".join(value), disabled=True)
+                    else:
+                        st.text_input(f"{key.title()}", value, disabled=True)
+            with st.expander("Technical Assessment", expanded=True):
+                st.markdown("<div class='markdown-text-container'>", unsafe_allow_html=True)
+                st.markdown("**Questions:**")
+                st.markdown(st.session_state.conversation_summary["technical_questions"])
+                st.markdown("**Responses:**")
+                st.markdown(st.session_state.conversation_summary["technical_responses"])
+                st.markdown("</div>", unsafe_allow_html=True)
+
+    # Input area
+    if st.session_state.session_started and not st.session_state.conversation_ended:
+        st.text_input(
+            "Your message:",
+            key="user_input",
+            on_change=handle_user_input
+        )
+        st.markdown("*Press Enter to send your message. Type 'exit' or 'bye' to end the conversation.*")
+    display_user_data(user_data_slot)
+    record_render_time("fragment", started)
+    track_session()
 
 
+@st.cache_resource(show_spinner=False)
+def warm_up_llm():
+    """
+    Start opening the shared LLM backend's connections in the background.
+    Cached as a resource, so it runs once per server process, on the first page
+    load, instead of delaying the first candidate's first LLM request.
+    Returns:
+        bool: True if a warm-up was started
+    """
+    return start_llm_warm_up()
+
+
+@session_run
 def main():
     """Main application function."""
+    started = time.perf_counter()
+    warm_up_llm()
     # Initialize session
     initialize_session()
+    # A full run renders everything the chat fragment would have rerun for
+    st.session_state.pop("needs_full_rerun", None)
+    # and starts the HTML memo over (the transcript may also have been replaced)
+    st.session_state.message_html.clear()
     # Header
     st.title("🤖 TalentScout Hiring Assistant")
     st.markdown("""
@@ -806,62 +1077,34 @@ def main():
             if st.button("Save My Data"):
                 save_user_data_manually()
         
-        # Display current user data in sidebar for debugging/verification
-        if st.session_state.session_started:
-            st.header("Current User Data")
-            with st.expander("View Details", expanded=True):
-                for key, value in st.session_state.user_data.items():
-                    if key != "technical_responses":
-                        if isinstance(value, list):
-                            st.write(f"**{key.replace('_', ' ').title()}:** {', '.join(value)}")
-                        else:
-                            st.write(f"**{key.replace('_', ' ').title()}:** {value}")
+        # Filled by the chat fragment, which keeps it current between full runs
+        user_data_slot = st.empty()
         
         if st.session_state.conversation_ended and 'conversation_summary' in st.session_state:
             st.header("Export")
             export_conversation()
 
-    # Chat container
-    chat_container = st.container()
+        if SHOW_RENDER_STATS:
+            st.header("Render Stats")
+            for scope, samples in st.session_state.render_times.items():
+                st.caption(f"{scope}: last {samples[-1]:.1f} ms, mean {sum(samples) / len(samples):.1f} ms over {len(samples)} runs")
 
-    # Display chat messages
+        if SHOW_SESSION_STATS:
+            st.header("Server Sessions")
+            stats = get_session_registry().stats()
+            st.caption(f"{stats['live_sessions']} live, {stats['total_bytes'] / 1024:.0f} KiB total, "
+                       f"{stats['bytes_per_session'] / 1024:.1f} KiB per session")
+            st.caption(f"Evicted: {stats['evicted_idle']} idle, {stats['evicted_memory']} over the memory ceiling")
+
+    # Messages present at this full run are rendered here once; the chat
+    # fragment renders only the messages added by its own reruns
+    chat_container = st.container()
     with chat_container:
         if st.session_state.session_started:
-            for message in st.session_state.chat_history:
-                display_message(
-                    role=message["role"],
-                    content=message["content"],
-                    timestamp=message["timestamp"]
-                )
-            display_technical_questions()
-            # Show summary if conversation ended
-            if st.session_state.conversation_ended and 'conversation_summary' in st.session_state:
-                st.markdown("---")
-                st.subheader("Conversation Summary")
-                with st.expander("Candidate Information", expanded=True):
-                    candidate_info = st.session_state.conversation_summary["candidate_info"]
-                    for key, value in candidate_info.items():
-                        if key == 'tech_stack' and isinstance(value, list):
-                            st.text_input(f"{key.title()}", ", ".join(value), disabled=True)
-                        else:
-                            st.text_input(f"{key.title()}", value, disabled=True)
-                with st.expander("Technical Assessment", expanded=True):
-                    st.markdown("<div class='markdown-text-container'>", unsafe_allow_html=True)
-                    st.markdown("**Questions:**")
-                    st.markdown(st.session_state.conversation_summary["technical_questions"])
-                    st.markdown("**Responses:**")
-                    st.markdown(st.session_state.conversation_summary["technical_responses"])
-                    st.markdown("</div>", unsafe_allow_html=True)
-
-    # Input area
-    if st.session_state.session_started and not st.session_state.conversation_ended:
-        st.text_input(
-            "Your message:",
-            key="user_input",
-            on_change=handle_user_input
-        )
-        st.markdown("*Press Enter to send your message. Type 'exit' or 'bye' to end the conversation.*")
-
+            st.session_state.settled_messages = len(st.session_state.conversation_manager.transcript)
+            display_messages(0, st.session_state.settled_messages)
+    chat_panel(user_data_slot)
+    record_render_time("app", started)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Streaming bulk export of candidate records to CSV or JSONL.
+
+Records are read straight from the candidate store's segment files one at a
+time (read-only and without building the store's index), filtered,
+projected and written to the output, so memory does not grow with the
+records exported: latest-version exports keep one file position per
+candidate, --all-versions exports nothing at all. Progress (records per second) is
+reported on stderr so stdout can carry the data.
+
+Usage:
+    python bulk_export.py --format jsonl --output candidates.jsonl.gz
+    python bulk_export.py --format csv --status complete --tech python sql --since 2025-07-01 > out.csv
+    python bulk_export.py --fields email,name,tech_stack,interview_status --format csv --gzip -o nightly.csv.gz
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+# CSV columns when no --fields are given (technical responses are JSONL-only by default)
+DEFAULT_CSV_FIELDS = [
+    "email", "session_id", "version", "name", "phone", "experience", "position",
+    "location", "tech_stack", "interview_status", "submission_time"
+]
+
+# Report progress every this many records
+PROGRESS_EVERY = 10000
+
+
+def filter_records(
+    records: Iterable[Dict[str, Any]],
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    status: Optional[str] = None,
+    techs: Sequence[str] = ()
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily filter candidate records.
+
+    Args:
+        records: Candidate records
+        since: Inclusive lower bound on submission_time ("YYYY-MM-DD[ HH:MM:SS]")
+        until: Exclusive upper bound on submission_time ("YYYY-MM-DD[ HH:MM:SS]")
+        status: Interview status to keep
+        techs: Technologies the tech stack must all contain
+
+    Yields:
+        Dict: Matching records
+    """
+    wanted = {tech.strip().lower() for tech in techs if tech.strip()}
+    for record in records:
+        submission_time = str(record.get("submission_time", ""))
+        if since and submission_time < since:
+            continue
+        if until and submission_time >= until:
+            continue
+        if status and record.get("interview_status") != status:
+            continue
+        if wanted:
+            stack = record.get("tech_stack") or []
+            if isinstance(stack, str):
+                stack = stack.split(",")
+            if not wanted <= {str(tech).strip().lower() for tech in stack}:
+                continue
+        yield record
+
+
+def project(record: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """
+    Keep only the requested fields of a record (missing fields become None).
+
+    Args:
+        record: Candidate record
+        fields: Field names, or None for all fields
+
+    Returns:
+        Dict: Projected record
+    """
+    if not fields:
+        return record
+    return {field: record.get(field) for field in fields}
+
+
+def _csv_value(value: Any) -> Any:
+    """Flatten a value for a CSV cell (lists joined by ';', dicts as JSON)."""
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    return value
+
+
+def write_records(records: Iterable[Dict[str, Any]], stream: TextIO, output_format: str,
+                  fields: Optional[Sequence[str]] = None) -> Iterator[int]:
+    """
+    Write records to a text stream, yielding the running count.
+
+    Args:
+        records: Records to write
+        stream: Text output stream
+        output_format: "csv" or "jsonl"
+        fields: Projected fields (CSV defaults to DEFAULT_CSV_FIELDS)
+
+    Yields:
+        int: Number of records written so far, after each record
+    """
+    count = 0
+    if output_format == "csv":
+        columns = list(fields or DEFAULT_CSV_FIELDS)
+        writer = csv.writer(stream)
+        writer.writerow(columns)
+        for record in records:
+            writer.writerow([_csv_value(record.get(column)) for column in columns])
+            count += 1
+            yield count
+    else:
+        for record in records:
+            stream.write(json.dumps(project(record, fields), separators=(",", ":"), ensure_ascii=False))
+            stream.write("\n")
+            count += 1
+            yield count
+
+
+def _open_output(path: str, compress: bool) -> TextIO:
+    """Open the output file (or stdout for "-"), optionally gzip-compressed."""
+    if path == "-":
+        if compress:
+            return io.TextIOWrapper(gzip.GzipFile(fileobj=sys.stdout.buffer, mode="wb"), encoding="utf-8", newline="")
+        return sys.stdout
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from config import CANDIDATE_STORE_DIR
+
+    parser = argparse.ArgumentParser(description="Stream candidate records to CSV or JSONL.")
+    parser.add_argument("--store", default=CANDIDATE_STORE_DIR, help="Candidate store directory")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="jsonl", help="Output format")
+    parser.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout)")
+    parser.add_argument("--gzip", action="store_true", help="Gzip the output (implied by a .gz output name)")
+    parser.add_argument("--since", help="Submitted on or after (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Submitted before (YYYY-MM-DD)")
+    parser.add_argument("--status", help="Interview status (complete, incomplete, abandoned)")
+    parser.add_argument("--tech", nargs="+", default=[], help="Technologies the stack must contain")
+    parser.add_argument("--fields", help="Comma-separated fields to export")
+    parser.add_argument("--all-versions", action="store_true", help="Export every saved version, not just the latest")
+    args = parser.parse_args(argv)
+
+    from candidate_store import scan_segments
+
+    fields = [field.strip() for field in args.fields.split(",") if field.strip()] if args.fields else None
+    compress = args.gzip or args.output.endswith(".gz")
+    records = filter_records(
+        scan_segments(args.store, latest_only=not args.all_versions),
+        since=args.since,
+        until=args.until,
+        status=args.status,
+        techs=args.tech
+    )
+
+    stream = _open_output(args.output, compress)
+    started = time.perf_counter()
+    count = 0
+    try:
+        for count in write_records(records, stream, args.format, fields):
+            if count % PROGRESS_EVERY == 0:
+                elapsed = time.perf_counter() - started
+                print(f"... {count} records ({count / elapsed:.0f} records/s)", file=sys.stderr)
+    finally:
+        if stream is sys.stdout:
+            stream.flush()
+        else:
+            stream.close()
+        # Releases the segments lock even if writing stopped early
+        records.close()
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed else 0.0
+    print(f"Exported {count} records in {elapsed:.2f}s ({rate:.0f} records/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
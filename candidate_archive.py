@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Packed, memory-mapped read-only archive of candidate records.
+
+Layout (little-endian):
+
+    header   32 bytes   magic "TSCA", format version, reserved
+    blobs               per record: u16 key length, candidate key, compact JSON
+    positions           per record: u64 blob offset, u32 blob length
+    hashes              per live record, sorted: u64 email hash, u32 position,
+                        u32 record version
+    footer   40 bytes   positions offset, record count, hashes offset,
+                        live count, magic "TSCF", CRC-32 of both tables
+
+Readers mmap the file, so every process shares the OS page cache and a
+lookup is a binary search over the hash table plus one slice of the map:
+no per-record open() or read(). Appending writes new blobs, new tables and
+a new footer after the old ones; readers use the last valid footer, falling
+back to the one before it while an append is still being written or after
+one was torn by a crash, and a reader that mapped the file earlier keeps
+its consistent older view. Rebuilding reclaims the space of superseded
+tables and records.
+
+Usage:
+    python candidate_archive.py build [--from-json user_data]
+    python candidate_archive.py append
+    python candidate_archive.py get someone@example.com
+    python candidate_archive.py stats
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from candidate_store import candidate_key
+
+MAGIC = b"TSCA"
+FOOTER_MAGIC = b"TSCF"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sH26x")
+POSITION = struct.Struct("<QI")
+HASH = struct.Struct("<QII")
+FOOTER = struct.Struct("<QQQQ4sI")
+# Position of the magic inside the footer
+FOOTER_MAGIC_OFFSET = 32
+KEY_LENGTH = struct.Struct("<H")
+
+
+class ArchiveError(Exception):
+    """Raised when an archive file is missing, truncated or corrupt."""
+
+
+def email_hash(key: str) -> int:
+    """
+    Hash the email part of a candidate key (so all sessions of a candidate share it).
+
+    Args:
+        key: Candidate key or email
+
+    Returns:
+        int: 64-bit hash
+    """
+    email = key.split("#", 1)[0].strip().lower()
+    return int.from_bytes(hashlib.blake2b(email.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _encode_blob(record: Dict[str, Any]) -> bytes:
+    key = candidate_key(record).encode("utf-8")
+    payload = json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return KEY_LENGTH.pack(len(key)) + key + payload
+
+
+def _write_tables(f: Any, positions: List[Tuple[int, int]], hashes: List[Tuple[int, int, int]]) -> None:
+    """Write the position table, the sorted hash table and the footer at the current file position."""
+    positions_offset = f.tell()
+    tables = b"".join(POSITION.pack(offset, length) for offset, length in positions)
+    hashes_offset = positions_offset + len(tables)
+    hash_table = b"".join(HASH.pack(*entry) for entry in sorted(hashes))
+    tables += hash_table
+    f.write(tables)
+    f.write(FOOTER.pack(positions_offset, len(positions), hashes_offset, len(hashes), FOOTER_MAGIC, zlib.crc32(tables)))
+
+
+def build_archive(path: str, records: Iterable[Dict[str, Any]]) -> int:
+    """
+    Write a new archive, atomically replacing any existing one.
+
+    Args:
+        path: Archive file
+        records: Candidate records (the last record of each candidate key wins)
+
+    Returns:
+        int: Number of records written
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    temp_path = path + ".tmp"
+    positions = []
+    latest = {}
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+        for record in records:
+            blob = _encode_blob(record)
+            latest[candidate_key(record)] = (len(positions), record.get("version", 1))
+            positions.append((f.tell(), len(blob)))
+            f.write(blob)
+        _write_tables(
+            f, positions, [(email_hash(key), position, version) for key, (position, version) in latest.items()]
+        )
+        f.flush()
+        os.fsync(f.fileno())
+    # Readers holding the old file keep mapping it until they refresh
+    os.replace(temp_path, path)
+    return len(positions)
+
+
+def append_archive(path: str, records: Iterable[Dict[str, Any]]) -> int:
+    """
+    Append records to an archive; new versions replace older ones in lookups.
+
+    Records whose key is already archived with the same or a newer version are skipped.
+
+    Args:
+        path: Archive file (created if missing)
+        records: Candidate records
+
+    Returns:
+        int: Number of records appended
+    """
+    if not os.path.exists(path):
+        return build_archive(path, records)
+
+    # Versions come from the hash table, so no archived record is parsed
+    with CandidateArchive(path) as archive:
+        positions = [archive._position(i) for i in range(len(archive))]
+        live = {archive.key(position): (position, version) for _, position, version in archive._live_entries()}
+        end = archive._size
+
+    appended = 0
+    with open(path, "r+b") as f:
+        # Write over a torn append left after the last valid footer
+        f.seek(end)
+        f.truncate()
+        for record in records:
+            key = candidate_key(record)
+            version = record.get("version", 1)
+            if key in live and live[key][1] >= version:
+                continue
+            blob = _encode_blob(record)
+            live[key] = (len(positions), version)
+            positions.append((f.tell(), len(blob)))
+            f.write(blob)
+            appended += 1
+        if appended:
+            _write_tables(
+                f, positions, [(email_hash(key), position, version) for key, (position, version) in live.items()]
+            )
+            f.flush()
+            os.fsync(f.fileno())
+    return appended
+
+
+class CandidateArchive:
+    """
+    Read-only, memory-mapped view of an archive file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map an archive.
+
+        Args:
+            path: Archive file
+
+        Raises:
+            ArchiveError: If the file is not a valid archive
+        """
+        self.path = path
+        self._file = None
+        self._map = None
+        self._view = None
+        self._open()
+
+    def _open(self) -> None:
+        """Map the file; the current mapping is only replaced once the new one validates."""
+        try:
+            f = open(self.path, "rb")
+        except OSError as e:
+            raise ArchiveError(f"Cannot open archive {self.path}: {e}")
+        file_size = os.fstat(f.fileno()).st_size
+        if file_size < HEADER.size + FOOTER.size:
+            f.close()
+            raise ArchiveError(f"Archive {self.path} is truncated")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            magic, version = HEADER.unpack_from(mapped, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ArchiveError(f"{self.path} is not a version {FORMAT_VERSION} candidate archive; rebuild it")
+            end, footer = self._last_valid_footer(mapped, view, file_size)
+        except ArchiveError:
+            view.release()
+            mapped.close()
+            f.close()
+            raise
+
+        self._release(self._file, self._map, self._view)
+        self._file, self._map, self._view = f, mapped, view
+        self._file_size = file_size
+        self._size = end
+        self._positions_offset, self._count, self._hashes_offset, self._live = footer
+
+    def _last_valid_footer(self, mapped: mmap.mmap, view: memoryview, file_size: int) -> Tuple[int, Tuple]:
+        """
+        Find the last footer whose tables check out.
+
+        Returns:
+            Tuple: (end of the footer, (positions offset, count, hashes offset, live count))
+        """
+        end = file_size
+        while end >= HEADER.size + FOOTER.size:
+            (positions_offset, count, hashes_offset, live,
+             footer_magic, checksum) = FOOTER.unpack_from(mapped, end - FOOTER.size)
+            tables_end = hashes_offset + live * HASH.size
+            if (footer_magic == FOOTER_MAGIC and tables_end == end - FOOTER.size
+                    and HEADER.size <= positions_offset <= hashes_offset
+                    and zlib.crc32(view[positions_offset:tables_end]) == checksum):
+                if end != file_size:
+                    print(f"[ERROR] Ignoring {file_size - end} bytes of an unfinished append to {self.path}")
+                return end, (positions_offset, count, hashes_offset, live)
+            # Step back to the previous footer magic before the one just tried
+            # (the CRC rejects look-alikes inside blobs)
+            magic_at = mapped.rfind(FOOTER_MAGIC, HEADER.size, end - FOOTER.size + FOOTER_MAGIC_OFFSET + 3)
+            if magic_at < 0:
+                break
+            end = magic_at - FOOTER_MAGIC_OFFSET + FOOTER.size
+        raise ArchiveError(f"Archive {self.path} has no valid footer; rebuild it")
+
+    def refresh(self) -> bool:
+        """
+        Remap the file if it was rebuilt or appended to since it was opened.
+
+        The current mapping stays in use if the new file does not validate.
+
+        Returns:
+            bool: True if a newer version was mapped
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        if stat.st_ino == os.fstat(self._file.fileno()).st_ino and stat.st_size == self._file_size:
+            return False
+        try:
+            self._open()
+        except ArchiveError as e:
+            print(f"[ERROR] Keeping the current archive mapping: {e}")
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _position(self, position: int) -> Tuple[int, int]:
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        return POSITION.unpack_from(self._map, self._positions_offset + position * POSITION.size)
+
+    def _live_entries(self) -> Iterator[Tuple[int, int, int]]:
+        """Yield (email hash, position, version) for every live record."""
+        for i in range(self._live):
+            yield HASH.unpack_from(self._map, self._hashes_offset + i * HASH.size)
+
+    def _live_positions(self) -> Iterator[int]:
+        for _, position, _ in self._live_entries():
+            yield position
+
+    def _blob(self, position: int) -> Tuple[memoryview, memoryview]:
+        """Return (key bytes, JSON bytes) of a record as slices of the map (no copy)."""
+        offset, length = self._position(position)
+        (key_length,) = KEY_LENGTH.unpack_from(self._map, offset)
+        key_end = offset + KEY_LENGTH.size + key_length
+        return self._view[offset + KEY_LENGTH.size:key_end], self._view[key_end:offset + length]
+
+    def key(self, position: int) -> str:
+        """Return the candidate key of the record at a position."""
+        return str(self._blob(position)[0], "utf-8")
+
+    def raw(self, position: int) -> memoryview:
+        """Return the JSON bytes of the record at a position without copying."""
+        return self._blob(position)[1]
+
+    def record(self, position: int) -> Dict[str, Any]:
+        """Parse the record at a position (0 is the oldest record in the file)."""
+        return json.loads(bytes(self.raw(position)))
+
+    def find(self, email: str) -> List[int]:
+        """
+        Find the current records of a candidate.
+
+        Args:
+            email: Candidate email (all sessions) or candidate key (that session only)
+
+        Returns:
+            List[int]: Positions, oldest first
+        """
+        target = email_hash(email)
+        low, high = 0, self._live
+        while low < high:
+            middle = (low + high) // 2
+            if HASH.unpack_from(self._map, self._hashes_offset + middle * HASH.size)[0] < target:
+                low = middle + 1
+            else:
+                high = middle
+        key = email.strip().lower()
+        email = key.split("#", 1)[0]
+        positions = []
+        while low < self._live:
+            key_hash, position, _ = HASH.unpack_from(self._map, self._hashes_offset + low * HASH.size)
+            if key_hash != target:
+                break
+            # Confirm the key itself; different emails can share a 64-bit hash
+            candidate = self.key(position)
+            if candidate == key or ("#" not in key and candidate.split("#", 1)[0] == email):
+                positions.append(position)
+            low += 1
+        return sorted(positions)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the current record for a candidate key, or the newest session of an email.
+
+        Args:
+            key: Candidate key (email#session) or email
+
+        Returns:
+            Optional[Dict]: The record, or None if not archived
+        """
+        positions = self.find(key)
+        return self.record(positions[-1]) if positions else None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate the current records in position order."""
+        for position in sorted(self._live_positions()):
+            yield self.record(position)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report archive size.
+
+        Returns:
+            Dict: Records (including superseded), live records and file bytes
+        """
+        return {"records": self._count, "live": self._live, "bytes": self._size}
+
+    @staticmethod
+    def _release(f: Any, mapped: Optional[mmap.mmap], view: Optional[memoryview]) -> None:
+        if mapped is not None:
+            view.release()
+            mapped.close()
+        if f is not None:
+            f.close()
+
+    def close(self) -> None:
+        """Unmap the archive."""
+        self._release(self._file, self._map, self._view)
+        self._file = self._map = self._view = None
+
+    def __enter__(self) -> "CandidateArchive":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from config import CANDIDATE_ARCHIVE_PATH
+
+    parser = argparse.ArgumentParser(description="Build and query the packed candidate archive.")
+    parser.add_argument("--path", default=CANDIDATE_ARCHIVE_PATH, help="Archive file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Rebuild the archive")
+    build_parser.add_argument("--from-json", metavar="DIR", help="Archive legacy JSON files instead of the candidate store")
+    append_parser = subparsers.add_parser("append", help="Append records saved since the last build or append")
+    append_parser.add_argument("--from-json", metavar="DIR", help="Append legacy JSON files instead of the candidate store")
+    get_parser = subparsers.add_parser("get", help="Print the current records of a candidate")
+    get_parser.add_argument("email", help="Candidate email (or email#session key)")
+    subparsers.add_parser("stats", help="Show archive size")
+
+    args = parser.parse_args(argv)
+
+    if args.command in ("build", "append"):
+        if getattr(args, "from_json", None):
+            from candidate_store import read_json_records
+            records = read_json_records(args.from_json)
+        else:
+            from candidate_store import open_candidate_store_reader
+            records = open_candidate_store_reader().scan()
+        started = time.perf_counter()
+        if args.command == "build":
+            count = build_archive(args.path, records)
+            print(f"Built the archive with {count} records in {time.perf_counter() - started:.2f}s")
+        else:
+            count = append_archive(args.path, records)
+            print(f"Appended {count} records in {time.perf_counter() - started:.2f}s")
+
+    with CandidateArchive(args.path) as archive:
+        if args.command == "get":
+            positions = archive.find(args.email)
+            if not positions:
+                print(f"No candidate {args.email}")
+                return 1
+            print(json.dumps([archive.record(position) for position in positions], indent=4))
+            return 0
+        print(json.dumps(archive.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+SQLite secondary index over candidate records.
+
+The candidate store is only addressable by candidate key; this catalog
+indexes the searchable fields (email, phone, experience, interview status,
+submission time and the tech stack as a many-to-many table) so lookups such
+as "stack contains python and sql, status complete, newest first" never
+touch the record files. save_user_data updates it incrementally, and it can
+be rebuilt from the candidate store (or legacy user_data/*.json files).
+
+Usage:
+    python candidate_index.py rebuild [--from-json user_data]
+    python candidate_index.py query --tech python sql --status complete --limit 20
+    python candidate_index.py stats
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from candidate_store import candidate_key, read_json_records
+
+
+# Bumped whenever the tables change; older index files are recreated
+SCHEMA_VERSION = 2
+
+# Technologies with fewer candidates than this drive tech queries from their posting list
+RARE_TECH_ROWS = 20000
+
+
+def parse_experience_years(experience: Any) -> Optional[float]:
+    """
+    Extract the number of years from an experience answer such as "3 years".
+
+    Args:
+        experience: Raw experience value
+
+    Returns:
+        Optional[float]: Years of experience, or None if no number is present
+    """
+    match = re.search(r"\d+(?:\.\d+)?", str(experience or ""))
+    return float(match.group(0)) if match else None
+
+
+def _tech_list(tech_stack: Any) -> List[str]:
+    """Normalize a stored tech stack (list or comma-separated text) to lowercase names."""
+    if isinstance(tech_stack, str):
+        tech_stack = tech_stack.split(",")
+    return sorted({str(tech).strip().lower() for tech in tech_stack or [] if str(tech).strip()})
+
+
+class CandidateIndex:
+    """
+    Catalog of candidate fields with a tech many-to-many table.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the index file.
+
+        Args:
+            path: Location of the SQLite file
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # The index is derived data: recreate it and let `rebuild` repopulate it
+            self._conn.executescript("DROP TABLE IF EXISTS candidate_techs; DROP TABLE IF EXISTS candidates;")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS candidates (
+                candidate_key TEXT PRIMARY KEY,
+                email TEXT,
+                session_id TEXT,
+                version INTEGER,
+                name TEXT,
+                phone TEXT,
+                experience TEXT,
+                experience_years REAL,
+                position TEXT,
+                location TEXT,
+                interview_status TEXT,
+                submission_time TEXT
+            );
+            CREATE TABLE IF NOT EXISTS candidate_techs (
+                tech TEXT NOT NULL,
+                candidate_key TEXT NOT NULL,
+                PRIMARY KEY (tech, candidate_key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates(email);
+            CREATE INDEX IF NOT EXISTS idx_candidates_phone ON candidates(phone);
+            CREATE INDEX IF NOT EXISTS idx_candidates_status_time ON candidates(interview_status, submission_time);
+            CREATE INDEX IF NOT EXISTS idx_candidates_time ON candidates(submission_time);
+            CREATE INDEX IF NOT EXISTS idx_candidate_techs_key ON candidate_techs(candidate_key);
+            """
+        )
+        self._conn.commit()
+
+    def _upsert_locked(self, record: Dict[str, Any]) -> str:
+        key = candidate_key(record)
+        row = self._conn.execute("SELECT version FROM candidates WHERE candidate_key = ?", (key,)).fetchone()
+        if row is not None and (row[0] or 0) > record.get("version", 1):
+            # A newer version is already indexed
+            return key
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO candidates (
+                candidate_key, email, session_id, version, name, phone, experience,
+                experience_years, position, location, interview_status, submission_time
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                key,
+                str(record.get("email", "")).strip().lower() or None,
+                record.get("session_id"),
+                record.get("version", 1),
+                record.get("name"),
+                record.get("phone"),
+                record.get("experience"),
+                parse_experience_years(record.get("experience")),
+                record.get("position"),
+                record.get("location"),
+                record.get("interview_status"),
+                record.get("submission_time")
+            )
+        )
+        self._conn.execute("DELETE FROM candidate_techs WHERE candidate_key = ?", (key,))
+        self._conn.executemany(
+            "INSERT INTO candidate_techs (tech, candidate_key) VALUES (?, ?)",
+            [(tech, key) for tech in _tech_list(record.get("tech_stack"))]
+        )
+        return key
+
+    def upsert(self, record: Dict[str, Any]) -> str:
+        """
+        Index (or re-index) the latest version of a candidate record.
+
+        Args:
+            record: Candidate record
+
+        Returns:
+            str: The candidate key
+        """
+        with self._lock:
+            key = self._upsert_locked(record)
+            self._conn.commit()
+        return key
+
+    def rebuild(self, records: Iterable[Dict[str, Any]], batch_size: int = 5000) -> int:
+        """
+        Replace the whole index with the given records.
+
+        Args:
+            records: Candidate records in save order (later records win)
+            batch_size: Records per transaction
+
+        Returns:
+            int: Number of records indexed
+        """
+        count = 0
+        with self._lock:
+            self._conn.execute("DELETE FROM candidate_techs")
+            self._conn.execute("DELETE FROM candidates")
+            for record in records:
+                self._upsert_locked(record)
+                count += 1
+                if count % batch_size == 0:
+                    self._conn.commit()
+            self._conn.commit()
+            self._conn.execute("ANALYZE")
+        return count
+
+    def _rare_tech(self, techs: Sequence[str]) -> Optional[str]:
+        """
+        Pick the technology whose posting list is short enough to drive a query.
+
+        Args:
+            techs: Normalized technologies
+
+        Returns:
+            Optional[str]: The rarest technology under RARE_TECH_ROWS candidates, or None
+        """
+        best = None
+        best_count = RARE_TECH_ROWS
+        with self._lock:
+            for tech in techs:
+                # Bounded count: never reads more than RARE_TECH_ROWS index entries
+                count = self._conn.execute(
+                    "SELECT COUNT(*) FROM (SELECT 1 FROM candidate_techs WHERE tech = ? LIMIT ?)",
+                    (tech, RARE_TECH_ROWS)
+                ).fetchone()[0]
+                if count < best_count:
+                    best, best_count = tech, count
+        return best
+
+    def query(
+        self,
+        techs: Sequence[str] = (),
+        status: Optional[str] = None,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        min_experience: Optional[float] = None,
+        submitted_after: Optional[str] = None,
+        submitted_before: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Find candidates, newest submission first.
+
+        Args:
+            techs: Technologies the stack must all contain
+            status: Interview status (complete, incomplete, abandoned)
+            email: Exact email (case-insensitive)
+            phone: Exact phone number
+            min_experience: Minimum years of experience
+            submitted_after: Inclusive lower bound ("YYYY-MM-DD[ HH:MM:SS]")
+            submitted_before: Exclusive upper bound ("YYYY-MM-DD[ HH:MM:SS]")
+            limit: Maximum number of rows
+
+        Returns:
+            List[Dict]: Indexed candidate fields, including tech_stack
+        """
+        clauses = []
+        params = []
+        techs = _tech_list(techs)
+        driver = self._rare_tech(techs)
+        for tech in techs:
+            if tech == driver:
+                continue
+            # Point lookups on the (tech, candidate_key) primary key while the
+            # driving rows are walked, so LIMIT stops the scan early
+            clauses.append(
+                "EXISTS (SELECT 1 FROM candidate_techs t WHERE t.tech = ? AND t.candidate_key = c.candidate_key)"
+            )
+            params.append(tech)
+        if status:
+            clauses.append("c.interview_status = ?")
+            params.append(status)
+        if email:
+            clauses.append("c.email = ?")
+            params.append(email.strip().lower())
+        if phone:
+            clauses.append("c.phone = ?")
+            params.append(phone)
+        if min_experience is not None:
+            clauses.append("c.experience_years >= ?")
+            params.append(min_experience)
+        if submitted_after:
+            clauses.append("c.submission_time >= ?")
+            params.append(submitted_after)
+        if submitted_before:
+            clauses.append("c.submission_time < ?")
+            params.append(submitted_before)
+
+        if driver:
+            # A rare technology: start from its short posting list (CROSS JOIN fixes the join order)
+            sql = "SELECT c.* FROM candidate_techs d CROSS JOIN candidates c ON c.candidate_key = d.candidate_key"
+            clauses.insert(0, "d.tech = ?")
+            params.insert(0, driver)
+        else:
+            # Common technologies: walk the submission time index newest first
+            sql = "SELECT c.* FROM candidates c"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY c.submission_time DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            for row in rows:
+                row["tech_stack"] = [tech for (tech,) in self._conn.execute(
+                    "SELECT tech FROM candidate_techs WHERE candidate_key = ? ORDER BY tech",
+                    (row["candidate_key"],)
+                )]
+        return rows
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report index size.
+
+        Returns:
+            Dict: Candidate count, tech links and candidates per interview status
+        """
+        with self._lock:
+            candidates = self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+            links = self._conn.execute("SELECT COUNT(*) FROM candidate_techs").fetchone()[0]
+            statuses = dict(self._conn.execute(
+                "SELECT COALESCE(interview_status, 'unknown'), COUNT(*) FROM candidates GROUP BY interview_status"
+            ))
+        return {"candidates": candidates, "tech_links": links, "statuses": statuses}
+
+
+_candidate_index = None
+_candidate_index_lock = threading.Lock()
+
+
+def get_candidate_index() -> CandidateIndex:
+    """
+    Return the process-wide candidate index, opening it on first use.
+
+    Returns:
+        CandidateIndex: Shared index instance
+    """
+    global _candidate_index
+    if _candidate_index is None:
+        from config import CANDIDATE_INDEX_PATH
+        with _candidate_index_lock:
+            if _candidate_index is None:
+                _candidate_index = CandidateIndex(CANDIDATE_INDEX_PATH)
+    return _candidate_index
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from config import CANDIDATE_INDEX_PATH
+
+    parser = argparse.ArgumentParser(description="Build and query the TalentScout candidate index.")
+    parser.add_argument("--path", default=CANDIDATE_INDEX_PATH, help="Candidate index file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = subparsers.add_parser("rebuild", help="Rebuild the index from stored records")
+    rebuild_parser.add_argument("--from-json", metavar="DIR", help="Index legacy JSON files instead of the candidate store")
+
+    query_parser = subparsers.add_parser("query", help="Find candidates, newest first")
+    query_parser.add_argument("--tech", nargs="+", default=[], help="Technologies the stack must contain")
+    query_parser.add_argument("--status", help="Interview status")
+    query_parser.add_argument("--email", help="Candidate email")
+    query_parser.add_argument("--min-experience", type=float, help="Minimum years of experience")
+    query_parser.add_argument("--since", help="Submitted on or after (YYYY-MM-DD)")
+    query_parser.add_argument("--limit", type=int, default=20, help="Maximum results")
+
+    subparsers.add_parser("stats", help="Show index size")
+
+    args = parser.parse_args(argv)
+    index = CandidateIndex(args.path)
+
+    if args.command == "rebuild":
+        if args.from_json:
+            records = read_json_records(args.from_json)
+        else:
+            from candidate_store import open_candidate_store_reader
+            records = open_candidate_store_reader().scan()
+        started = time.perf_counter()
+        count = index.rebuild(records)
+        print(f"Indexed {count} records in {time.perf_counter() - started:.2f}s")
+    elif args.command == "query":
+        started = time.perf_counter()
+        rows = index.query(
+            techs=args.tech,
+            status=args.status,
+            email=args.email,
+            min_experience=args.min_experience,
+            submitted_after=args.since,
+            limit=args.limit
+        )
+        elapsed = time.perf_counter() - started
+        for row in rows:
+            print(f"{row['submission_time']}  {row['interview_status'] or '-':<11} {row['candidate_key']:<32} "
+                  f"{', '.join(row['tech_stack'])}")
+        print(f"\n{len(rows)} candidates in {elapsed * 1000:.1f} ms")
+        return 0
+
+    print(json.dumps(index.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
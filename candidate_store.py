@@ -0,0 +1,692 @@
+#!/usr/bin/env python3
+"""
+Append-only segmented log store for candidate records.
+
+Every save appends one compact line ("<crc32> <json>\\n") to the active
+segment file; segments rotate once they reach CANDIDATE_STORE_SEGMENT_BYTES.
+A record's identity is the candidate's email plus the interview session id.
+Saves are versioned upserts: each new version of an identity gets the next
+version number, and a save whose content hash matches the latest version is
+skipped. An in-memory index maps each identity to the location of its latest
+version and is rebuilt by scanning the segments on open. Compaction rewrites
+only the latest version per identity and deletes the old segments.
+
+One process at a time writes: a writer holds an exclusive lock on the store
+for as long as it is open, so the CLI refuses to import or compact while the
+app runs. Readers (exports, index and archive rebuilds) open the store
+read-only; they never truncate a tail the writer is still appending to, and
+compaction waits for running scans before deleting segments.
+
+Usage:
+    python candidate_store.py import [--dir user_data]
+    python candidate_store.py compact
+    python candidate_store.py stats
+    python candidate_store.py get someone@example.com
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import threading
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single-process use only
+    fcntl = None
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+
+# Held exclusively by the writer for as long as it is open
+WRITER_LOCK_NAME = ".writer.lock"
+# Shared by readers while they scan; exclusive while compaction deletes segments
+SEGMENTS_LOCK_NAME = ".segments.lock"
+
+# Fields that change on every save without changing the record's content
+VOLATILE_FIELDS = ("submission_time", "version", "content_hash")
+
+
+class CandidateStoreError(Exception):
+    """Raised when the store is locked by another writer or written while read-only."""
+
+
+class FileLock:
+    """
+    Advisory flock() lock on a file, shared between processes.
+
+    Each acquire opens its own file descriptor, so threads of one process
+    holding shared locks do not release each other's. Without fcntl (Windows)
+    locking is a no-op.
+    """
+
+    def __init__(self, path: str, exclusive: bool = True):
+        """
+        Args:
+            path: Lock file (created if missing)
+            exclusive: Exclusive (writer) rather than shared (reader) lock
+        """
+        self.path = path
+        self.exclusive = exclusive
+        self._file = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Take the lock.
+
+        Args:
+            blocking: Wait for the lock instead of failing immediately
+
+        Returns:
+            bool: True if the lock is held
+        """
+        self._file = open(self.path, "a+b")
+        if fcntl is None:
+            return True
+        flags = fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH
+        try:
+            fcntl.flock(self._file.fileno(), flags if blocking else flags | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._file.close()
+            self._file = None
+            return False
+        return True
+
+    def release(self) -> None:
+        """Release the lock (closing the descriptor drops it)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+def candidate_key(record: Dict[str, Any]) -> str:
+    """
+    Build the identity of a candidate record.
+
+    Args:
+        record: Candidate record
+
+    Returns:
+        str: Lowercased email (else the name, else the submission time),
+        followed by "#<session_id>" when the record has a session id
+    """
+    if record.get("email"):
+        key = str(record["email"]).strip().lower()
+    elif record.get("name"):
+        key = "name:" + str(record["name"]).strip().lower().replace(" ", "_")
+    else:
+        key = "anonymous:" + str(record.get("submission_time", ""))
+    if record.get("session_id"):
+        key += "#" + str(record["session_id"]).strip().lower()
+    return key
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """
+    Hash the content of a record, ignoring timestamps and version metadata.
+
+    Args:
+        record: Candidate record
+
+    Returns:
+        str: SHA-256 hex digest of the canonical JSON content
+    """
+    content = {field: value for field, value in record.items() if field not in VOLATILE_FIELDS}
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """Encode a record as one checksummed log line."""
+    payload = json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return b"%08x " % zlib.crc32(payload) + payload + b"\n"
+
+
+def decode_record(line: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Decode a log line.
+
+    Args:
+        line: Raw line including the trailing newline
+
+    Returns:
+        Optional[Dict]: The record, or None if the line is torn or corrupt
+    """
+    if len(line) < 10 or not line.endswith(b"\n"):
+        return None
+    checksum, payload = line[:8], line[9:-1]
+    try:
+        if int(checksum, 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def read_json_records(directory: str) -> List[Dict[str, Any]]:
+    """
+    Load one-file-per-save JSON records (the old user_data/ layout) in submission order.
+
+    Args:
+        directory: Directory containing *.json records
+
+    Returns:
+        List[Dict]: Parsed records, oldest first
+    """
+    records = []
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        try:
+            with open(path, "r") as f:
+                records.append(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Skipping {path}: {e}")
+    records.sort(key=lambda record: str(record.get("submission_time", "")))
+    return records
+
+
+def segment_path(directory: str, segment_id: int) -> str:
+    """Return the file of a segment."""
+    return os.path.join(directory, f"{SEGMENT_PREFIX}{segment_id:06d}{SEGMENT_SUFFIX}")
+
+
+def list_segment_ids(directory: str) -> List[int]:
+    """Return the ids of the segments in a store directory, oldest first."""
+    ids = []
+    for path in glob.glob(os.path.join(directory, f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")):
+        name = os.path.basename(path)[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+        if name.isdigit():
+            ids.append(int(name))
+    return sorted(ids)
+
+
+def read_segment(directory: str, segment_id: int) -> Iterator[Tuple[int, int, Optional[Dict[str, Any]]]]:
+    """Yield (offset, length, record) for every line of a segment (record is None if corrupt)."""
+    offset = 0
+    with open(segment_path(directory, segment_id), "rb") as f:
+        for line in f:
+            yield offset, len(line), decode_record(line)
+            offset += len(line)
+
+
+def scan_segments(directory: str, latest_only: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Stream records straight from the segment files, without opening a store.
+
+    Read-only and index-free: nothing is truncated, and only the position of
+    each candidate's newest line is kept (nothing at all with latest_only=False).
+    The segments lock is held for the whole scan, so compaction cannot delete
+    segments underneath it.
+
+    Args:
+        directory: Candidate store directory
+        latest_only: Skip records superseded by a later save of the same candidate
+
+    Yields:
+        Dict: Candidate records in log order
+    """
+    if not os.path.isdir(directory):
+        return
+    with FileLock(os.path.join(directory, SEGMENTS_LOCK_NAME), exclusive=False):
+        segment_ids = list_segment_ids(directory)
+        latest = {}
+        if latest_only:
+            # First pass: where each candidate's newest line is
+            for segment_id in segment_ids:
+                for offset, _, record in read_segment(directory, segment_id):
+                    if record is not None:
+                        latest[candidate_key(record)] = (segment_id, offset)
+        for segment_id in segment_ids:
+            for offset, _, record in read_segment(directory, segment_id):
+                if record is None:
+                    continue
+                if latest_only and latest.get(candidate_key(record)) != (segment_id, offset):
+                    continue
+                yield record
+
+
+class CandidateStore:
+    """
+    Segmented append-only candidate log with an in-memory offset index.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 16 * 1024 * 1024,
+        fsync: bool = False,
+        read_only: bool = False,
+        wait_for_lock: bool = False,
+        compact_segments: int = 0
+    ):
+        """
+        Args:
+            directory: Directory holding the segment files
+            segment_bytes: Size at which the active segment is rotated
+            fsync: Whether to fsync after every append
+            read_only: Open as a reader: no writer lock, no tail truncation, no writes
+            wait_for_lock: Wait for another writer to close instead of failing
+            compact_segments: Compact in-process when a rotation leaves more segments than this
+                and at least half of the records are superseded (0 disables)
+
+        Raises:
+            CandidateStoreError: If another process holds the writer lock
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.read_only = read_only
+        self.compact_segments = compact_segments
+        self._lock = threading.Lock()
+        # key -> (segment id, offset, length, version, content hash) of the latest version
+        self._index = {}
+        self._record_count = 0
+        self._active_id = 0
+        self._active = None
+        self._writer_lock = None
+        os.makedirs(directory, exist_ok=True)
+        if not read_only:
+            self._writer_lock = FileLock(os.path.join(directory, WRITER_LOCK_NAME))
+            if not self._writer_lock.acquire(blocking=wait_for_lock):
+                self._writer_lock = None
+                raise CandidateStoreError(f"Candidate store {directory} is open for writing by another process.")
+        try:
+            with self._segments_lock(exclusive=False):
+                self._load()
+        except BaseException:
+            self.close()
+            raise
+
+    def _segments_lock(self, exclusive: bool) -> FileLock:
+        return FileLock(os.path.join(self.directory, SEGMENTS_LOCK_NAME), exclusive=exclusive)
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise CandidateStoreError("Candidate store is open read-only.")
+
+    def _segment_path(self, segment_id: int) -> str:
+        return segment_path(self.directory, segment_id)
+
+    def _segment_ids(self) -> List[int]:
+        return list_segment_ids(self.directory)
+
+    def _scan_segment(self, segment_id: int) -> Iterator[Tuple[int, int, Optional[Dict[str, Any]]]]:
+        return read_segment(self.directory, segment_id)
+
+    def _load(self) -> None:
+        """Rebuild the index from the segment files."""
+        segment_ids = self._segment_ids()
+        for segment_id in segment_ids:
+            valid_end = 0
+            for offset, length, record in self._scan_segment(segment_id):
+                if record is None:
+                    print(f"[ERROR] Skipping corrupt record in segment {segment_id} at offset {offset}")
+                    continue
+                self._index[candidate_key(record)] = (
+                    segment_id,
+                    offset,
+                    length,
+                    record.get("version", 1),
+                    record.get("content_hash") or content_hash(record)
+                )
+                self._record_count += 1
+                valid_end = offset + length
+            if segment_id == segment_ids[-1] and not self.read_only:
+                # Drop a torn write left at the end of the active segment (only
+                # the writer may: for a reader it can be an append in progress)
+                path = self._segment_path(segment_id)
+                if os.path.getsize(path) > valid_end:
+                    with open(path, "r+b") as f:
+                        f.truncate(valid_end)
+        self._active_id = segment_ids[-1] if segment_ids else 1
+
+    def _open_active(self) -> Any:
+        if self._active is None:
+            self._active = open(self._segment_path(self._active_id), "ab")
+        return self._active
+
+    def _rotate_if_full(self) -> None:
+        active = self._open_active()
+        if active.tell() >= self.segment_bytes:
+            active.close()
+            self._active = None
+            self._active_id += 1
+
+    def _write(self, line: bytes) -> Tuple[int, int]:
+        """Append a line to the active segment; return (segment id, offset)."""
+        self._rotate_if_full()
+        active = self._open_active()
+        offset = active.tell()
+        active.write(line)
+        active.flush()
+        if self.fsync:
+            os.fsync(active.fileno())
+        return self._active_id, offset
+
+    def upsert(self, record: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Store a record as the next version of its identity, unless nothing changed.
+
+        Args:
+            record: Candidate record (not modified)
+
+        Returns:
+            Tuple: (the record with version and content_hash set, whether it was written).
+            An unchanged record is returned as the latest stored version.
+        """
+        self._check_writable()
+        key = candidate_key(record)
+        digest = content_hash(record)
+        with self._lock:
+            latest = self._index.get(key)
+            if latest is not None and latest[4] == digest:
+                return dict(record, version=latest[3], content_hash=digest), False
+            versioned = dict(record, version=latest[3] + 1 if latest else 1, content_hash=digest)
+            line = encode_record(versioned)
+            rotated_from = self._active_id
+            segment_id, offset = self._write(line)
+            self._index[key] = (segment_id, offset, len(line), versioned["version"], digest)
+            self._record_count += 1
+            compact = segment_id != rotated_from and self._compaction_due_locked()
+        if compact:
+            self._compact_in_process()
+        return versioned, True
+
+    def _compaction_due_locked(self) -> bool:
+        """Whether superseded records have piled up in enough segments to compact."""
+        if not self.compact_segments or self._record_count < 2 * len(self._index):
+            return False
+        return len(self._segment_ids()) > self.compact_segments
+
+    def _compact_in_process(self) -> None:
+        """Compact from the writing process, which holds the writer lock for its lifetime."""
+        try:
+            result = self.compact()
+        except OSError as e:
+            # The record is already written; the next rotation tries again
+            print(f"[ERROR] Candidate store compaction failed: {e}")
+            return
+        print(f"DEBUG: Compacted candidate store from {result['records_before']} to "
+              f"{result['records_after']} records ({result['bytes_before']} -> {result['bytes_after']} bytes)")
+
+    def append(self, record: Dict[str, Any]) -> str:
+        """
+        Upsert a record and return its key (see upsert).
+
+        Args:
+            record: Candidate record
+
+        Returns:
+            str: The candidate key
+        """
+        self.upsert(record)
+        return candidate_key(record)
+
+    def version(self, key: str) -> int:
+        """Return the latest stored version of an identity (0 if unknown)."""
+        with self._lock:
+            latest = self._index.get(key.strip().lower())
+        return latest[3] if latest else 0
+
+    def _read(self, location: Tuple) -> Optional[Dict[str, Any]]:
+        segment_id, offset, length = location[:3]
+        with self._segments_lock(exclusive=False):
+            with open(self._segment_path(segment_id), "rb") as f:
+                f.seek(offset)
+                return decode_record(f.read(length))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the latest record of a candidate.
+
+        Args:
+            key: Candidate key (see candidate_key); emails are matched case-insensitively
+
+        Returns:
+            Optional[Dict]: The record, or None if unknown
+        """
+        with self._lock:
+            location = self._index.get(key.strip().lower())
+        return self._read(location) if location else None
+
+    def keys(self, email: Optional[str] = None) -> List[str]:
+        """
+        Return candidate keys.
+
+        Args:
+            email: Only keys of this candidate (all of their sessions)
+
+        Returns:
+            List[str]: Candidate keys
+        """
+        with self._lock:
+            keys = list(self._index)
+        if email:
+            email = email.strip().lower()
+            keys = [key for key in keys if key == email or key.startswith(email + "#")]
+        return keys
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def scan(self, latest_only: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate records in log order, reading each segment sequentially.
+
+        Args:
+            latest_only: Skip records superseded by a later save of the same candidate
+
+        Yields:
+            Dict: Candidate records
+        """
+        # Compaction waits for the scan before deleting the segments it reads
+        with self._segments_lock(exclusive=False):
+            with self._lock:
+                segment_ids = self._segment_ids()
+            for segment_id in segment_ids:
+                for offset, _, record in self._scan_segment(segment_id):
+                    if record is None:
+                        continue
+                    if latest_only:
+                        # Compare against the index instead of copying it, so memory stays flat
+                        location = self._index.get(candidate_key(record))
+                        if location is None or location[:2] != (segment_id, offset):
+                            continue
+                    yield record
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Rewrite only the latest record per candidate and delete the old segments.
+
+        Returns:
+            Dict: Records and bytes before and after compaction
+        """
+        self._check_writable()
+        with self._lock:
+            before = self._stats_locked()
+            old_ids = self._segment_ids()
+            if self._active is not None:
+                self._active.close()
+                self._active = None
+
+            locations = sorted(self._index.items(), key=lambda item: item[1][:2])
+            self._active_id = (old_ids[-1] if old_ids else 0) + 1
+            new_index = {}
+            for key, location in locations:
+                segment_id, offset, length = location[:3]
+                with open(self._segment_path(segment_id), "rb") as f:
+                    f.seek(offset)
+                    line = f.read(length)
+                new_segment_id, new_offset = self._write(line)
+                new_index[key] = (new_segment_id, new_offset, length) + location[3:]
+            if self._active is not None:
+                os.fsync(self._active.fileno())
+
+            self._index = new_index
+            self._record_count = len(new_index)
+            with self._segments_lock(exclusive=True):
+                for segment_id in old_ids:
+                    os.remove(self._segment_path(segment_id))
+            after = self._stats_locked()
+
+        return {
+            "records_before": before["records"],
+            "records_after": after["records"],
+            "bytes_before": before["bytes"],
+            "bytes_after": after["bytes"]
+        }
+
+    def _stats_locked(self) -> Dict[str, Any]:
+        segment_ids = self._segment_ids()
+        total_bytes = sum(os.path.getsize(self._segment_path(segment_id)) for segment_id in segment_ids)
+        return {
+            "candidates": len(self._index),
+            "records": self._record_count,
+            "segments": len(segment_ids),
+            "bytes": total_bytes,
+            "garbage_ratio": 1 - len(self._index) / self._record_count if self._record_count else 0.0
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report store size.
+
+        Returns:
+            Dict: Candidates, records, segments, bytes and the superseded-record ratio
+        """
+        with self._lock:
+            return self._stats_locked()
+
+    def import_json_files(self, directory: str) -> int:
+        """
+        Import one-file-per-save JSON records (the old user_data/ layout).
+
+        Files are appended in submission order so the newest save of a
+        candidate stays the latest record.
+
+        Args:
+            directory: Directory containing *.json records
+
+        Returns:
+            int: Number of records written (unchanged snapshots are skipped)
+        """
+        return sum(self.upsert(record)[1] for record in read_json_records(directory))
+
+    def close(self) -> None:
+        """Close the active segment and release the writer lock."""
+        with self._lock:
+            if self._active is not None:
+                self._active.close()
+                self._active = None
+            if self._writer_lock is not None:
+                self._writer_lock.release()
+                self._writer_lock = None
+
+
+_candidate_store = None
+_candidate_store_lock = threading.Lock()
+
+
+def get_candidate_store() -> CandidateStore:
+    """
+    Return the process-wide candidate store, opening it for writing on first use.
+
+    Waits while another process (such as a CLI compaction) holds the writer lock.
+    The app keeps the lock while it runs, so the store compacts itself once
+    superseded records fill more than CANDIDATE_STORE_COMPACT_SEGMENTS segments.
+
+    Returns:
+        CandidateStore: Shared store instance
+    """
+    global _candidate_store
+    if _candidate_store is None:
+        from config import (
+            CANDIDATE_STORE_DIR, CANDIDATE_STORE_SEGMENT_BYTES, CANDIDATE_STORE_FSYNC, CANDIDATE_STORE_COMPACT_SEGMENTS
+        )
+        with _candidate_store_lock:
+            if _candidate_store is None:
+                _candidate_store = CandidateStore(
+                    CANDIDATE_STORE_DIR,
+                    segment_bytes=CANDIDATE_STORE_SEGMENT_BYTES,
+                    fsync=CANDIDATE_STORE_FSYNC,
+                    wait_for_lock=True,
+                    compact_segments=CANDIDATE_STORE_COMPACT_SEGMENTS
+                )
+    return _candidate_store
+
+
+def open_candidate_store_reader(directory: Optional[str] = None) -> CandidateStore:
+    """
+    Open the candidate store read-only, for scans running beside the app.
+
+    Args:
+        directory: Store directory (default: CANDIDATE_STORE_DIR)
+
+    Returns:
+        CandidateStore: Read-only store
+    """
+    from config import CANDIDATE_STORE_DIR
+
+    return CandidateStore(directory or CANDIDATE_STORE_DIR, read_only=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from config import CANDIDATE_STORE_DIR, CANDIDATE_STORE_SEGMENT_BYTES
+
+    parser = argparse.ArgumentParser(description="Manage the TalentScout candidate store.")
+    parser.add_argument("--path", default=CANDIDATE_STORE_DIR, help="Candidate store directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Import user_data/*.json files")
+    import_parser.add_argument("--dir", default="user_data", help="Directory with JSON records")
+
+    subparsers.add_parser("compact", help="Keep only the latest record per candidate")
+    subparsers.add_parser("stats", help="Show store size")
+
+    get_parser = subparsers.add_parser("get", help="Print the latest version of each session of a candidate")
+    get_parser.add_argument("key", help="Candidate email (or key)")
+
+    args = parser.parse_args(argv)
+    try:
+        store = CandidateStore(
+            args.path,
+            segment_bytes=CANDIDATE_STORE_SEGMENT_BYTES,
+            read_only=args.command in ("stats", "get")
+        )
+    except CandidateStoreError as e:
+        print(f"[ERROR] {e} Stop the app before running {args.command}.")
+        return 1
+
+    if args.command == "import":
+        print(f"Imported {store.import_json_files(args.dir)} records from {args.dir}")
+    elif args.command == "compact":
+        result = store.compact()
+        print(f"Compacted {result['records_before']} -> {result['records_after']} records, "
+              f"{result['bytes_before']} -> {result['bytes_after']} bytes")
+    elif args.command == "get":
+        keys = store.keys(email=args.key) or [args.key]
+        records = [record for record in (store.get(key) for key in keys) if record is not None]
+        if not records:
+            print(f"No candidate {args.key}")
+            return 1
+        print(json.dumps(records, indent=4))
+        return 0
+
+    print(json.dumps(store.stats(), indent=2))
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,35 +1,18 @@
 """
 Chatbot logic for the TalentScout Hiring Assistant.
 """
-import os
-import subprocess
-import re # Added for regex in _generate_technical_questions
-
-# Ensure required packages are installed
-required_packages = ["python-dotenv", "google-generativeai"]
-
-for package in required_packages:
-    try:
-        __import__(package.replace("-", "_"))  # Try importing the package
-    except ImportError:
-        subprocess.run(["pip", "install", package])
-
-import google.generativeai as genai  # Now import your required module
-
-import time
-from typing import Dict, List, Tuple, Any, Optional
-
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional, Generator, Iterator
 
 from config import (
-    GEMINI_API_KEY, 
-    GEMINI_MODEL, 
     SYSTEM_PROMPT, 
     EXIT_KEYWORDS,
     REQUIRED_INFO,
     INFO_PROMPTS,
     CONFIRMATION_MESSAGE,
-    TECH_QUESTION_PROMPT,
-    CLOSING_MESSAGE
+    CLOSING_MESSAGE,
+    SPECULATIVE_QUESTIONS_WORKERS,
+    SPECULATIVE_QUESTIONS_WAIT_SECONDS
 )
 from utils import (
     validate_email, 
@@ -38,32 +21,134 @@ from utils import (
     check_exit_keywords,
     parse_tech_stack
 )
+from question_cache import get_question_cache, normalize_tech_stack
+from question_bank import get_question_bank
+from single_flight import llm_single_flight, prompt_key
+from llm_retry import EmptyResponseError, get_llm_retry_policy
+from llm_backend import LLMBackend, get_llm_backend
+from session_model import Role, Transcript, shared_system_message
+from questions import (
+    QUESTION_RESPONSE_SCHEMA,
+    TechnicalQuestion,
+    completed_question_texts,
+    parse_questions_json
+)
+
+# Background workers for speculative question generation
+_speculation_executor = ThreadPoolExecutor(
+    max_workers=SPECULATIVE_QUESTIONS_WORKERS,
+    thread_name_prefix="question-speculation"
+)
+
+# Returned by the LLM helpers when Gemini could not produce a response
+LLM_ERROR_MESSAGE = "I'm currently experiencing difficulties in generating a response. Please try again later."
+
+
+def _drain(stream: Generator[str, None, str]) -> str:
+    """
+    Exhaust a response stream and return its final value.
+    
+    Args:
+        stream: Generator yielding chunks and returning the full response
+        
+    Returns:
+        str: The generator's return value
+    """
+    while True:
+        try:
+            next(stream)
+        except StopIteration as stop:
+            return stop.value
+
+
+def _merge_questions(
+    bank_questions: List[TechnicalQuestion],
+    llm_questions: List[TechnicalQuestion],
+    llm_count: Optional[int]
+) -> List[TechnicalQuestion]:
+    """
+    Combine question bank questions with LLM questions for the remaining technologies.
+    
+    Args:
+        bank_questions: Questions sampled from the question bank
+        llm_questions: Questions generated (or cached) for technologies missing from the bank
+        llm_count: Number of LLM questions to keep, or None to keep all
+        
+    Returns:
+        List[TechnicalQuestion]: Combined question list
+    """
+    if llm_count is None:
+        return bank_questions + llm_questions
+    return bank_questions + llm_questions[:llm_count]
+
+
+def _cached_questions(tech_stack: List[str], question_count: Optional[int]) -> Optional[List[TechnicalQuestion]]:
+    """
+    Look up cached questions with enough entries for the requested count.
+    
+    Args:
+        tech_stack: Technologies the questions were generated for
+        question_count: Exact number of questions wanted (default: 3-5)
+        
+    Returns:
+        Optional[List[TechnicalQuestion]]: Cached questions, or None on a miss
+    """
+    question_cache = get_question_cache()
+    cached = question_cache.get(tech_stack)
+    if cached and len(cached) >= (question_count or 3):
+        print(f"DEBUG: Question cache hit -> {question_cache.stats()}")
+        return [TechnicalQuestion.from_value(item) for item in cached]
+    return None
+
+
+def _sample_question_bank(tech_stack: List[str]) -> Tuple[List[TechnicalQuestion], List[str], int]:
+    """
+    Sample bank questions for a tech stack, falling back to LLM generation if the bank fails.
+    
+    Args:
+        tech_stack: Parsed list of technologies
+        
+    Returns:
+        Tuple: As QuestionBank.sample_for_stack (no bank questions on failure)
+    """
+    try:
+        return get_question_bank().sample_for_stack(tech_stack)
+    except Exception as e:
+        print(f"[ERROR] Question bank unavailable, generating all questions: {e}")
+        return [], list(tech_stack), 0
 
-# Configure Gemini API
-genai.configure(api_key=GEMINI_API_KEY)
 
 class ConversationManager:
     """
     Manages the conversation state and flow for the hiring assistant chatbot.
     """
     
-    def __init__(self):
-        """Initialize the conversation manager."""
+    def __init__(self, backend: Optional[LLMBackend] = None):
+        """
+        Initialize the conversation manager.
+        
+        Args:
+            backend: LLM backend to use (default: the one selected by LLM_BACKEND)
+        """
         # Initialize conversation state and history
         self.state = "greeting"
         self.current_info_field = None
         self.candidate_info = {}
         self.technical_questions = []
-        self.conversation_history = []
         
-        # Initialize the model
-        self.model = genai.GenerativeModel(model_name=GEMINI_MODEL)
+        # Single record of the conversation, shared with the UI
+        self.transcript = Transcript()
+        
+        # Every session references the same system message (sent as a system
+        # instruction, never copied into the transcript)
+        self.system_message = shared_system_message(SYSTEM_PROMPT)
         
-        # Add system message to conversation history
-        self.conversation_history.append({
-            "role": "system",
-            "content": SYSTEM_PROMPT
-        })
+        # Use the process-wide LLM backend; the system prompt travels as a system
+        # instruction, and every LLM request is a self-contained one-off prompt
+        self.backend = backend or get_llm_backend()
+        
+        # (normalized tech stack, Future) for questions generated ahead of confirmation
+        self._speculative_questions = None
         
         # Store candidate responses to technical questions
         self.question_responses = {}
@@ -86,11 +171,8 @@ class ConversationManager:
             self.is_active = False
             return "Thank you for your time. The conversation has ended."
         
-        # Add user input to conversation history
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_input
-        })
+        # Add user input to the transcript
+        self.transcript.add(Role.USER, user_input)
         
         # Process based on current state
         if self.state == "greeting":
@@ -104,14 +186,43 @@ class ConversationManager:
         elif self.state == "closing":
             response = self._handle_closing()
         else:
-            # Default fallback
-            response = self._get_llm_response("Please respond to this message in the context of our conversation.")
+            # Only reachable with a corrupted restored state
+            response = "Sorry, I lost track of our conversation. Please reset it to start again."
+        
+        # Add response to the transcript
+        self.transcript.add(Role.ASSISTANT, response)
+        
+        return response
+
+    def process_input_stream(self, user_input: str) -> Generator[str, None, str]:
+        """
+        Process user input, streaming LLM output as it is generated.
+        
+        Only question generation involves the LLM, so every other state yields
+        its complete response as a single chunk.
+        
+        Args:
+            user_input: Text input from the user
+            
+        Yields:
+            str: Partial response chunks
+            
+        Returns:
+            str: The final response, identical to what process_input would return
+        """
+        if self.state != "confirming_info" or not user_input.lower().startswith("y") \
+                or check_exit_keywords(user_input, EXIT_KEYWORDS):
+            response = self.process_input(user_input)
+            yield response
+            return response
+        
+        self.transcript.add(Role.USER, user_input)
         
-        # Add response to conversation history
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": response
-        })
+        # Information confirmed, stream the technical questions
+        self.state = "asking_tech_questions"
+        response = yield from self._generate_technical_questions_stream()
+        
+        self.transcript.add(Role.ASSISTANT, response)
         
         return response
 
@@ -165,6 +276,8 @@ class ConversationManager:
         else:
             # All required info collected, move to confirmation
             self.state = "confirming_info"
+            # Start generating questions while the candidate reads the summary
+            self._start_speculative_questions()
             summary = format_candidate_summary(self.candidate_info)
             return f"{CONFIRMATION_MESSAGE}\n\n{summary}\n\nIs this information correct? (yes/no)"
 
@@ -183,7 +296,8 @@ class ConversationManager:
             self.state = "asking_tech_questions"
             return self._generate_technical_questions()
         else:
-            # Information needs correction
+            # Information needs correction; a running speculation still fills the cache
+            self._discard_speculative_questions()
             self.state = "collecting_info"
             self.current_info_field = REQUIRED_INFO[0]
             self.candidate_info = {}
@@ -191,6 +305,18 @@ class ConversationManager:
 
     def _generate_technical_questions(self) -> str:
         """Generate technical questions based on candidate's tech stack."""
+        return _drain(self._generate_technical_questions_stream())
+
+    def _generate_technical_questions_stream(self) -> Generator[str, None, str]:
+        """
+        Generate technical questions, yielding each question as soon as it is known.
+        
+        Yields:
+            str: Numbered question lines for progressive display
+            
+        Returns:
+            str: The final formatted questions response
+        """
         
         # Check if tech_stack exists
         tech_stack = self.candidate_info.get("tech_stack", [])
@@ -206,67 +332,239 @@ class ConversationManager:
         if isinstance(tech_stack, str):
             tech_stack = [tech_stack]
         
+        # Draw from the offline question bank; only technologies it lacks go to the LLM
+        bank_questions, llm_stack, llm_slots = _sample_question_bank(tech_stack)
+        if not llm_stack:
+            print("DEBUG: All questions served from the question bank")
+            self.technical_questions = bank_questions
+            return self._format_technical_questions(bank_questions)
+        question_count = llm_slots if bank_questions else None
+
+        # Collect questions generated speculatively while the candidate confirmed their info
+        speculative_questions = self._take_speculative_questions(llm_stack)
+        if speculative_questions:
+            self.technical_questions = _merge_questions(bank_questions, speculative_questions, question_count)
+            return self._format_technical_questions(self.technical_questions)
+
+        # Serve previously generated questions for the same stack without an LLM call
+        cached_questions = _cached_questions(llm_stack, question_count)
+        if cached_questions:
+            self.technical_questions = _merge_questions(bank_questions, cached_questions, question_count)
+            return self._format_technical_questions(self.technical_questions)
+
+        enhanced_prompt = self._build_question_prompt(llm_stack, question_count)
+        flight_key = prompt_key(self.backend.model_name, enhanced_prompt)
+        
+        # Share the result if another session is already generating these exact
+        # questions; otherwise lead, so sessions arriving meanwhile share ours
+        flight, leader = llm_single_flight.join_or_lead(flight_key)
+        if not leader:
+            try:
+                shared_questions = llm_single_flight.wait(flight, timeout=get_llm_retry_policy().deadline)
+            except Exception as e:
+                print(f"DEBUG: In-flight question generation unavailable, generating our own -> {e}")
+                shared_questions = None
+            if shared_questions:
+                print(f"DEBUG: Joined in-flight question generation -> {llm_single_flight.stats()}")
+                self.technical_questions = _merge_questions(bank_questions, shared_questions, question_count)
+                return self._format_technical_questions(self.technical_questions)
+        
+        # Debugging: Print the formatted prompt
+        print(f"DEBUG: Enhanced Prompt Sent to LLM -> {enhanced_prompt}")
+
+        llm_questions = []
+        try:
+            # Bank questions are known up front; LLM questions appear as their JSON objects complete
+            for i, question in enumerate(bank_questions):
+                yield f"{i + 1}. {question.text}\n"
+            shown = 0
+            partial_json = ""
+            chunks = self._get_llm_response_stream(enhanced_prompt, response_schema=QUESTION_RESPONSE_SCHEMA)
+            while True:
+                try:
+                    partial_json += next(chunks)
+                except StopIteration as stop:
+                    questions_response = stop.value
+                    break
+                for text in completed_question_texts(partial_json)[shown:]:
+                    shown += 1
+                    yield f"{len(bank_questions) + shown}. {text}\n"
+
+            # Debugging: Check response
+            print(f"DEBUG: LLM Response -> {questions_response}")
+
+            llm_questions = [] if questions_response == LLM_ERROR_MESSAGE else parse_questions_json(questions_response)
+            if not llm_questions:
+                if bank_questions:
+                    # Gemini is unavailable; the bank questions still make a usable interview
+                    self.technical_questions = bank_questions
+                    return self._format_technical_questions(bank_questions)
+                return "I'm currently experiencing difficulties in generating technical questions. Please try again later."
+
+            get_question_cache().put(llm_stack, [question.to_dict() for question in llm_questions])
+            self.technical_questions = _merge_questions(bank_questions, llm_questions, question_count)
+            
+            return self._format_technical_questions(self.technical_questions)
+            
+        except Exception as e:
+            print(f"ERROR in _generate_technical_questions: {e}")
+            return f"I encountered an error while generating technical questions: {str(e)}. Please try again."
+        finally:
+            # Release waiting sessions even if the stream failed or was abandoned mid-way
+            if leader:
+                if llm_questions:
+                    llm_single_flight.complete(flight_key, flight, result=llm_questions)
+                else:
+                    llm_single_flight.complete(
+                        flight_key, flight, error=EmptyResponseError("Streamed question generation produced no questions.")
+                    )
+
+    def _build_question_prompt(self, tech_stack: List[str], question_count: Optional[int] = None) -> str:
+        """
+        Build the question generation prompt for a tech stack.
+        
+        The response format itself is enforced by QUESTION_RESPONSE_SCHEMA.
+        
+        Args:
+            tech_stack: Parsed list of technologies
+            question_count: Exact number of questions wanted (default: 3-5)
+            
+        Returns:
+            str: Prompt asking for structured questions
+        """
         # Convert to a comma-separated string
         tech_stack_str = ", ".join(tech_stack)
+        count_str = str(question_count) if question_count else "3-5"
         
         # Create a more specific prompt for better results
-        enhanced_prompt = f"""
+        return f"""
 You are a technical interviewer. Based on the candidate's tech stack: {tech_stack_str}
 
-Generate 3-5 relevant technical questions to assess their proficiency in these technologies. 
+Generate {count_str} relevant technical questions to assess their proficiency in these technologies. 
 The questions should:
 1. Be specific to the mentioned technologies
 2. Range from fundamental to advanced concepts
 3. Include scenario-based questions where appropriate
 4. Assess both theoretical knowledge and practical application
 
-Format your response as a numbered list of questions. For example:
-1. [Question about first technology]
-2. [Question about second technology]
-3. [Question about third technology]
+Return the questions as JSON. Tag each question with the technology it covers and
+its difficulty (easy, medium or hard), ordered from easiest to hardest.
 
 Focus on the technologies mentioned: {tech_stack_str}
 """
+
+    def _start_speculative_questions(self) -> None:
+        """
+        Start generating questions for the collected tech stack in the background.
         
-        # Debugging: Print the formatted prompt
-        print(f"DEBUG: Enhanced Prompt Sent to LLM -> {enhanced_prompt}")
+        The worker only uses stateless backend.generate calls and the shared
+        question cache, so it never touches this conversation's chat session.
+        """
+        self._discard_speculative_questions()
+        tech_stack = self.candidate_info.get("tech_stack", [])
+        if isinstance(tech_stack, str):
+            tech_stack = [tech_stack]
+        if not tech_stack:
+            return
+        
+        # Technologies covered by the question bank need no LLM call at all
+        bank_questions, llm_stack, llm_slots = _sample_question_bank(tech_stack)
+        if not llm_stack:
+            return
+        question_count = llm_slots if bank_questions else None
+        
+        future = _speculation_executor.submit(self._generate_questions_oneoff, llm_stack, question_count)
+        self._speculative_questions = (normalize_tech_stack(llm_stack), future)
 
+    def _take_speculative_questions(self, tech_stack: List[str]) -> Optional[List[TechnicalQuestion]]:
+        """
+        Collect speculatively generated questions for a tech stack.
+        
+        Args:
+            tech_stack: The confirmed tech stack
+            
+        Returns:
+            Optional[List[TechnicalQuestion]]: The questions, or None if no usable speculation exists
+        """
+        speculation, self._speculative_questions = self._speculative_questions, None
+        if speculation is None:
+            return None
+        
+        stack_key, future = speculation
+        if stack_key != normalize_tech_stack(tech_stack):
+            future.cancel()
+            return None
+        
         try:
-            # Get questions from LLM
-            questions_response = self._get_llm_response(enhanced_prompt)
-
-            # Debugging: Check response
-            print(f"DEBUG: LLM Response -> {questions_response}")
+            questions = future.result(timeout=SPECULATIVE_QUESTIONS_WAIT_SECONDS)
+        except Exception as e:
+            print(f"DEBUG: Speculative question generation unavailable -> {e}")
+            return None
+        return questions or None
 
-            if not questions_response or "I'm having trouble processing" in questions_response:
-                return "I'm currently experiencing difficulties in generating technical questions. Please try again later."
+    def _discard_speculative_questions(self) -> None:
+        """Drop any pending speculation; a worker already running still fills the cache."""
+        if self._speculative_questions is not None:
+            self._speculative_questions[1].cancel()
+            self._speculative_questions = None
 
-            # Clean up the response - extract only the questions
-            lines = questions_response.split('\n')
-            clean_questions = []
-            for line in lines:
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                    # Remove numbering and clean up
-                    clean_line = re.sub(r'^\d+\.\s*', '', line)  # Remove "1. "
-                    clean_line = re.sub(r'^[-•]\s*', '', clean_line)  # Remove "- " or "• "
-                    if clean_line:
-                        clean_questions.append(clean_line)
-
-            if not clean_questions:
-                # Fallback: use the original response
-                clean_questions = [line.strip() for line in lines if line.strip()]
-
-            self.technical_questions = clean_questions
-            
-            # Format the response nicely
-            formatted_questions = "\n".join([f"{i+1}. {q}" for i, q in enumerate(clean_questions)])
-            
-            return f"Here are your technical questions:\n\n{formatted_questions}\n\nPlease provide your answers."
+    def _generate_questions_oneoff(
+        self,
+        tech_stack: List[str],
+        question_count: Optional[int] = None
+    ) -> List[TechnicalQuestion]:
+        """
+        Generate questions for a tech stack without using the conversation's chat.
+        
+        Safe to run on a worker thread.
+        
+        Args:
+            tech_stack: Parsed list of technologies
+            question_count: Exact number of questions wanted (default: 3-5)
             
+        Returns:
+            List[TechnicalQuestion]: Parsed questions (empty if generation failed)
+        """
+        cached_questions = _cached_questions(tech_stack, question_count)
+        if cached_questions:
+            return cached_questions
+        
+        prompt = self._build_question_prompt(tech_stack, question_count)
+        
+        def attempt() -> List[TechnicalQuestion]:
+            questions = parse_questions_json(self.backend.generate(prompt, response_schema=QUESTION_RESPONSE_SCHEMA))
+            if not questions:
+                raise EmptyResponseError("Received no parsable questions from Gemini.")
+            return questions
+        
+        policy = get_llm_retry_policy()
+        try:
+            # Identical prompts from concurrent sessions share one Gemini call;
+            # waiting for another session's call is bounded by the same deadline
+            questions = llm_single_flight.do(
+                prompt_key(self.backend.model_name, prompt),
+                lambda: policy.call(attempt),
+                timeout=policy.deadline
+            )
         except Exception as e:
-            print(f"ERROR in _generate_technical_questions: {e}")
-            return f"I encountered an error while generating technical questions: {str(e)}. Please try again."
+            print(f"Gemini API call failed: {e}")
+            return []
+        
+        get_question_cache().put(tech_stack, [question.to_dict() for question in questions])
+        return questions
+
+    def _format_technical_questions(self, questions: List[TechnicalQuestion]) -> str:
+        """
+        Format technical questions as the numbered response shown to the candidate.
+        
+        Args:
+            questions: Parsed questions
+            
+        Returns:
+            str: Response containing the numbered questions
+        """
+        formatted_questions = "\n".join([f"{i+1}. {q.text}" for i, q in enumerate(questions)])
+        return f"Here are your technical questions:\n\n{formatted_questions}\n\nPlease provide your answers."
 
     def _handle_tech_questions(self, user_input: str) -> str:
         """
@@ -295,74 +593,92 @@ Focus on the technologies mentioned: {tech_stack_str}
         self.is_active = False
         return CLOSING_MESSAGE
 
-    def _get_llm_response(self, prompt: str) -> str:
+    def _get_llm_response_stream(
+        self,
+        prompt: str,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Generator[str, None, str]:
         """
-        Get response from the Gemini language model.
+        Stream a response from the Gemini language model.
+        
+        Retries only cover opening the stream and receiving the first chunk, so
+        the caller never sees duplicated partial output. The prompt is sent as a
+        one-off request: it carries everything the model needs, not the transcript.
         
         Args:
             prompt: Prompt text for the LLM
+            response_schema: JSON schema for structured output, if any
             
-        Returns:
-            str: Response from the LLM or error message
-        """
-        # Create messages for the API call in Gemini format
-        history = []
-        
-        # Convert history format from OpenAI to Gemini
-        for msg in self.conversation_history:
-            if msg["role"] == "system":
-                # For system prompts, we'll add them to the first user message
-                continue
-            elif msg["role"] == "user":
-                history.append({"role": "user", "parts": [{"text": msg["content"]}]})
-            elif msg["role"] == "assistant":
-                history.append({"role": "model", "parts": [{"text": msg["content"]}]})
-        
-        # Add current prompt
-        current_prompt = prompt
-        if len(history) == 0:
-            # If this is the first message, prepend the system prompt
-            system_content = next((msg["content"] for msg in self.conversation_history if msg["role"] == "system"), "")
-            if system_content:
-                current_prompt = f"{system_content}\n\n{prompt}"
+        Yields:
+            str: Response text chunks as they arrive
             
+        Returns:
+            str: The complete response or error message
+        """
+        def open_stream() -> Tuple[str, Iterator[str]]:
+            chunks = self.backend.stream(prompt, response_schema=response_schema)
+            first = next(chunks, None)
+            if not first:
+                chunks.close()
+                raise EmptyResponseError("Received an empty response from Gemini.")
+            return first, chunks
+        
         try:
-            # Make API call with retry logic
-            max_retries = 5
-            for attempt in range(max_retries):
-                try:
-                    # Start a chat session if we have history, or generate content for a one-off
-                    if history:
-                        chat = self.model.start_chat(history=history)
-                        response = chat.send_message(current_prompt)
-                    else:
-                        response = self.model.generate_content(current_prompt)
-                    
-                    # Extract response content
-                    llm_response = response.text.strip()
-                    
-                    # Debugging log
-                    print(f"Gemini Response: {llm_response[:100]}...")  # Log first 100 chars
-
-                    if not llm_response:
-                        raise ValueError("Received an empty response from Gemini.")
-                    
-                    return llm_response
-
-
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        # Exponential backoff
-                        wait_time = 2 ** attempt
-                        print(f"API Error: {e}. Retrying in {wait_time} seconds...")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        raise e
-
+            first_text, chunks = get_llm_retry_policy().call(open_stream)
         except Exception as e:
             print(f"Gemini API call failed: {e}")
-            return "I'm currently experiencing difficulties in generating a response. Please try again later."
+            return LLM_ERROR_MESSAGE
+        
+        parts = [first_text]
+        try:
+            yield first_text
+            for text in chunks:
+                parts.append(text)
+                yield text
+        except Exception as e:
+            print(f"Gemini stream interrupted: {e}")
+            return LLM_ERROR_MESSAGE
+        finally:
+            chunks.close()
+        
+        llm_response = "".join(parts).strip()
+        print(f"Gemini Response: {llm_response[:100]}...")  # Log first 100 chars
+        return llm_response
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Get the resumable conversation state, excluding the transcript.
+
+        Returns:
+            Dict: JSON-serializable state accepted by restore_state
+        """
+        return {
+            "state": self.state,
+            "current_info_field": self.current_info_field,
+            "candidate_info": self.candidate_info,
+            "technical_questions": [question.to_dict() for question in self.technical_questions],
+            "question_responses": self.question_responses,
+            "is_active": self.is_active
+        }
+
+    def restore_state(self, state: Dict[str, Any], transcript: Optional[Transcript] = None) -> None:
+        """
+        Resume a conversation from export_state output and its transcript.
+
+        Args:
+            state: State returned by export_state
+            transcript: Conversation transcript
+        """
+        self.state = state.get("state", self.state)
+        self.current_info_field = state.get("current_info_field")
+        self.candidate_info = dict(state.get("candidate_info") or {})
+        self.technical_questions = [
+            TechnicalQuestion.from_value(question) for question in state.get("technical_questions") or []
+        ]
+        self.question_responses = dict(state.get("question_responses") or {})
+        self.is_active = state.get("is_active", True)
+        if transcript is not None:
+            self.transcript = transcript
 
     def get_conversation_summary(self) -> Dict[str, Any]:
         """
@@ -373,7 +689,7 @@ Focus on the technologies mentioned: {tech_stack_str}
         """
         summary = {
             "candidate_info": self.candidate_info,
-            "technical_questions": self.technical_questions,
+            "technical_questions": [question.text for question in self.technical_questions],
             "technical_responses": self.question_responses.get("technical_answers", "")
         }
         return summary
\ No newline at end of file
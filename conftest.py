@@ -0,0 +1,17 @@
+"""
+Shared pytest fixtures and collection settings.
+"""
+import pytest
+
+# Manual debug script (`python test_tech_questions.py`): it calls the live Gemini API with real secrets
+collect_ignore = ["test_tech_questions.py"]
+
+
+def make_record(email, session_id="s1", version=1, **fields):
+    return dict({"email": email, "session_id": session_id, "version": version, "name": "Test User"}, **fields)
+
+
+@pytest.fixture
+def record():
+    """Factory for candidate records: record(email, session_id="s1", version=1, **fields)."""
+    return make_record
@@ -0,0 +1,347 @@
+"""
+Pluggable LLM backends for the TalentScout Hiring Assistant.
+
+ConversationManager talks to an LLMBackend instead of the Gemini SDK directly:
+- GeminiBackend wraps google.generativeai (imported on first use)
+- FakeBackend runs fully offline, returning realistic technical questions with
+  configurable latency, error rate and throughput limits for load tests
+
+The backend is selected with the LLM_BACKEND setting ("gemini" or "fake").
+get_llm_backend() returns one process-wide backend shared by all sessions,
+so the model handle and its connection are created (and warmed) once.
+"""
+import abc
+import functools
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from llm_retry import attempt_timeout
+
+
+class LLMBackend(abc.ABC):
+    """
+    Interface shared by all LLM backends.
+    """
+
+    model_name = ""
+
+    @abc.abstractmethod
+    def generate(self, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> str:
+        """Return the reply to a one-off prompt (no history), as JSON if a schema is given."""
+
+    @abc.abstractmethod
+    def stream(self, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Yield reply chunks for a one-off prompt (no history), as JSON if a schema is given."""
+
+    def warm_up(self) -> None:
+        """Open connections ahead of the first real request (no-op by default)."""
+
+
+def _request_options() -> Optional[Dict[str, Any]]:
+    """Bound a Gemini request by the time left in the current retry attempt, if any."""
+    timeout = attempt_timeout()
+    return None if timeout is None else {"timeout": timeout}
+
+
+def _gemini_client(api_key: str, transport: Optional[str], client_options: Optional[Dict[str, Any]]) -> Any:
+    """
+    Create a low-level Gemini client with a connection of its own.
+
+    gRPC channels with the same target and arguments share their connections
+    through a process-wide subchannel pool, so each client's channel is given a
+    local pool; REST clients each have their own HTTP session already.
+    """
+    from google.ai import generativelanguage as glm
+
+    options = dict(client_options or {}, api_key=api_key)
+    if transport in (None, "grpc"):
+        grpc_transport = glm.GenerativeServiceClient.get_transport_class("grpc")
+
+        def create_channel(host: str, **kwargs: Any) -> Any:
+            kwargs["options"] = list(kwargs.get("options") or []) + [("grpc.use_local_subchannel_pool", 1)]
+            return grpc_transport.create_channel(host, **kwargs)
+
+        transport = functools.partial(grpc_transport, channel=create_channel)
+    return glm.GenerativeServiceClient(client_options=options, transport=transport)
+
+
+class GeminiBackend(LLMBackend):
+    """
+    Google Gemini through the SDK's public low-level clients.
+
+    The backend holds `channels` clients, each with its own connection, and
+    spreads requests over them round-robin; it is shared by every session of
+    the process, so the connections are set up once.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str,
+        system_instruction: Optional[str] = None,
+        transport: Optional[str] = None,
+        client_options: Optional[Dict[str, Any]] = None,
+        channels: int = 1
+    ):
+        """
+        Args:
+            api_key: Gemini API key
+            model_name: Gemini model name
+            system_instruction: System prompt sent with every request
+            transport: "grpc" or "rest" (default: the SDK's default, gRPC)
+            client_options: Client options such as {"api_endpoint": ...}
+            channels: Number of clients (and connections) requests are spread over
+        """
+        from google.generativeai import protos
+        from google.generativeai.types import generation_types
+
+        self._protos = protos
+        self._generation_types = generation_types
+        self.model_name = model_name
+        self._model = model_name if model_name.startswith("models/") else f"models/{model_name}"
+        self._system_instruction = protos.Content(parts=[protos.Part(text=system_instruction)]) if system_instruction else None
+        self._clients = [_gemini_client(api_key, transport, client_options) for _ in range(max(1, channels))]
+        self._next_client = itertools.count()
+
+    def _client(self) -> Any:
+        """Pick the next client round-robin."""
+        return self._clients[next(self._next_client) % len(self._clients)]
+
+    def _contents(self, prompt: str) -> List[Any]:
+        return [self._protos.Content(role="user", parts=[self._protos.Part(text=prompt)])]
+
+    def _request(self, prompt: str, response_schema: Optional[Dict[str, Any]]) -> Any:
+        """Build a generate request, asking for JSON matching response_schema if given."""
+        request = self._protos.GenerateContentRequest(model=self._model, contents=self._contents(prompt))
+        if self._system_instruction is not None:
+            request.system_instruction = self._system_instruction
+        if response_schema is not None:
+            request.generation_config = self._protos.GenerationConfig(self._generation_types.to_generation_config_dict(
+                {"response_mime_type": "application/json", "response_schema": response_schema}
+            ))
+        return request
+
+    def generate(self, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> str:
+        response = self._client().generate_content(self._request(prompt, response_schema), **(_request_options() or {}))
+        return self._generation_types.GenerateContentResponse.from_response(response).text
+
+    def stream(self, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        chunks = self._client().stream_generate_content(
+            self._request(prompt, response_schema), **(_request_options() or {})
+        )
+        for chunk in self._generation_types.GenerateContentResponse.from_iterator(chunks):
+            if chunk.text:
+                yield chunk.text
+
+    def warm_up(self) -> None:
+        # count_tokens is a cheap authenticated call that sets up each client's TLS connection
+        request = self._protos.CountTokensRequest(model=self._model, contents=self._contents("warm-up"))
+        for client in self._clients:
+            client.count_tokens(request)
+
+
+class FakeBackendError(Exception):
+    """Injected failure; code mirrors the HTTP status a real backend would return."""
+
+    def __init__(self, message: str, code: int):
+        super().__init__(message)
+        self.code = code
+
+
+FAKE_QUESTION_TEMPLATES = [
+    "Explain the core concepts of {tech} and where you have applied them in a real project.",
+    "How would you debug a performance problem in a {tech} application that only appears under load?",
+    "What are the most common pitfalls when using {tech}, and how do you avoid them?",
+    "Describe how you would structure and test a medium-sized project built with {tech}.",
+    "Walk through a scenario where {tech} was not the right tool. What did you use instead, and why?",
+    "How does {tech} handle errors and failures, and how do you make that robust in production?",
+]
+
+
+class FakeBackend(LLMBackend):
+    """
+    Offline backend producing technical questions (numbered text, or JSON when a schema is given).
+
+    Latency follows a log-normal distribution around latency_ms; a fraction of
+    calls fail with a retryable 503, and calls beyond max_rps per second fail
+    with 429 like a quota limit would.
+    """
+
+    model_name = "fake"
+
+    def __init__(
+        self,
+        latency_ms: float = 800.0,
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        max_rps: float = 0.0,
+        chunk_count: int = 5,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            latency_ms: Median response latency in milliseconds
+            latency_sigma: Log-normal sigma of the latency (0 for constant latency)
+            error_rate: Probability that a call fails with a 503
+            max_rps: Maximum calls per second before failing with 429 (0 = unlimited)
+            chunk_count: Number of chunks a streamed reply is split into
+            seed: Random seed for reproducible runs
+        """
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.max_rps = max_rps
+        self.chunk_count = max(1, chunk_count)
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_calls = 0
+
+    def _admit(self) -> float:
+        """Apply throughput and error injection; return the latency to simulate in seconds."""
+        with self._lock:
+            self.calls += 1
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_calls = 0
+            self._window_calls += 1
+            if self.max_rps and self._window_calls > self.max_rps:
+                raise FakeBackendError("Fake backend quota exceeded.", code=429)
+            if self._random.random() < self.error_rate:
+                raise FakeBackendError("Fake backend unavailable.", code=503)
+            if self.latency_sigma > 0:
+                return self._random.lognormvariate(0, self.latency_sigma) * self.latency_ms / 1000.0
+            return self.latency_ms / 1000.0
+
+    def _reply(self, prompt: str, structured: bool = False) -> str:
+        """Build questions for the tech stack named in the prompt, as a numbered list or JSON."""
+        match = re.search(r"tech stack:\s*(.+)", prompt)
+        techs = [tech.strip() for tech in match.group(1).split(",") if tech.strip()] if match else ["software engineering"]
+        count_match = re.search(r"Generate (\d+) ", prompt)
+        with self._lock:
+            count = int(count_match.group(1)) if count_match else self._random.randint(3, 5)
+            templates = self._random.sample(FAKE_QUESTION_TEMPLATES, min(count, len(FAKE_QUESTION_TEMPLATES)))
+        questions = [
+            template.format(tech=techs[i % len(techs)])
+            for i, template in enumerate(templates)
+        ]
+        if structured:
+            return json.dumps({"questions": [
+                {
+                    "question": question,
+                    "technology": techs[i % len(techs)],
+                    "difficulty": ["easy", "medium", "hard"][min(2, i * 3 // len(questions))]
+                }
+                for i, question in enumerate(questions)
+            ]})
+        return "\n".join(f"{i + 1}. {question}" for i, question in enumerate(questions))
+
+    @staticmethod
+    def _wait(latency: float, timeout: Optional[float]) -> None:
+        """Sleep for the simulated latency, timing out like a real request would."""
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Fake backend request timed out after {timeout:.2f}s.")
+        time.sleep(latency)
+
+    def generate(self, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> str:
+        self._wait(self._admit(), attempt_timeout())
+        return self._reply(prompt, structured=response_schema is not None)
+
+    def stream(self, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        latency = self._admit()
+        timeout = attempt_timeout()
+        reply = self._reply(prompt, structured=response_schema is not None)
+        step = max(1, len(reply) // self.chunk_count)
+        for start in range(0, len(reply), step):
+            self._wait(latency / self.chunk_count, timeout)
+            if timeout is not None:
+                timeout -= latency / self.chunk_count
+            yield reply[start:start + step]
+
+
+def create_backend(name: Optional[str] = None) -> LLMBackend:
+    """
+    Create the LLM backend selected in configuration.
+
+    Args:
+        name: Backend name overriding LLM_BACKEND ("gemini" or "fake")
+
+    Returns:
+        LLMBackend: The configured backend
+    """
+    import config
+
+    name = (name or config.LLM_BACKEND).lower()
+    if name == "fake":
+        return FakeBackend(
+            latency_ms=config.FAKE_LLM_LATENCY_MS,
+            latency_sigma=config.FAKE_LLM_LATENCY_SIGMA,
+            error_rate=config.FAKE_LLM_ERROR_RATE,
+            max_rps=config.FAKE_LLM_MAX_RPS
+        )
+    if name == "gemini":
+        return GeminiBackend(
+            config.GEMINI_API_KEY,
+            config.GEMINI_MODEL,
+            system_instruction=config.SYSTEM_PROMPT,
+            transport=config.GEMINI_TRANSPORT,
+            client_options={"api_endpoint": config.GEMINI_API_ENDPOINT} if config.GEMINI_API_ENDPOINT else None,
+            channels=config.GEMINI_CHANNELS
+        )
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+_llm_backend = None
+_llm_backend_lock = threading.Lock()
+
+
+def _warm_up() -> None:
+    """Create the shared backend and warm it up, logging (not raising) failures."""
+    started = time.perf_counter()
+    try:
+        get_llm_backend().warm_up()
+    except Exception as e:
+        print(f"[ERROR] LLM warm-up failed: {e}")
+        return
+    print(f"DEBUG: LLM backend warmed up in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+def get_llm_backend() -> LLMBackend:
+    """
+    Return the process-wide LLM backend, creating it on first use.
+
+    Returns:
+        LLMBackend: Shared backend instance
+    """
+    global _llm_backend
+    if _llm_backend is None:
+        with _llm_backend_lock:
+            if _llm_backend is None:
+                _llm_backend = create_backend()
+    return _llm_backend
+
+
+def start_llm_warm_up() -> bool:
+    """
+    Create the shared backend and open its connections on a background thread.
+
+    Meant to run once per server process at startup (the app calls it from a
+    cached resource), so the first candidate does not pay for the setup.
+
+    Returns:
+        bool: True if a warm-up was started (LLM_WARMUP is enabled)
+    """
+    from config import LLM_WARMUP
+
+    if not LLM_WARMUP:
+        return False
+    threading.Thread(target=_warm_up, name="llm-warm-up", daemon=True).start()
+    return True
@@ -0,0 +1,310 @@
+"""
+Retry policy and circuit breaker for LLM calls.
+
+A RetryPolicy bounds every call by an overall deadline and spaces attempts
+with decorrelated jitter, so concurrent sessions do not retry in lockstep.
+Each attempt can read the time left with attempt_timeout() and pass it to the
+request as its timeout, so a single hung request cannot outlive the deadline.
+A process-wide CircuitBreaker stops all sessions from calling Gemini while it
+is failing and lets a single probe through once the cool-down has elapsed.
+"""
+import contextvars
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+# HTTP/gRPC status codes that indicate a transient server-side problem
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# google.api_core exception names for the same conditions (matched by name so
+# this module does not need to import the SDK)
+RETRYABLE_EXCEPTION_NAMES = {
+    "DeadlineExceeded",
+    "InternalServerError",
+    "ResourceExhausted",
+    "ServiceUnavailable",
+    "TooManyRequests",
+    "GatewayTimeout",
+    "BadGateway",
+    "Aborted",
+}
+
+
+# monotonic() deadline of the attempt running in this context, set by RetryPolicy.call
+_attempt_deadline = contextvars.ContextVar("llm_attempt_deadline", default=None)
+
+
+def attempt_timeout() -> Optional[float]:
+    """
+    Seconds left before the retry deadline of the running attempt.
+
+    Backends pass it as the request timeout.
+
+    Returns:
+        Optional[float]: Remaining seconds (at least a small positive value),
+            or None when not called from inside RetryPolicy.call
+    """
+    deadline = _attempt_deadline.get()
+    if deadline is None:
+        return None
+    return max(0.001, deadline - time.monotonic())
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+
+class EmptyResponseError(ValueError):
+    """Raised when the LLM returns no text; treated as retryable."""
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Decide whether an exception is worth retrying.
+
+    Args:
+        error: Exception raised by the LLM call
+
+    Returns:
+        bool: True for timeouts, rate limits, server errors and empty responses
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (EmptyResponseError, ConnectionError, TimeoutError)):
+        return True
+    if type(error).__name__ in RETRYABLE_EXCEPTION_NAMES:
+        return True
+    code = getattr(error, "code", None)
+    return isinstance(code, int) and code in RETRYABLE_STATUS_CODES
+
+
+class CircuitBreaker:
+    """
+    Thread-safe closed/open/half-open circuit breaker with transition counters.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before allowing a probe call
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.counters = {
+            "successes": 0,
+            "failures": 0,
+            "rejections": 0,
+            "trips": 0,
+            "half_open_probes": 0,
+            "recoveries": 0
+        }
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may proceed, moving open -> half-open after the cool-down.
+
+        Returns:
+            bool: True if the caller may make the request
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self.counters["half_open_probes"] += 1
+                return True
+
+            self.counters["rejections"] += 1
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit if it was probing."""
+        with self._lock:
+            self.counters["successes"] += 1
+            self.consecutive_failures = 0
+            if self.state != self.CLOSED:
+                self.counters["recoveries"] += 1
+            self.state = self.CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit when the threshold is reached."""
+        with self._lock:
+            self.counters["failures"] += 1
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.counters["trips"] += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report breaker state and counters.
+
+        Returns:
+            Dict: Current state, consecutive failures and transition counters
+        """
+        with self._lock:
+            return dict(self.counters, state=self.state, consecutive_failures=self.consecutive_failures)
+
+
+class RetryPolicy:
+    """
+    Deadline-bounded retries with decorrelated jitter, guarded by a circuit breaker.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        deadline: float = 10.0,
+        base_delay: float = 0.5,
+        max_delay: float = 4.0,
+        retryable: Callable[[Exception], bool] = is_retryable_error,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Args:
+            max_attempts: Maximum number of attempts per call
+            deadline: Overall time budget in seconds for all attempts and waits
+            base_delay: Minimum wait between attempts in seconds
+            max_delay: Maximum wait between attempts in seconds
+            retryable: Predicate classifying exceptions as retryable
+            breaker: Circuit breaker shared by all callers, if any
+        """
+        self.max_attempts = max_attempts
+        self.deadline = deadline
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable = retryable
+        self.breaker = breaker
+
+    def next_delay(self, previous_delay: float) -> float:
+        """
+        Compute the next wait using decorrelated jitter.
+
+        Args:
+            previous_delay: The previous wait (base_delay before the first retry)
+
+        Returns:
+            float: Seconds to wait before the next attempt
+        """
+        return min(self.max_delay, random.uniform(self.base_delay, previous_delay * 3))
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call a function under this policy.
+
+        Args:
+            func: Function performing one attempt
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Any: The function's result
+
+        Raises:
+            CircuitOpenError: If the breaker rejects the call
+            TimeoutError: If the deadline passed before an attempt could start
+            Exception: The last error once attempts or the deadline run out
+        """
+        give_up_at = time.monotonic() + self.deadline
+        delay = self.base_delay
+
+        for attempt in range(1, self.max_attempts + 1):
+            if time.monotonic() >= give_up_at:
+                raise TimeoutError(f"LLM retry deadline of {self.deadline:.1f}s exceeded.")
+            if self.breaker is not None and not self.breaker.allow_request():
+                raise CircuitOpenError("LLM circuit breaker is open; failing fast.")
+
+            # Backends bound the request by the time left (see attempt_timeout)
+            token = _attempt_deadline.set(give_up_at)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                retryable = self.retryable(e)
+                if self.breaker is not None:
+                    if retryable:
+                        self.breaker.record_failure()
+                    else:
+                        # The service answered; a bad request says nothing about its health
+                        self.breaker.record_success()
+                if not retryable or attempt == self.max_attempts:
+                    raise
+
+                delay = self.next_delay(delay)
+                remaining = give_up_at - time.monotonic()
+                if delay >= remaining:
+                    print(f"API Error: {e}. Retry deadline reached after {attempt} attempt(s).")
+                    raise
+                print(f"API Error: {e}. Retrying in {delay:.2f} seconds (attempt {attempt}/{self.max_attempts})...")
+                time.sleep(delay)
+                continue
+            finally:
+                _attempt_deadline.reset(token)
+
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return result
+
+
+_llm_breaker = None
+_llm_breaker_lock = threading.Lock()
+
+
+def get_llm_circuit_breaker() -> CircuitBreaker:
+    """
+    Return the process-wide circuit breaker shared by all LLM calls.
+
+    Returns:
+        CircuitBreaker: Shared breaker instance
+    """
+    global _llm_breaker
+    if _llm_breaker is None:
+        from config import LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_RESET_SECONDS
+        with _llm_breaker_lock:
+            if _llm_breaker is None:
+                _llm_breaker = CircuitBreaker(
+                    failure_threshold=LLM_BREAKER_FAILURE_THRESHOLD,
+                    reset_timeout=LLM_BREAKER_RESET_SECONDS
+                )
+    return _llm_breaker
+
+
+def get_llm_retry_policy() -> RetryPolicy:
+    """
+    Build the retry policy for LLM calls from configuration.
+
+    Returns:
+        RetryPolicy: Policy bound to the shared circuit breaker
+    """
+    from config import (
+        LLM_RETRY_MAX_ATTEMPTS,
+        LLM_RETRY_DEADLINE_SECONDS,
+        LLM_RETRY_BASE_DELAY,
+        LLM_RETRY_MAX_DELAY
+    )
+    return RetryPolicy(
+        max_attempts=LLM_RETRY_MAX_ATTEMPTS,
+        deadline=LLM_RETRY_DEADLINE_SECONDS,
+        base_delay=LLM_RETRY_BASE_DELAY,
+        max_delay=LLM_RETRY_MAX_DELAY,
+        breaker=get_llm_circuit_breaker()
+    )
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Concurrent end-to-end load test for the TalentScout interview flow.
+
+Runs N simulated candidates through ConversationManager.process_input
+(greeting -> every REQUIRED_INFO field -> confirmation -> questions ->
+answers -> closing) against the offline fake LLM backend and reports
+throughput, p50/p95/p99 latency per conversation state and peak memory.
+Results are written as JSON so runs can be compared across releases.
+
+Usage:
+    python load_test.py --candidates 200 --concurrency 50
+    python load_test.py --candidates 100 --latency-ms 1500 --error-rate 0.05 --output results.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+
+# A few stacks dominate real traffic; the rest exercise the long tail
+COMMON_STACKS = [
+    "python, sql",
+    "java, spring",
+    "javascript, react, node",
+    "python, django, postgresql",
+    "go, kubernetes, docker",
+]
+RARE_STACKS = [
+    "rust, webassembly",
+    "elixir, phoenix",
+    "scala, spark, kafka",
+    "c++, cuda",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Samples
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile value (0.0 for no samples)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def candidate_answers(index: int, rng: random.Random) -> Dict[str, str]:
+    """Build valid answers for every REQUIRED_INFO field."""
+    stack = rng.choice(COMMON_STACKS) if rng.random() < 0.8 else rng.choice(RARE_STACKS)
+    return {
+        "name": f"Candidate {index}",
+        "email": f"candidate{index}@example.com",
+        "phone": f"555{index:07d}"[-10:],
+        "experience": str(rng.randint(0, 15)),
+        "position": rng.choice(["Software Engineer", "Data Engineer", "Platform Engineer"]),
+        "location": rng.choice(["Hyderabad", "Bengaluru", "Remote"]),
+        "tech_stack": stack,
+    }
+
+
+def run_candidate(index: int, backend, think_time: float, samples: Dict[str, List[float]], lock: threading.Lock, seed: int) -> bool:
+    """
+    Drive one simulated candidate through the whole interview.
+
+    Returns:
+        bool: True if the interview reached the closing state
+    """
+    from chatbot import ConversationManager
+    from config import REQUIRED_INFO
+
+    rng = random.Random(seed + index)
+    answers = candidate_answers(index, rng)
+    manager = ConversationManager(backend=backend)
+    inputs = ["Hello"] + [answers[field] for field in REQUIRED_INFO] + ["yes", "My answers to the technical questions."]
+
+    local = []
+    for user_input in inputs:
+        state = manager.state
+        start = time.perf_counter()
+        manager.process_input(user_input)
+        local.append((state, time.perf_counter() - start))
+        if think_time:
+            time.sleep(rng.uniform(0.5, 1.5) * think_time)
+
+    with lock:
+        for state, elapsed in local:
+            samples.setdefault(state, []).append(elapsed)
+    return manager.state == "closing" and bool(manager.technical_questions)
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the load test and write the results."""
+    parser = argparse.ArgumentParser(description="Concurrent end-to-end interview load test.")
+    parser.add_argument("--candidates", type=int, default=100, help="Number of simulated candidates")
+    parser.add_argument("--concurrency", type=int, default=25, help="Candidates running at the same time")
+    parser.add_argument("--think-ms", type=float, default=200.0, help="Mean pause between candidate messages")
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Median fake LLM latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal sigma of the fake LLM latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake LLM calls failing with 503")
+    parser.add_argument("--max-rps", type=float, default=0.0, help="Fake LLM quota in calls per second (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--use-local-cache", action="store_true",
+                        help="Use the configured question cache/bank instead of a fresh temporary one")
+    parser.add_argument("--output", default="load_test_results.json", help="Where to write the JSON results")
+    args = parser.parse_args(argv)
+
+    if not args.use_local_cache:
+        # Fresh cache and empty bank so runs are comparable
+        scratch = tempfile.mkdtemp(prefix="talentscout-load-")
+        os.environ["QUESTION_CACHE_PATH"] = os.path.join(scratch, "questions.sqlite3")
+        os.environ["QUESTION_BANK_PATH"] = os.path.join(scratch, "question_bank.sqlite3")
+
+    from llm_backend import FakeBackend
+    from llm_retry import get_llm_circuit_breaker
+    from question_cache import get_question_cache
+    from single_flight import llm_single_flight
+
+    backend = FakeBackend(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        max_rps=args.max_rps,
+        seed=args.seed
+    )
+
+    samples = {}
+    lock = threading.Lock()
+    tracemalloc.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        outcomes = list(pool.map(
+            lambda i: run_candidate(i, backend, args.think_ms / 1000.0, samples, lock, args.seed),
+            range(args.candidates)
+        ))
+    elapsed = time.perf_counter() - started
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    completed = sum(outcomes)
+    results = {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "config": vars(args),
+        "elapsed_seconds": elapsed,
+        "interviews_completed": completed,
+        "interviews_failed": args.candidates - completed,
+        "throughput_interviews_per_second": completed / elapsed if elapsed else 0.0,
+        "peak_memory_bytes": peak_memory,
+        "states": {
+            state: {
+                "count": len(values),
+                "mean_ms": 1000 * sum(values) / len(values),
+                "p50_ms": 1000 * percentile(values, 50),
+                "p95_ms": 1000 * percentile(values, 95),
+                "p99_ms": 1000 * percentile(values, 99),
+                "max_ms": 1000 * max(values),
+            }
+            for state, values in samples.items()
+        },
+        "llm": {
+            "backend_calls": backend.calls,
+            "single_flight": llm_single_flight.stats(),
+            "circuit_breaker": get_llm_circuit_breaker().stats(),
+            "question_cache": get_question_cache().stats(),
+        }
+    }
+
+    print("\n=== Load Test Results ===\n")
+    print(f"Candidates: {args.candidates} (concurrency {args.concurrency}), completed: {completed}")
+    print(f"Elapsed: {elapsed:.2f}s, throughput: {results['throughput_interviews_per_second']:.2f} interviews/s")
+    print(f"Peak traced memory: {peak_memory / 1024 / 1024:.1f} MiB, LLM calls: {backend.calls}")
+    print(f"\n{'state':<24}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for state, stats in results["states"].items():
+        print(f"{state:<24}{stats['count']:>7}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    return 0 if completed == args.candidates else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Per-session memory benchmark for the interview state.
+
+Runs N simulated interviews through ConversationManager against the offline
+fake backend, then measures what each session keeps in memory:
+
+- before: the previous layout, with the transcript held twice
+  (ConversationManager.conversation_history and st.session_state.chat_history,
+  dict messages with string roles and formatted timestamps), the system prompt
+  in every history, the candidate info copied into user_data and the rendered
+  HTML of every shown message. That code no longer exists, so this layout is
+  reconstructed from the finished session (see legacy_state)
+- after: the session model (one Transcript of __slots__ messages with enum
+  roles and integer timestamps, one candidate_info dict, the shared system
+  message) and the app's rendered-message memo at its full size
+  (MESSAGE_HTML_MEMO_SIZE messages)
+
+Sizes are the deep sys.getsizeof of each session's objects. Objects shared by
+every session (interned role names, enum members, the shared system message)
+are not counted. With --restored, sessions are rebuilt from their checkpoint
+JSON first, which is how a resumed session holds its strings.
+
+Usage:
+    python memory_benchmark.py
+    python memory_benchmark.py --sessions 500 --restored --json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+
+def legacy_state(manager, profile_hints: Dict[str, Any], interview_status: str) -> Dict[str, Any]:
+    """
+    Rebuild the previous per-session layout from a session model.
+
+    Args:
+        manager: ConversationManager after the interview
+        profile_hints: Details extracted from free text
+        interview_status: Interview status
+
+    Returns:
+        Dict: conversation_history, chat_history, candidate_info, user_data and message_html as they used to be held
+    """
+    from config import SYSTEM_PROMPT
+    from session_model import Role
+    from utils import format_message_html
+
+    role_names = {Role.USER: "user", Role.ASSISTANT: "assistant"}
+    conversation_history = [{"role": "system", "content": SYSTEM_PROMPT}] + [
+        {"role": role_names[message.role], "content": message.content}
+        for message in manager.transcript if message.context
+    ]
+    chat_history = [
+        {"role": role_names[message.role], "content": message.shown_text, "timestamp": message.timestamp}
+        for message in manager.transcript if message.shown_text
+    ]
+    user_data = {"name": "", "email": "", "phone": "", "experience": "", "tech_stack": [], "submission_time": ""}
+    user_data.update(profile_hints)
+    user_data.update({key: value for key, value in manager.candidate_info.items() if key in user_data})
+    user_data["interview_status"] = interview_status
+    return {
+        "conversation_history": conversation_history,
+        "chat_history": chat_history,
+        "candidate_info": dict(manager.candidate_info),
+        "user_data": user_data,
+        "message_html": [
+            format_message_html(message["role"], message["content"], message["timestamp"])
+            for message in chat_history
+        ]
+    }
+
+
+def message_html_memo(manager) -> Dict[int, str]:
+    """
+    Build the app's rendered-message memo as it stands after rendering the transcript.
+
+    Args:
+        manager: ConversationManager after the interview
+
+    Returns:
+        Dict: HTML of the last MESSAGE_HTML_MEMO_SIZE messages, by transcript position
+    """
+    from config import MESSAGE_HTML_MEMO_SIZE
+    from session_model import Role
+    from utils import format_message_html
+
+    first = max(0, len(manager.transcript) - MESSAGE_HTML_MEMO_SIZE)
+    memo = {}
+    for index in range(first, len(manager.transcript)):
+        message = manager.transcript[index]
+        role = "user" if message.role == Role.USER else "assistant"
+        memo[index] = format_message_html(role, message.shown_text, message.timestamp) if message.shown_text else ""
+    return memo
+
+
+def run_session(index: int, backend, rng: random.Random):
+    """
+    Drive one interview the way the app does (hidden greeting trigger, questions shown one by one).
+
+    Returns:
+        ConversationManager: The finished conversation
+    """
+    from chatbot import ConversationManager
+    from config import REQUIRED_INFO
+    from load_test import candidate_answers
+
+    answers = candidate_answers(index, rng)
+    manager = ConversationManager(backend=backend)
+    manager.process_input("Hello")
+    manager.transcript[-2].display = ""
+    for user_input in [answers[field] for field in REQUIRED_INFO] + ["yes"]:
+        response = manager.process_input(user_input)
+    if "Here are your technical questions:" in response:
+        manager.transcript[-1].display = (
+            response.split("Here are your technical questions:")[0]
+            + "I've prepared some technical questions for you. I'll present them one by one."
+        )
+    manager.process_input("My answers to the technical questions.")
+    return manager
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Measure interview session memory before and after the session model.")
+    parser.add_argument("--sessions", type=int, default=200, help="Number of simulated interviews")
+    parser.add_argument("--restored", action="store_true", help="Measure sessions rebuilt from checkpoint JSON")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    # Fresh question cache and empty bank so runs are comparable
+    scratch = tempfile.mkdtemp(prefix="talentscout-memory-")
+    os.environ["QUESTION_CACHE_PATH"] = os.path.join(scratch, "questions.sqlite3")
+    os.environ["QUESTION_BANK_PATH"] = os.path.join(scratch, "question_bank.sqlite3")
+
+    from config import SYSTEM_PROMPT
+    from llm_backend import FakeBackend
+    from session_model import Role, Transcript, deep_sizeof, shared_system_message
+
+    backend = FakeBackend(latency_ms=0, latency_sigma=0, seed=args.seed)
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    managers = [run_session(index, backend, rng) for index in range(args.sessions)]
+    elapsed = time.perf_counter() - started
+
+    shared = {id(SYSTEM_PROMPT), id(shared_system_message(SYSTEM_PROMPT)), id("user"), id("assistant"), id("system")}
+    shared.update(id(role) for role in Role)
+
+    totals = {"before": {}, "after": {}}
+    for manager in managers:
+        profile_hints = {}
+        before = legacy_state(manager, profile_hints, "complete")
+        after = {
+            "transcript": manager.transcript,
+            "candidate_info": manager.candidate_info,
+            "profile_hints": profile_hints,
+            "interview_status": "complete",
+            "message_html": message_html_memo(manager)
+        }
+        if args.restored:
+            before = json.loads(json.dumps(before))
+            after["transcript"] = Transcript.from_records(json.loads(json.dumps(manager.transcript.to_records())))
+            after["candidate_info"] = json.loads(json.dumps(manager.candidate_info))
+        for label, state in (("before", before), ("after", after)):
+            seen = set(shared)
+            for name, value in state.items():
+                totals[label][name] = totals[label].get(name, 0) + deep_sizeof(value, seen)
+
+    per_session = {
+        label: {name: round(size / args.sessions) for name, size in parts.items()}
+        for label, parts in totals.items()
+    }
+    before_bytes = sum(per_session["before"].values())
+    after_bytes = sum(per_session["after"].values())
+    results = {
+        "sessions": args.sessions,
+        "restored": args.restored,
+        "messages_per_session": round(sum(len(manager.transcript) for manager in managers) / args.sessions, 1),
+        "simulation_seconds": round(elapsed, 2),
+        "bytes_per_session": {"before": before_bytes, "after": after_bytes},
+        "reduction_percent": round(100 * (before_bytes - after_bytes) / before_bytes, 1) if before_bytes else 0.0,
+        "breakdown": per_session
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"Sessions: {args.sessions}{' (restored from checkpoints)' if args.restored else ''}, "
+              f"{results['messages_per_session']} messages each")
+        for label in ("before", "after"):
+            print(f"\n{label}: {results['bytes_per_session'][label]} bytes per session")
+            for name, size in per_session[label].items():
+                print(f"  {name:<24}{size:>8}")
+        print(f"\nReduction: {results['reduction_percent']}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+-- Prepare the Supabase "users" table for versioned upserts.
+--
+-- store_user_data() upserts with on_conflict="email,session_id": every save of
+-- an interview replaces its own row with a newer version. PostgREST needs a
+-- unique index on (email, session_id) for that, plus the columns the app now
+-- writes. Safe to run more than once.
+--
+-- Run it in the Supabase SQL editor, or: psql "$DATABASE_URL" -f migrations/001_users_upsert_key.sql
+
+begin;
+
+alter table public.users add column if not exists session_id text;
+alter table public.users add column if not exists version integer not null default 1;
+alter table public.users add column if not exists content_hash text;
+alter table public.users add column if not exists position text;
+alter table public.users add column if not exists location text;
+alter table public.users add column if not exists interview_status text;
+
+-- Rows saved before sessions existed each get their own session id, so they
+-- never collide with each other or with new saves
+update public.users
+set session_id = 'legacy-' || replace(gen_random_uuid()::text, '-', '')
+where session_id is null;
+
+alter table public.users alter column session_id set not null;
+
+create unique index if not exists users_email_session_id_key on public.users (email, session_id);
+
+-- PostgREST caches the schema; reload it so the new columns are accepted at once
+notify pgrst, 'reload schema';
+
+commit;
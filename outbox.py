@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Durable outbox for remote (Supabase) writes.
+
+Every record bound for the remote database is first appended to a local
+journal as a pending entry; once the remote write succeeds an ack entry is
+appended. Entries still pending after a failure or a crash are replayed in
+batches with bounded concurrency, either when the app starts or with the
+CLI. Remote writes are upserts on (email, session_id), so replaying an entry
+that did reach the server is harmless; entries superseded by a newer version
+of the same record are acknowledged without being sent.
+
+The process owning the journal holds an exclusive lock on it, so the CLI
+refuses to drain (and compact) the journal while the app has it open;
+status opens it read-only.
+
+Usage:
+    python outbox.py status
+    python outbox.py drain [--batch-size 50] [--concurrency 4]
+    python outbox.py drain --sink memory --fail-batches 2    # local stand-in sink
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from candidate_store import FileLock, candidate_key, decode_record, encode_record
+
+# Journal size above which a fully acknowledged journal is truncated, and
+# above which compact_if_large() rewrites a journal that doubled since its last compaction
+COMPACT_BYTES = 1024 * 1024
+
+
+class OutboxError(Exception):
+    """Raised when the journal is owned by another process or written while read-only."""
+
+
+class Outbox:
+    """
+    Append-only journal of pending and acknowledged remote writes.
+    """
+
+    def __init__(self, path: str, fsync: bool = False, read_only: bool = False, wait_for_lock: bool = False):
+        """
+        Open (or create) the journal.
+
+        Args:
+            path: Location of the journal file
+            fsync: Whether to fsync after every journal write
+            read_only: Only read the backlog: no lock, no tail truncation, no writes
+            wait_for_lock: Wait for the owning process to close the journal instead of failing
+
+        Raises:
+            OutboxError: If another process owns the journal
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        # entry id -> (record, time added), in journal order
+        self._pending = {}
+        # candidate key -> newest version acknowledged by the remote database
+        self._acked_versions = {}
+        self._next_id = 1
+        self.acked = 0
+        self.read_only = read_only
+        self._journal = None
+        self._owner_lock = None
+        if not read_only:
+            self._owner_lock = FileLock(path + ".lock")
+            if not self._owner_lock.acquire(blocking=wait_for_lock):
+                self._owner_lock = None
+                raise OutboxError(f"Outbox {path} is open in another process.")
+        self._load()
+        if not read_only:
+            self._journal = open(path, "ab")
+        # Journal size after the last compaction (or at open)
+        self._compacted_bytes = self._journal.tell() if self._journal is not None else 0
+
+    def _load(self) -> None:
+        """Rebuild the pending set from the journal."""
+        if not os.path.exists(self.path):
+            return
+        valid_end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                entry = decode_record(line)
+                if entry is None:
+                    break
+                valid_end += len(line)
+                if entry["op"] == "put":
+                    self._pending[entry["id"]] = (entry["record"], entry.get("at", time.time()))
+                    self._next_id = max(self._next_id, entry["id"] + 1)
+                elif entry["op"] == "ack":
+                    self._mark_acked(entry["ids"])
+                elif entry["op"] == "versions":
+                    self._acked_versions.update(entry["versions"])
+        if os.path.getsize(self.path) > valid_end and not self.read_only:
+            # Drop a torn write at the end of the journal
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_end)
+
+    def _mark_acked(self, entry_ids: Sequence[int]) -> None:
+        """Drop acknowledged entries from the pending set, remembering their versions."""
+        for entry_id in entry_ids:
+            pending = self._pending.pop(entry_id, None)
+            if pending is None:
+                continue
+            key = candidate_key(pending[0])
+            self._acked_versions[key] = max(self._acked_versions.get(key, 0), pending[0].get("version", 0))
+            self.acked += 1
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        if self._journal is None:
+            raise OutboxError("Outbox is open read-only.")
+        self._journal.write(encode_record(entry))
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def add(self, record: Dict[str, Any]) -> int:
+        """
+        Journal a record as pending.
+
+        Args:
+            record: Record bound for the remote database
+
+        Returns:
+            int: Entry id used to acknowledge it
+        """
+        now = time.time()
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._append({"op": "put", "id": entry_id, "at": now, "record": record})
+            self._pending[entry_id] = (record, now)
+        return entry_id
+
+    def ack(self, entry_ids: Sequence[int]) -> None:
+        """
+        Mark entries as written to the remote database.
+
+        Args:
+            entry_ids: Entry ids returned by add()
+        """
+        with self._lock:
+            entry_ids = [entry_id for entry_id in entry_ids if entry_id in self._pending]
+            if not entry_ids:
+                return
+            self._append({"op": "ack", "ids": entry_ids})
+            self._mark_acked(entry_ids)
+            if not self._pending and self._journal.tell() > COMPACT_BYTES:
+                # Nothing pending: the journal history is no longer needed
+                self._journal.seek(0)
+                self._journal.truncate()
+                self._acked_versions = {}
+                self._compacted_bytes = 0
+
+    def pending(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return (entry id, record) for every unacknowledged entry, oldest first."""
+        with self._lock:
+            return [(entry_id, record) for entry_id, (record, _) in self._pending.items()]
+
+    def deliverable(self) -> Tuple[List[Tuple[int, Dict[str, Any]]], int]:
+        """
+        Acknowledge pending entries superseded by a newer version and return the rest.
+
+        Remote writes are upserts, so an older version sent after a newer one
+        (pending or already acknowledged) would overwrite the newer remote row;
+        such entries only need acknowledging.
+
+        Returns:
+            Tuple: (entry id, record) pairs still to send, oldest first, and the
+            number of superseded entries acknowledged
+        """
+        with self._lock:
+            entries = [(entry_id, record) for entry_id, (record, _) in self._pending.items()]
+            acked_versions = dict(self._acked_versions)
+        newest = dict(acked_versions)
+        for _, record in entries:
+            key = candidate_key(record)
+            newest[key] = max(newest.get(key, 0), record.get("version", 0))
+        superseded = [
+            entry_id for entry_id, record in entries
+            if record.get("version", 0) < newest[candidate_key(record)]
+            or record.get("version", 0) <= acked_versions.get(candidate_key(record), 0)
+        ]
+        self.ack(superseded)
+        skipped = set(superseded)
+        return [(entry_id, record) for entry_id, record in entries if entry_id not in skipped], len(superseded)
+
+    def compact(self) -> None:
+        """Rewrite the journal with only the pending entries."""
+        with self._lock:
+            if self._journal is None:
+                raise OutboxError("Outbox is open read-only.")
+            temp_path = self.path + ".tmp"
+            pending_keys = {candidate_key(record) for record, _ in self._pending.values()}
+            self._acked_versions = {
+                key: version for key, version in self._acked_versions.items() if key in pending_keys
+            }
+            with open(temp_path, "wb") as f:
+                if self._acked_versions:
+                    f.write(encode_record({"op": "versions", "versions": self._acked_versions}))
+                for entry_id, (record, added_at) in self._pending.items():
+                    f.write(encode_record({"op": "put", "id": entry_id, "at": added_at, "record": record}))
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal.close()
+            os.replace(temp_path, self.path)
+            self._journal = open(self.path, "ab")
+            self._compacted_bytes = self._journal.tell()
+
+    def compact_if_large(self) -> bool:
+        """
+        Compact the journal once it is past COMPACT_BYTES and twice its size after the last compaction.
+
+        Lets the owning process bound the journal while entries stay pending (a
+        remote outage), when the fully-acknowledged truncation in ack() never runs.
+
+        Returns:
+            bool: True if the journal was compacted
+        """
+        with self._lock:
+            if self._journal is None:
+                return False
+            size = self._journal.tell()
+            if size <= max(COMPACT_BYTES, 2 * self._compacted_bytes):
+                return False
+        self.compact()
+        print(f"DEBUG: Compacted outbox journal from {size} to {self._compacted_bytes} bytes")
+        return True
+
+    def replay(self, sink: Any, batch_size: int = 50, concurrency: int = 4) -> Dict[str, int]:
+        """
+        Send pending entries to a sink in batches, acknowledging each successful batch.
+
+        Args:
+            sink: Object with a write_batch(records) method
+            batch_size: Records per remote write
+            concurrency: Batches written at the same time
+
+        Returns:
+            Dict: Entries attempted, acknowledged (including superseded ones that
+            were not sent), superseded, and still pending after failures
+        """
+        to_send, superseded = self.deliverable()
+        batches = [to_send[i:i + batch_size] for i in range(0, len(to_send), max(1, batch_size))]
+
+        def send(batch: List[Tuple[int, Dict[str, Any]]]) -> int:
+            try:
+                sink.write_batch([record for _, record in batch])
+            except Exception as e:
+                print(f"[ERROR] Outbox replay of {len(batch)} entries failed: {e}")
+                return 0
+            self.ack([entry_id for entry_id, _ in batch])
+            return len(batch)
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            sent = sum(pool.map(send, batches))
+        return {
+            "attempted": len(to_send) + superseded,
+            "acked": sent + superseded,
+            "superseded": superseded,
+            "failed": len(to_send) - sent
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report the backlog.
+
+        Returns:
+            Dict: Pending entries, acknowledged entries, oldest pending age and journal size
+        """
+        with self._lock:
+            oldest = min((added_at for _, added_at in self._pending.values()), default=None)
+            return {
+                "pending": len(self._pending),
+                "acked": self.acked,
+                "oldest_pending_seconds": time.time() - oldest if oldest else 0.0,
+                "journal_bytes": self._journal.tell() if self._journal is not None else (
+                    os.path.getsize(self.path) if os.path.exists(self.path) else 0
+                )
+            }
+
+    def close(self) -> None:
+        """Close the journal and release its lock."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if self._owner_lock is not None:
+                self._owner_lock.release()
+                self._owner_lock = None
+
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox() -> Outbox:
+    """
+    Return the process-wide outbox, opening it on first use.
+
+    Waits while another process (such as a CLI drain) owns the journal.
+
+    Returns:
+        Outbox: Shared outbox instance
+    """
+    global _outbox
+    if _outbox is None:
+        from config import OUTBOX_PATH, OUTBOX_FSYNC
+        with _outbox_lock:
+            if _outbox is None:
+                _outbox = Outbox(OUTBOX_PATH, fsync=OUTBOX_FSYNC, wait_for_lock=True)
+    return _outbox
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from config import OUTBOX_PATH, OUTBOX_REPLAY_BATCH_SIZE, OUTBOX_REPLAY_CONCURRENCY
+    from write_behind import MemorySink, create_sink
+
+    parser = argparse.ArgumentParser(description="Inspect and drain the TalentScout remote-write outbox.")
+    parser.add_argument("--path", default=OUTBOX_PATH, help="Outbox journal file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("status", help="Show the pending backlog")
+
+    drain_parser = subparsers.add_parser("drain", help="Replay pending entries")
+    drain_parser.add_argument("--batch-size", type=int, default=OUTBOX_REPLAY_BATCH_SIZE, help="Records per remote write")
+    drain_parser.add_argument("--concurrency", type=int, default=OUTBOX_REPLAY_CONCURRENCY, help="Concurrent remote writes")
+    drain_parser.add_argument("--sink", default="supabase", choices=["supabase", "memory"], help="Where to replay to")
+    drain_parser.add_argument("--fail-batches", type=int, default=0,
+                              help="With --sink memory: fail this many batches first")
+
+    args = parser.parse_args(argv)
+    try:
+        outbox = Outbox(args.path, read_only=args.command == "status")
+    except OutboxError as e:
+        print(f"[ERROR] {e} The app replays pending entries itself; stop it before running drain.")
+        return 1
+
+    if args.command == "drain":
+        sink = MemorySink(fail_batches=args.fail_batches) if args.sink == "memory" else create_sink(args.sink)
+        started = time.perf_counter()
+        result = outbox.replay(sink, batch_size=args.batch_size, concurrency=args.concurrency)
+        print(f"Replayed {result['acked']}/{result['attempted']} entries "
+              f"({result['failed']} still pending) in {time.perf_counter() - started:.2f}s")
+        if not outbox.stats()["pending"]:
+            outbox.compact()
+
+    print(json.dumps(outbox.stats(), indent=2))
+    outbox.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Precomputed per-technology question bank.
+
+Each technology in VALID_TECHNOLOGIES gets a pool of questions tagged by
+difficulty, stored in SQLite under a (tech, position) primary key so sampling
+k questions is k index lookups. Technologies missing from the bank fall back
+to live Gemini generation in the chatbot.
+
+Usage:
+    python question_bank.py build                  # build technologies not yet in the bank
+    python question_bank.py build --tech python go   # rebuild only these technologies
+    python question_bank.py coverage
+"""
+import argparse
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from questions import DIFFICULTIES, TechnicalQuestion
+
+BANK_PROMPT = """
+You are a technical interviewer building a question bank for: {tech}
+
+Write {count} distinct interview questions about {tech}, spread evenly across
+easy, medium and hard difficulty. Mix theory, practical and scenario-based questions.
+
+Format every line exactly as: <number>. [<easy|medium|hard>] <question>
+"""
+
+
+def parse_bank_questions(text: str) -> List[Tuple[str, str]]:
+    """
+    Parse "1. [easy] Question" lines produced by BANK_PROMPT.
+
+    Args:
+        text: Raw LLM output
+
+    Returns:
+        List[Tuple[str, str]]: (difficulty, question) pairs
+    """
+    questions = []
+    for line in text.split("\n"):
+        match = re.match(r"^\s*\d+\.\s*\[(easy|medium|hard)\]\s*(.+)$", line.strip(), flags=re.IGNORECASE)
+        if match:
+            questions.append((match.group(1).lower(), match.group(2).strip()))
+    return questions
+
+
+def allocate_question_slots(tech_stack: Sequence[str], min_questions: int = 3, max_questions: int = 5) -> Dict[str, int]:
+    """
+    Spread 3-5 question slots over a tech stack, earlier technologies first.
+
+    Technologies beyond the max_questions-th get no slot: the candidate is
+    asked about the first technologies they listed. The allocation is
+    deterministic so speculative and confirm-time question generation agree.
+
+    Args:
+        tech_stack: Parsed list of technologies
+        min_questions: Minimum total number of questions
+        max_questions: Maximum total number of questions
+
+    Returns:
+        Dict[str, int]: Number of questions per technology
+    """
+    if not tech_stack:
+        return {}
+    total = max(min_questions, min(max_questions, len(tech_stack)))
+    slots = {tech: 0 for tech in tech_stack}
+    for i in range(total):
+        slots[tech_stack[i % len(tech_stack)]] += 1
+    return {tech: count for tech, count in slots.items() if count}
+
+
+class QuestionBank:
+    """
+    SQLite-backed pools of questions per technology.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the bank file.
+
+        Args:
+            path: Location of the SQLite file
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS bank_techs (
+                tech TEXT PRIMARY KEY,
+                question_count INTEGER NOT NULL,
+                built_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS bank_questions (
+                tech TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                difficulty TEXT NOT NULL,
+                question TEXT NOT NULL,
+                PRIMARY KEY (tech, position)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._conn.commit()
+
+    def count(self, tech: str) -> int:
+        """
+        Return the pool size of a technology.
+
+        Read from the bank file on every call (a primary-key lookup), so pools
+        built by the CLI while the app runs are used without a restart.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT question_count FROM bank_techs WHERE tech = ?", (tech,)).fetchone()
+        return row[0] if row else 0
+
+    def has(self, tech: str) -> bool:
+        """Return True if the bank holds questions for a technology."""
+        return self.count(tech) > 0
+
+    def replace_tech(self, tech: str, questions: List[Tuple[str, str]]) -> None:
+        """
+        Replace the question pool of one technology (incremental rebuild).
+
+        Args:
+            tech: Technology name
+            questions: (difficulty, question) pairs
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM bank_questions WHERE tech = ?", (tech,))
+            self._conn.executemany(
+                "INSERT INTO bank_questions (tech, position, difficulty, question) VALUES (?, ?, ?, ?)",
+                [(tech, position, difficulty, question) for position, (difficulty, question) in enumerate(questions)]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO bank_techs (tech, question_count, built_at) VALUES (?, ?, ?)",
+                (tech, len(questions), time.time())
+            )
+            self._conn.commit()
+
+    def sample(self, tech: str, k: int) -> List[Tuple[str, str]]:
+        """
+        Draw k distinct questions for a technology.
+
+        Args:
+            tech: Technology name
+            k: Number of questions wanted
+
+        Returns:
+            List[Tuple[str, str]]: (difficulty, question) pairs, at most k
+        """
+        for attempt in range(2):
+            count = self.count(tech)
+            positions = random.sample(range(count), min(k, count))
+            with self._lock:
+                rows = [
+                    self._conn.execute(
+                        "SELECT difficulty, question FROM bank_questions WHERE tech = ? AND position = ?",
+                        (tech, position)
+                    ).fetchone()
+                    for position in positions
+                ]
+            # Otherwise the pool was rebuilt by another process between the two reads: draw again
+            if None not in rows or attempt:
+                break
+        return [row for row in rows if row is not None]
+
+    def sample_for_stack(self, tech_stack: Sequence[str]) -> Tuple[List[TechnicalQuestion], List[str], int]:
+        """
+        Sample 3-5 questions for a tech stack from the bank.
+
+        Args:
+            tech_stack: Parsed list of technologies
+
+        Returns:
+            Tuple: (bank questions ordered easy to hard, technologies missing
+            from the bank, number of question slots left for those technologies)
+        """
+        picked = []
+        missing_techs = []
+        missing_slots = 0
+        for tech, slots in allocate_question_slots(list(tech_stack)).items():
+            if self.has(tech):
+                picked.extend(
+                    TechnicalQuestion(text=question, technology=tech, difficulty=difficulty)
+                    for difficulty, question in self.sample(tech, slots)
+                )
+            else:
+                missing_techs.append(tech)
+                missing_slots += slots
+
+        picked.sort(key=lambda q: DIFFICULTIES.index(q.difficulty) if q.difficulty in DIFFICULTIES else len(DIFFICULTIES))
+        return picked, missing_techs, missing_slots
+
+    def coverage(self, vocabulary: Sequence[str]) -> Dict[str, object]:
+        """
+        Report which technologies of a vocabulary are in the bank.
+
+        Args:
+            vocabulary: Technologies expected to be covered
+
+        Returns:
+            Dict: Covered/missing technologies, question total and coverage ratio
+        """
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT tech, question_count FROM bank_techs"))
+        covered = [tech for tech in vocabulary if counts.get(tech, 0) > 0]
+        missing = [tech for tech in vocabulary if counts.get(tech, 0) <= 0]
+        return {
+            "covered": covered,
+            "missing": missing,
+            "questions": sum(counts.values()),
+            "ratio": len(covered) / len(vocabulary) if vocabulary else 0.0
+        }
+
+
+_question_bank = None
+_question_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    """
+    Return the process-wide question bank, opening it on first use.
+
+    Returns:
+        QuestionBank: Shared bank instance
+    """
+    global _question_bank
+    if _question_bank is None:
+        from config import QUESTION_BANK_PATH
+        with _question_bank_lock:
+            if _question_bank is None:
+                _question_bank = QuestionBank(QUESTION_BANK_PATH)
+    return _question_bank
+
+
+def build_bank(bank: QuestionBank, techs: Sequence[str], per_tech: int, force: bool = False) -> None:
+    """
+    Generate question pools with the configured LLM backend for technologies not yet in the bank.
+
+    Args:
+        bank: Bank to fill
+        techs: Technologies to build
+        per_tech: Questions requested per technology
+        force: Rebuild technologies that are already present
+    """
+    from llm_backend import create_backend
+    from llm_retry import EmptyResponseError, get_llm_retry_policy
+
+    backend = create_backend()
+    policy = get_llm_retry_policy()
+
+    for tech in techs:
+        if bank.has(tech) and not force:
+            print(f"⏭️  {tech}: already in bank")
+            continue
+
+        def attempt() -> List[Tuple[str, str]]:
+            questions = parse_bank_questions(backend.generate(BANK_PROMPT.format(tech=tech, count=per_tech)))
+            if not questions:
+                raise EmptyResponseError(f"No parsable questions returned for {tech}.")
+            return questions
+
+        try:
+            questions = policy.call(attempt)
+        except Exception as e:
+            print(f"❌ {tech}: {e}")
+            continue
+        bank.replace_tech(tech, questions)
+        print(f"✅ {tech}: {len(questions)} questions")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from config import QUESTION_BANK_PATH, VALID_TECHNOLOGIES
+
+    parser = argparse.ArgumentParser(description="Build and inspect the TalentScout question bank.")
+    parser.add_argument("--path", default=QUESTION_BANK_PATH, help="Question bank file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Generate question pools with Gemini")
+    build_parser.add_argument("--tech", nargs="+", help="Only (re)build these technologies")
+    build_parser.add_argument("--per-tech", type=int, default=12, help="Questions per technology")
+    build_parser.add_argument("--force", action="store_true", help="Rebuild technologies already in the bank")
+
+    subparsers.add_parser("coverage", help="Show which technologies are covered")
+
+    args = parser.parse_args(argv)
+    bank = QuestionBank(args.path)
+
+    if args.command == "build":
+        techs = [tech.lower() for tech in args.tech] if args.tech else VALID_TECHNOLOGIES
+        build_bank(bank, techs, args.per_tech, force=args.force or bool(args.tech))
+
+    report = bank.coverage(VALID_TECHNOLOGIES)
+    print(f"\nCoverage: {len(report['covered'])}/{len(VALID_TECHNOLOGIES)} technologies "
+          f"({report['ratio']:.0%}), {report['questions']} questions")
+    if report["missing"]:
+        print(f"Missing: {', '.join(report['missing'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Disk-backed cache for generated technical questions.
+
+Questions are keyed by the canonical form of the candidate's tech stack so that
+"Python, SQL" and "sql and python" share one entry. Entries live in a local
+SQLite file, are evicted least-recently-used once the cache is full and expire
+after a fixed time-to-live.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+from utils import parse_tech_stack
+
+
+def normalize_tech_stack(tech_stack: Union[str, Iterable[str]]) -> str:
+    """
+    Build the canonical cache key for a tech stack.
+
+    Args:
+        tech_stack: Raw tech stack text or an already parsed list
+
+    Returns:
+        str: Lowercased, deduplicated, sorted technologies joined by commas
+    """
+    if isinstance(tech_stack, str):
+        technologies = parse_tech_stack(tech_stack)
+    else:
+        technologies = [tech.strip().lower() for tech in tech_stack if tech and tech.strip()]
+    return ",".join(sorted(set(technologies)))
+
+
+class QuestionCache:
+    """
+    Bounded LRU/TTL cache of technical questions persisted in SQLite.
+    """
+
+    def __init__(self, path: str, max_entries: int = 500, ttl_seconds: int = 7 * 24 * 3600):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path: Location of the SQLite file
+            max_entries: Maximum number of stacks kept before LRU eviction
+            ttl_seconds: Age after which an entry is treated as missing
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS questions (
+                stack_key TEXT PRIMARY KEY,
+                questions TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_last_used ON questions(last_used)")
+        self._conn.commit()
+
+    def get(self, tech_stack: Union[str, Iterable[str]]) -> Optional[List[str]]:
+        """
+        Look up cached questions for a tech stack.
+
+        Args:
+            tech_stack: Raw tech stack text or parsed list
+
+        Returns:
+            Optional[List[str]]: Cached questions, or None on a miss
+        """
+        key = normalize_tech_stack(tech_stack)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT questions, created_at FROM questions WHERE stack_key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM questions WHERE stack_key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE questions SET last_used = ? WHERE stack_key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, tech_stack: Union[str, Iterable[str]], questions: List[str]) -> None:
+        """
+        Store questions for a tech stack, evicting the oldest entries if full.
+
+        Args:
+            tech_stack: Raw tech stack text or parsed list
+            questions: Questions to cache
+        """
+        key = normalize_tech_stack(tech_stack)
+        if not key or not questions:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO questions (stack_key, questions, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(questions), now, now)
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM questions WHERE stack_key IN "
+                    "(SELECT stack_key FROM questions ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report cache counters.
+
+        Returns:
+            Dict: Hits, misses, evictions and current number of entries
+        """
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": size
+        }
+
+
+_question_cache = None
+_question_cache_lock = threading.Lock()
+
+
+def get_question_cache() -> QuestionCache:
+    """
+    Return the process-wide question cache, creating it on first use.
+
+    Returns:
+        QuestionCache: Shared cache instance
+    """
+    global _question_cache
+    if _question_cache is None:
+        from config import QUESTION_CACHE_PATH, QUESTION_CACHE_MAX_ENTRIES, QUESTION_CACHE_TTL_SECONDS
+        with _question_cache_lock:
+            if _question_cache is None:
+                _question_cache = QuestionCache(
+                    QUESTION_CACHE_PATH,
+                    max_entries=QUESTION_CACHE_MAX_ENTRIES,
+                    ttl_seconds=QUESTION_CACHE_TTL_SECONDS
+                )
+    return _question_cache
@@ -0,0 +1,119 @@
+"""
+Typed technical questions and their structured (JSON) LLM format.
+
+Questions are parsed once, when the LLM response arrives, into
+TechnicalQuestion objects that the chatbot, cache, question bank and UI all
+share. Nothing downstream re-parses formatted text.
+"""
+import json
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+# JSON schema passed to the LLM as its structured output format
+QUESTION_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "questions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "question": {"type": "string"},
+                    "technology": {"type": "string"},
+                    "difficulty": {"type": "string", "enum": DIFFICULTIES}
+                },
+                "required": ["question", "technology", "difficulty"]
+            }
+        }
+    },
+    "required": ["questions"]
+}
+
+
+@dataclass
+class TechnicalQuestion:
+    """A single technical question."""
+
+    text: str
+    technology: str = ""
+    difficulty: str = ""
+
+    def to_dict(self) -> Dict[str, str]:
+        """Return the question as a plain dict (cache and export format)."""
+        return asdict(self)
+
+    @classmethod
+    def from_value(cls, value: Any) -> "TechnicalQuestion":
+        """
+        Build a question from a stored dict, an LLM item or a plain string.
+
+        Args:
+            value: Dict with text/question, technology and difficulty keys, or a string
+
+        Returns:
+            TechnicalQuestion: The parsed question
+        """
+        if isinstance(value, TechnicalQuestion):
+            return value
+        if isinstance(value, str):
+            return cls(text=value.strip())
+        text = value.get("text") or value.get("question") or ""
+        difficulty = str(value.get("difficulty", "")).lower()
+        return cls(
+            text=text.strip(),
+            technology=str(value.get("technology", "")).strip().lower(),
+            difficulty=difficulty if difficulty in DIFFICULTIES else ""
+        )
+
+
+def parse_questions_json(response_text: str) -> List[TechnicalQuestion]:
+    """
+    Parse a structured question response.
+
+    Args:
+        response_text: JSON text matching QUESTION_RESPONSE_SCHEMA
+
+    Returns:
+        List[TechnicalQuestion]: Parsed questions (empty if the JSON is malformed)
+    """
+    try:
+        payload = json.loads(response_text)
+    except (TypeError, ValueError):
+        return []
+
+    items = payload.get("questions", []) if isinstance(payload, dict) else payload
+    if not isinstance(items, list):
+        return []
+
+    questions = []
+    for item in items:
+        if isinstance(item, (dict, str)):
+            question = TechnicalQuestion.from_value(item)
+            if question.text:
+                questions.append(question)
+    return questions
+
+
+_QUESTION_FIELD = re.compile(r'"question"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def completed_question_texts(partial_json: str) -> List[str]:
+    """
+    Extract the question texts already complete in a partially streamed JSON response.
+
+    Args:
+        partial_json: JSON text received so far
+
+    Returns:
+        List[str]: Texts of every "question" field whose string has been closed
+    """
+    texts = []
+    for match in _QUESTION_FIELD.finditer(partial_json):
+        try:
+            texts.append(json.loads(f'"{match.group(1)}"'))
+        except ValueError:
+            texts.append(match.group(1))
+    return texts
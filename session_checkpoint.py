@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Per-session checkpoint logs for resuming interrupted interviews.
+
+Each interview session has an append-only log of small delta events, one
+CRC-checked JSON line each (the candidate store's line format):
+
+    {"op": "set", "name": ..., "value": ...}        a value changed
+    {"op": "append", "name": ..., "items": [...]}   items added to a list
+                                                    ("reset": true starts it over)
+    {"op": "update", "name": ..., "values": {...}}  keys changed in a mapping
+
+A checkpoint only writes what changed since the previous one (new messages,
+a new answer, the fields that moved), so its cost depends on the event, not
+on the length of the interview. Folding the log in order rebuilds the
+session state after a worker restart or a browser reconnect.
+
+Usage:
+    python session_checkpoint.py list
+    python session_checkpoint.py show <session_id>
+    python session_checkpoint.py prune [--older-than SECONDS]
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from candidate_store import decode_record, encode_record
+
+CHECKPOINT_SUFFIX = ".ckpt"
+
+# Session ids come from the URL, so only app-generated ids map to files
+SESSION_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def is_valid_session_id(session_id: Any) -> bool:
+    """
+    Check that a session id has the app's format (uuid4 hex).
+
+    Args:
+        session_id: Candidate session id, e.g. from the URL
+
+    Returns:
+        bool: True if it can name a checkpoint log
+    """
+    return isinstance(session_id, str) and SESSION_ID_PATTERN.fullmatch(session_id) is not None
+
+
+class SessionCheckpoint:
+    """
+    Delta checkpoint log of one session.
+    """
+
+    def __init__(self, directory: str, session_id: str, fsync: bool = False):
+        """
+        Args:
+            directory: Directory holding the checkpoint logs
+            session_id: Session the log belongs to
+            fsync: Whether to fsync after every checkpoint
+
+        Raises:
+            ValueError: If the session id is not a valid session id
+        """
+        if not is_valid_session_id(session_id):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        self.session_id = session_id
+        self.path = os.path.join(directory, session_id + CHECKPOINT_SUFFIX)
+        self.fsync = fsync
+        # What the log already holds: encoded value (set), item count (append), mapping (update)
+        self._written = {}
+        self._pending = []
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Fold the log into the session state it describes.
+
+        Also primes the checkpoint so the next commit only writes new changes.
+
+        Returns:
+            Optional[Dict]: Name -> value, or None if the session has no log
+        """
+        if not os.path.exists(self.path):
+            return None
+        state = {}
+        ops = {}
+        valid_end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                event = decode_record(line)
+                if event is None:
+                    break
+                valid_end += len(line)
+                name = event["name"]
+                # A name is always written with the same kind of event
+                ops.setdefault(name, event["op"])
+                if event["op"] == "set":
+                    state[name] = event["value"]
+                elif event["op"] == "append":
+                    if event.get("reset"):
+                        state[name] = []
+                    state.setdefault(name, []).extend(event["items"])
+                elif event["op"] == "update":
+                    state.setdefault(name, {}).update(event["values"])
+        if os.path.getsize(self.path) > valid_end:
+            # Drop a torn write at the end of the log
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_end)
+
+        for name, value in state.items():
+            if ops[name] == "append":
+                self._written[name] = len(value)
+            elif ops[name] == "update":
+                self._written[name] = dict(value)
+            else:
+                self._written[name] = json.dumps(value, sort_keys=True)
+        return state
+
+    def set(self, name: str, value: Any) -> None:
+        """
+        Record a JSON-serializable value if it changed since the last checkpoint.
+
+        Args:
+            name: State name
+            value: Current value
+        """
+        encoded = json.dumps(value, sort_keys=True)
+        if self._written.get(name) != encoded:
+            self._written[name] = encoded
+            self._pending.append({"op": "set", "name": name, "value": value})
+
+    def append(self, name: str, items: Sequence[Any], encode: Optional[Callable[[Any], Any]] = None) -> None:
+        """
+        Record the items added to an append-only list since the last checkpoint.
+
+        Args:
+            name: State name
+            items: Current list (only the tail past the last checkpoint is written)
+            encode: Converts an item to a JSON-serializable value (default: items are written as is)
+        """
+        encode = encode or (lambda item: item)
+        written = self._written.get(name, 0)
+        if len(items) < written:
+            # The list was replaced by a shorter one: start it over
+            self._pending.append({"op": "append", "name": name, "items": [encode(item) for item in items], "reset": True})
+        elif len(items) > written:
+            self._pending.append({"op": "append", "name": name,
+                                  "items": [encode(items[i]) for i in range(written, len(items))]})
+        self._written[name] = len(items)
+
+    def update(self, name: str, mapping: Dict[str, Any]) -> None:
+        """
+        Record the keys of a mapping that changed since the last checkpoint.
+
+        Args:
+            name: State name
+            mapping: Current mapping (values must be JSON-serializable and immutable)
+        """
+        written = self._written.setdefault(name, {})
+        changed = {key: value for key, value in mapping.items() if key not in written or written[key] != value}
+        if changed:
+            written.update(changed)
+            self._pending.append({"op": "update", "name": name, "values": changed})
+
+    def commit(self) -> int:
+        """
+        Append the recorded changes to the log in one write.
+
+        Returns:
+            int: Number of delta events written
+        """
+        if not self._pending:
+            return 0
+        events, self._pending = self._pending, []
+        with open(self.path, "ab") as f:
+            f.write(b"".join(encode_record(event) for event in events))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        return len(events)
+
+    def discard(self) -> None:
+        """Delete the log (the session was reset or is no longer resumable)."""
+        self._written = {}
+        self._pending = []
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def prune_checkpoints(directory: str, max_age_seconds: float) -> int:
+    """
+    Delete checkpoint logs not written to for a while.
+
+    Args:
+        directory: Directory holding the checkpoint logs
+        max_age_seconds: Age of the last write above which a log is deleted
+
+    Returns:
+        int: Number of logs deleted
+    """
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for path in glob.glob(os.path.join(directory, "*" + CHECKPOINT_SUFFIX)):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError as e:
+            print(f"[ERROR] Could not prune {path}: {e}")
+    return removed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from config import SESSION_CHECKPOINT_DIR, SESSION_CHECKPOINT_TTL_SECONDS
+
+    parser = argparse.ArgumentParser(description="Inspect and prune interview session checkpoints.")
+    parser.add_argument("--path", default=SESSION_CHECKPOINT_DIR, help="Checkpoint directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="List resumable sessions, most recent first")
+    show_parser = subparsers.add_parser("show", help="Print the state rebuilt from a session's log")
+    show_parser.add_argument("session_id", help="Session id")
+    prune_parser = subparsers.add_parser("prune", help="Delete stale checkpoint logs")
+    prune_parser.add_argument("--older-than", type=float, default=SESSION_CHECKPOINT_TTL_SECONDS,
+                              help="Seconds since the last write")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        paths = sorted(glob.glob(os.path.join(args.path, "*" + CHECKPOINT_SUFFIX)), key=os.path.getmtime, reverse=True)
+        sessions = [{
+            "session_id": os.path.basename(path)[:-len(CHECKPOINT_SUFFIX)],
+            "bytes": os.path.getsize(path),
+            "idle_seconds": round(time.time() - os.path.getmtime(path), 1)
+        } for path in paths]
+        print(json.dumps(sessions, indent=2))
+    elif args.command == "show":
+        state = SessionCheckpoint(args.path, args.session_id).load()
+        if state is None:
+            print(f"No checkpoint for session {args.session_id}")
+            return 1
+        print(json.dumps(state, indent=2))
+    else:
+        print(f"Pruned {prune_checkpoints(args.path, args.older_than)} checkpoint logs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
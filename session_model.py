@@ -0,0 +1,180 @@
+"""
+Compact per-session conversation model.
+
+The transcript is the single record of a conversation: ConversationManager
+appends to it, the Streamlit UI renders from it and checkpoints persist it.
+Messages use __slots__, an IntEnum role and integer epoch timestamps, and
+the system prompt is one shared, interned message instead of a copy per
+session.
+"""
+import dataclasses
+import enum
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+
+
+class Role(enum.IntEnum):
+    """Sender of a transcript message."""
+
+    SYSTEM = 0
+    USER = 1
+    ASSISTANT = 2
+
+
+class Message:
+    """
+    One transcript entry.
+    """
+
+    __slots__ = ("role", "content", "created", "display", "context")
+
+    def __init__(
+        self,
+        role: Role,
+        content: str,
+        created: Optional[int] = None,
+        display: Optional[str] = None,
+        context: bool = True
+    ):
+        """
+        Args:
+            role: Who sent the message
+            content: Message text
+            created: Epoch seconds (default: now)
+            display: Text shown in the chat instead of content ("" hides the message), or None
+            context: Whether the message is part of the interview (False for UI-only notices)
+        """
+        self.role = role
+        self.content = content
+        self.created = int(time.time()) if created is None else created
+        self.display = display
+        self.context = context
+
+    @property
+    def shown_text(self) -> str:
+        """Text shown in the chat ("" for hidden messages)."""
+        return self.content if self.display is None else self.display
+
+    @property
+    def timestamp(self) -> str:
+        """Local time of day the message was created (HH:MM:SS)."""
+        return time.strftime("%H:%M:%S", time.localtime(self.created))
+
+    def to_record(self) -> List[Any]:
+        """Encode the message as a compact JSON-serializable list."""
+        return [int(self.role), self.content, self.created, self.display, self.context]
+
+    @classmethod
+    def from_record(cls, record: Sequence[Any]) -> "Message":
+        """Decode a message encoded by to_record."""
+        role, content, created, display, context = record
+        return cls(Role(role), content, created, display, context)
+
+    def __repr__(self) -> str:
+        return f"Message({self.role.name}, {self.content[:30]!r}, created={self.created})"
+
+
+class Transcript:
+    """
+    Append-only list of the messages of one conversation.
+    """
+
+    __slots__ = ("messages",)
+
+    def __init__(self, messages: Optional[List[Message]] = None):
+        """
+        Args:
+            messages: Initial messages, oldest first
+        """
+        self.messages = messages if messages is not None else []
+
+    def add(self, role: Role, content: str, display: Optional[str] = None, context: bool = True) -> Message:
+        """
+        Append a message.
+
+        Args:
+            role: Who sent the message
+            content: Message text
+            display: Text shown in the chat instead of content ("" hides the message)
+            context: Whether the message is part of the interview (False for UI-only notices)
+
+        Returns:
+            Message: The appended message
+        """
+        message = Message(role, content, display=display, context=context)
+        self.messages.append(message)
+        return message
+
+    def last(self, role: Role) -> Optional[Message]:
+        """Return the most recent message from a role, if any."""
+        for message in reversed(self.messages):
+            if message.role == role:
+                return message
+        return None
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def __getitem__(self, index: int) -> Message:
+        return self.messages[index]
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self.messages)
+
+    def to_records(self) -> List[List[Any]]:
+        """Encode every message with Message.to_record."""
+        return [message.to_record() for message in self.messages]
+
+    @classmethod
+    def from_records(cls, records: Sequence[Sequence[Any]]) -> "Transcript":
+        """Rebuild a transcript from Message.to_record lists."""
+        return cls([Message.from_record(record) for record in records])
+
+
+_system_messages: Dict[str, Message] = {}
+
+
+def shared_system_message(prompt: str) -> Message:
+    """
+    Return the process-wide system message for a prompt.
+
+    Every session references the same interned prompt and message, so
+    sessions hold no copy of the system prompt.
+
+    Args:
+        prompt: System prompt text
+
+    Returns:
+        Message: Shared system message (do not modify)
+    """
+    message = _system_messages.get(prompt)
+    if message is None:
+        message = _system_messages.setdefault(prompt, Message(Role.SYSTEM, sys.intern(prompt), created=0))
+    return message
+
+
+def deep_sizeof(obj: Any, seen: Set[int]) -> int:
+    """
+    Size of an object and everything it references, counting each object once.
+
+    Args:
+        obj: Root object
+        seen: Ids already counted (pre-filled with shared objects to skip them)
+
+    Returns:
+        int: Bytes
+    """
+    if id(obj) in seen or obj is None or isinstance(obj, bool):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(type(obj), "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, slot), seen) for slot in type(obj).__slots__ if hasattr(obj, slot))
+    elif dataclasses.is_dataclass(obj):
+        size += deep_sizeof(vars(obj), seen)
+    return size
@@ -0,0 +1,257 @@
+"""
+Process-wide registry of live interview sessions.
+
+Streamlit keeps every browser tab's session state in memory until the server
+process recycles it, so abandoned tabs accumulate. The app touches the
+registry on every run with the session's approximate size and marks the
+session as running while its script runs; a background sweeper then evicts
+sessions idle past a TTL and, while the total is above a memory ceiling, the
+least recently active ones, skipping sessions that are running. Eviction
+itself (save, checkpoint, clear the state) is a callback supplied by the app.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+# Called with (session_id, session state) for each evicted session
+EvictCallback = Callable[[str, Any], None]
+
+
+class SessionEntry:
+    """Registry record of one session."""
+
+    __slots__ = ("session_id", "state", "last_active", "approx_bytes")
+
+    def __init__(self, session_id: str, state: Any, last_active: float, approx_bytes: int):
+        self.session_id = session_id
+        self.state = state
+        self.last_active = last_active
+        self.approx_bytes = approx_bytes
+
+
+class SessionRegistry:
+    """
+    Last activity and approximate memory of live sessions, with idle and LRU eviction.
+    """
+
+    def __init__(
+        self,
+        idle_ttl_seconds: float = 1800.0,
+        max_total_bytes: int = 0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            idle_ttl_seconds: Inactivity after which a session is evicted (0 = never)
+            max_total_bytes: Total session memory above which the least recently active
+                sessions are evicted (0 = no ceiling)
+            clock: Time source
+        """
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_total_bytes = max_total_bytes
+        self.clock = clock
+        # Least recently active first
+        self._sessions = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        # Signalled when an eviction finishes, for runs waiting to start
+        self._evicted = threading.Condition(self._lock)
+        # Session id -> number of script runs in progress (runs nest: callbacks, fragments)
+        self._running = {}
+        # Sessions being evicted right now
+        self._evicting = set()
+        self._sweeper = None
+        self.counters = {"evicted_idle": 0, "evicted_memory": 0, "eviction_failures": 0}
+
+    def touch(self, session_id: str, state: Any, approx_bytes: int) -> None:
+        """
+        Record activity in a session.
+
+        Args:
+            session_id: Session id
+            state: The session's state, handed to the evict callback
+            approx_bytes: Current approximate size of the session
+        """
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:
+                entry = SessionEntry(session_id, state, 0.0, 0)
+            self._total_bytes += approx_bytes - entry.approx_bytes
+            entry.state = state
+            entry.last_active = self.clock()
+            entry.approx_bytes = approx_bytes
+            self._sessions[session_id] = entry
+
+    @contextmanager
+    def running(self, session_id: str):
+        """
+        Mark a session as running for the duration of a script run, so sweeps leave it alone.
+        A run that starts while its session is being evicted waits for the eviction to finish.
+
+        Args:
+            session_id: Session id
+        """
+        with self._lock:
+            while session_id in self._evicting:
+                self._evicted.wait()
+            self._running[session_id] = self._running.get(session_id, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                count = self._running.pop(session_id) - 1
+                if count:
+                    self._running[session_id] = count
+
+    def forget(self, session_id: str) -> None:
+        """
+        Stop tracking a session (it was reset or evicted).
+
+        Args:
+            session_id: Session id
+        """
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                self._total_bytes -= entry.approx_bytes
+
+    def sweep(self, evict: EvictCallback, exclude: Optional[str] = None) -> List[str]:
+        """
+        Evict idle sessions, then the least recently active ones while over the memory ceiling.
+        Running sessions are never evicted.
+
+        Args:
+            evict: Callback saving, checkpointing and clearing a session
+            exclude: Another session that must not be evicted
+
+        Returns:
+            List[str]: Evicted session ids
+        """
+        victims = []
+        with self._lock:
+            cutoff = self.clock() - self.idle_ttl_seconds
+            for entry in list(self._sessions.values()):
+                if not self.idle_ttl_seconds or entry.last_active >= cutoff:
+                    # Entries are ordered by activity, so the rest are newer
+                    break
+                if entry.session_id != exclude and entry.session_id not in self._running:
+                    victims.append((entry, "evicted_idle"))
+            total = self._total_bytes - sum(entry.approx_bytes for entry, _ in victims)
+            if self.max_total_bytes and total > self.max_total_bytes:
+                chosen = {entry.session_id for entry, _ in victims}
+                for entry in self._sessions.values():
+                    if total <= self.max_total_bytes:
+                        break
+                    if entry.session_id in chosen or entry.session_id == exclude or entry.session_id in self._running:
+                        continue
+                    victims.append((entry, "evicted_memory"))
+                    total -= entry.approx_bytes
+            for entry, _ in victims:
+                self._sessions.pop(entry.session_id, None)
+                self._total_bytes -= entry.approx_bytes
+                # Runs starting from now wait until the session is evicted
+                self._evicting.add(entry.session_id)
+
+        # Evict outside the lock: saving and checkpointing do I/O
+        evicted = []
+        for entry, reason in victims:
+            try:
+                evict(entry.session_id, entry.state)
+            except Exception as e:
+                print(f"[ERROR] Failed to evict session {entry.session_id}: {e}")
+                reason = "eviction_failures"
+            with self._lock:
+                self.counters[reason] += 1
+                self._evicting.discard(entry.session_id)
+                self._evicted.notify_all()
+            if reason == "eviction_failures":
+                continue
+            evicted.append(entry.session_id)
+            idle = self.clock() - entry.last_active
+            print(f"DEBUG: Evicted session {entry.session_id} ({reason}, idle {idle:.0f}s, ~{entry.approx_bytes} bytes)")
+        return evicted
+
+    def start_sweeper(self, evict: EvictCallback, interval: float) -> None:
+        """
+        Sweep periodically on a daemon thread. Page runs do not sweep, so no
+        run waits on another session's eviction I/O.
+
+        Args:
+            evict: Callback saving, checkpointing and clearing a session
+            interval: Seconds between sweeps (0 disables the sweeper)
+        """
+        with self._lock:
+            if self._sweeper is not None or interval <= 0:
+                return
+            self._sweeper = threading.Thread(
+                target=self._sweep_forever, args=(evict, interval), name="session-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def _sweep_forever(self, evict: EvictCallback, interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            self.sweep(evict)
+
+    def sessions(self) -> List[Dict[str, Any]]:
+        """
+        Describe every live session, most recently active first.
+
+        Returns:
+            List[Dict]: Session id, idle seconds, approximate bytes and whether it is running
+        """
+        now = self.clock()
+        with self._lock:
+            return [{
+                "session_id": entry.session_id,
+                "idle_seconds": round(now - entry.last_active, 1),
+                "approx_bytes": entry.approx_bytes,
+                "running": entry.session_id in self._running
+            } for entry in reversed(self._sessions.values())]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Live session count, memory totals and eviction counters.
+
+        Returns:
+            Dict: Registry statistics
+        """
+        with self._lock:
+            count = len(self._sessions)
+            largest = max((entry.approx_bytes for entry in self._sessions.values()), default=0)
+            return dict(
+                self.counters,
+                live_sessions=count,
+                running_sessions=len(self._running),
+                total_bytes=self._total_bytes,
+                bytes_per_session=self._total_bytes // count if count else 0,
+                largest_session_bytes=largest,
+                idle_ttl_seconds=self.idle_ttl_seconds,
+                max_total_bytes=self.max_total_bytes
+            )
+
+
+_session_registry = None
+_session_registry_lock = threading.Lock()
+
+
+def get_session_registry() -> SessionRegistry:
+    """
+    Return the process-wide session registry, creating it on first use.
+
+    Returns:
+        SessionRegistry: Shared registry instance
+    """
+    global _session_registry
+    if _session_registry is None:
+        from config import SESSION_IDLE_TTL_SECONDS, SESSION_MEMORY_CEILING_BYTES
+
+        with _session_registry_lock:
+            if _session_registry is None:
+                _session_registry = SessionRegistry(
+                    idle_ttl_seconds=SESSION_IDLE_TTL_SECONDS,
+                    max_total_bytes=SESSION_MEMORY_CEILING_BYTES
+                )
+    return _session_registry
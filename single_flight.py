@@ -0,0 +1,168 @@
+"""
+Request coalescing (single-flight) for identical LLM prompts.
+
+When several sessions send the same prompt to the same model at the same time,
+only the first caller performs the request; the others wait for it and share
+its result (or its exception). Waiters give up after a timeout, so a hung
+request cannot freeze every session that joined it.
+
+do() wraps a plain call. Callers that produce the result themselves, such as
+a streamed response, use join_or_lead() to atomically either take the lead
+or join the flight in progress, then complete() or wait().
+"""
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def prompt_key(model_name: str, prompt: str) -> str:
+    """
+    Build the coalescing key for a prompt.
+
+    Args:
+        model_name: Name of the model the prompt is sent to
+        prompt: Prompt text
+
+    Returns:
+        str: SHA-256 hex digest of model and prompt
+    """
+    return hashlib.sha256(f"{model_name}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class Flight:
+    """A single in-flight call and the outcome shared with its waiters."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Process-wide deduplication of concurrent calls sharing a key.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.counters = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "timeouts": 0
+        }
+
+    def join_or_lead(self, key: str) -> Tuple[Flight, bool]:
+        """
+        Take the lead for key, or join the call already in flight, atomically.
+
+        A leader must call complete() exactly once; a follower calls wait().
+
+        Args:
+            key: Coalescing key (see prompt_key)
+
+        Returns:
+            Tuple[Flight, bool]: The flight and whether the caller leads it
+        """
+        with self._lock:
+            self.counters["calls"] += 1
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = Flight()
+                self._flights[key] = flight
+                self.counters["executions"] += 1
+                return flight, True
+            flight.waiters += 1
+            self.counters["coalesced"] += 1
+            return flight, False
+
+    def complete(self, key: str, flight: Flight, result: Any = None, error: Optional[Exception] = None) -> None:
+        """
+        Publish the leader's outcome and release the waiters.
+
+        Args:
+            key: Coalescing key the flight was started for
+            flight: Flight returned by join_or_lead
+            result: Shared result
+            error: Shared exception, if the call failed
+        """
+        flight.result = result
+        flight.error = error
+        with self._lock:
+            if error is not None:
+                self.counters["errors"] += 1
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.done.set()
+
+    def wait(self, flight: Flight, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for the leader of a flight.
+
+        Args:
+            flight: Flight joined with join_or_lead
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            Any: The shared result
+
+        Raises:
+            TimeoutError: If the leader did not finish in time
+            Exception: The exception raised by the shared call
+        """
+        if not flight.done.wait(timeout):
+            with self._lock:
+                self.counters["timeouts"] += 1
+            raise TimeoutError(f"Shared LLM call did not finish within {timeout:.1f}s.")
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def do(self, key: str, func: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run func for key, or wait for an identical call already in flight.
+
+        Args:
+            key: Coalescing key (see prompt_key)
+            func: Zero-argument function performing the request
+            timeout: Maximum seconds to wait for another caller's call (None = no limit)
+
+        Returns:
+            Any: The shared result
+
+        Raises:
+            TimeoutError: If the call in flight did not finish in time
+            Exception: The exception raised by the shared call
+        """
+        flight, leader = self.join_or_lead(key)
+        if not leader:
+            return self.wait(flight, timeout)
+
+        try:
+            result = func()
+        except Exception as e:
+            self.complete(key, flight, error=e)
+            raise
+        except BaseException as e:
+            # Never leave waiters blocked on an interrupted leader
+            self.complete(key, flight, error=RuntimeError(f"Shared LLM call interrupted: {e!r}"))
+            raise
+        self.complete(key, flight, result=result)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report coalescing counters.
+
+        Returns:
+            Dict: Calls, executions, coalesced calls, errors and current flights
+        """
+        with self._lock:
+            return dict(self.counters, in_flight=len(self._flights))
+
+
+# Shared by every ConversationManager in the process
+llm_single_flight = SingleFlight()
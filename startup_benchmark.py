@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the TalentScout modules.
+
+Each module is imported in a fresh interpreter with `python -X importtime`.
+The benchmark reports its cumulative import time and its slowest
+dependencies. It fails (exit code 1) when a module exceeds the time budget
+or pulls in a heavy SDK that should only be imported on first use.
+
+Usage:
+    python startup_benchmark.py
+    python startup_benchmark.py --budget-ms 150 --repeat 5 chatbot config
+    python startup_benchmark.py --json > startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# Modules every worker imports on startup (app.py needs a Streamlit runtime)
+DEFAULT_MODULES = [
+    "config",
+    "chatbot",
+    "llm_backend",
+    "write_behind",
+    "outbox",
+    "candidate_store",
+    "candidate_index",
+    "session_checkpoint",
+    "session_model",
+    "session_registry",
+]
+
+# Heavy SDKs that must only be imported on first use
+LAZY_MODULES = ["streamlit", "google.generativeai", "supabase", "httpx", "pyarrow"]
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse `python -X importtime` output.
+
+    Args:
+        output: The interpreter's stderr
+
+    Returns:
+        List[Tuple]: (module, self microseconds, cumulative microseconds, nesting depth)
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # Header line
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return imports
+
+
+def measure_import(module: str, repeat: int = 3, top: int = 5) -> Dict[str, Any]:
+    """
+    Measure the import of a module in fresh interpreters.
+
+    Args:
+        module: Module to import
+        repeat: Number of runs (the fastest one is reported)
+        top: Number of slowest dependencies to report
+
+    Returns:
+        Dict: Import time (ms), module count, slowest dependencies and heavy SDKs imported
+    """
+    best = None
+    for _ in range(max(1, repeat)):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+            return {"module": module, "error": error}
+        imports = parse_importtime(result.stderr)
+        total = next((cumulative for name, _, cumulative, depth in reversed(imports)
+                      if name == module and depth == 0), 0)
+        if best is None or total < best[0]:
+            best = (total, imports)
+
+    total, imports = best
+    # Everything the module pulled in (interpreter startup imports come before it)
+    start = max(i for i, (name, _, _, depth) in enumerate(imports) if name == module and depth == 0)
+    first = start
+    while first > 0 and imports[first - 1][3] > 0:
+        first -= 1
+    own = imports[first:start + 1]
+    names = {name for name, _, _, _ in own}
+    return {
+        "module": module,
+        "import_ms": round(total / 1000, 1),
+        "modules_imported": len(own),
+        "slowest": [
+            {"module": name, "self_ms": round(self_us / 1000, 1)}
+            for name, self_us, _, _ in sorted(own, key=lambda item: -item[1])[:top]
+        ],
+        "lazy_violations": [lazy for lazy in LAZY_MODULES if lazy in names]
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from config import STARTUP_IMPORT_BUDGET_MS
+
+    parser = argparse.ArgumentParser(description="Check module import times against a budget.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to measure")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_IMPORT_BUDGET_MS,
+                        help="Maximum cumulative import time per module")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module (the fastest is kept)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest dependencies to show per module")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = [measure_import(module, repeat=args.repeat, top=args.top) for module in args.modules]
+    failures = []
+    for result in results:
+        if "error" in result:
+            failures.append(f"{result['module']}: import failed ({result['error']})")
+            continue
+        if result["import_ms"] > args.budget_ms:
+            failures.append(f"{result['module']}: {result['import_ms']} ms exceeds the {args.budget_ms:.0f} ms budget")
+        if result["lazy_violations"]:
+            failures.append(f"{result['module']}: imports {', '.join(result['lazy_violations'])} at startup")
+
+    if args.json:
+        print(json.dumps({"budget_ms": args.budget_ms, "results": results, "failures": failures}, indent=2))
+    else:
+        print(f"{'module':<22}{'import ms':>10}{'modules':>9}  slowest dependencies")
+        for result in results:
+            if "error" in result:
+                print(f"{result['module']:<22}{'error':>10}")
+                continue
+            slowest = ", ".join(f"{item['module']} {item['self_ms']}" for item in result["slowest"])
+            print(f"{result['module']:<22}{result['import_ms']:>10.1f}{result['modules_imported']:>9}  {slowest}")
+        for failure in failures:
+            print(f"[ERROR] {failure}")
+        if not failures:
+            print(f"\nAll modules import within {args.budget_ms:.0f} ms without heavy SDKs.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
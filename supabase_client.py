@@ -0,0 +1,98 @@
+"""
+Lazily created, process-wide Supabase client.
+
+The client (and its HTTP connection pool) is built on the first write, so
+importing config or running offline tooling never touches the network. All
+writes share one keep-alive pool, sized and timed by the SUPABASE_POOL_* and
+SUPABASE_TIMEOUT_SECONDS settings, which is closed when the process exits.
+"""
+import atexit
+import threading
+import time
+from typing import Any, Dict
+
+_supabase_client = None
+_http_client = None
+_created_at = None
+_supabase_client_lock = threading.Lock()
+
+
+def _create_supabase_client() -> Any:
+    """
+    Build the Supabase client on a pooled keep-alive HTTP client.
+
+    Returns:
+        supabase.Client: New client
+    """
+    global _http_client
+    import httpx
+    from supabase import ClientOptions, create_client
+    from config import (
+        SUPABASE_URL,
+        SUPABASE_KEY,
+        SUPABASE_POOL_MAX_CONNECTIONS,
+        SUPABASE_POOL_MAX_KEEPALIVE,
+        SUPABASE_POOL_KEEPALIVE_SECONDS,
+        SUPABASE_TIMEOUT_SECONDS
+    )
+
+    _http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=SUPABASE_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=SUPABASE_POOL_KEEPALIVE_SECONDS
+        ),
+        timeout=httpx.Timeout(SUPABASE_TIMEOUT_SECONDS)
+    )
+    try:
+        options = ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT_SECONDS, httpx_client=_http_client)
+    except TypeError:
+        # Older supabase releases manage their own (keep-alive) session per client
+        _http_client.close()
+        _http_client = None
+        options = ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT_SECONDS)
+    return create_client(SUPABASE_URL, SUPABASE_KEY, options=options)
+
+
+def get_supabase_client() -> Any:
+    """
+    Return the process-wide Supabase client, creating it on first use.
+
+    Returns:
+        supabase.Client: Shared client instance
+    """
+    global _supabase_client, _created_at
+    if _supabase_client is None:
+        with _supabase_client_lock:
+            if _supabase_client is None:
+                started = time.perf_counter()
+                _supabase_client = _create_supabase_client()
+                _created_at = time.time()
+                atexit.register(close_supabase_client)
+                print(f"DEBUG: Supabase client created in {(time.perf_counter() - started) * 1000:.1f} ms")
+    return _supabase_client
+
+
+def close_supabase_client() -> None:
+    """Close the shared connection pool; the next write creates a new client."""
+    global _supabase_client, _http_client, _created_at
+    with _supabase_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+        _supabase_client = None
+        _http_client = None
+        _created_at = None
+
+
+def supabase_client_info() -> Dict[str, Any]:
+    """
+    Report whether the shared client exists.
+
+    Returns:
+        Dict: created flag, creation time and whether a pooled HTTP client is used
+    """
+    return {
+        "created": _supabase_client is not None,
+        "created_at": _created_at,
+        "pooled": _http_client is not None
+    }
@@ -0,0 +1,48 @@
+"""
+Tests for the Parquet analytics export: incremental runs and the latest version of each candidate.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("pyarrow")
+
+from analytics_export import AnalyticsExporter, summarize
+
+
+@pytest.fixture
+def record(record):
+    """The shared record factory plus the fields the export reads."""
+    def make(email, version=1, status="incomplete", submitted="2025-07-01 10:00:00", **fields):
+        return record(email, version=version, **dict({
+            "experience": "3 years", "tech_stack": ["python"], "interview_status": status, "submission_time": submitted
+        }, **fields))
+    return make
+
+
+def test_load_candidates_returns_only_the_newest_version(tmp_path, record):
+    exporter = AnalyticsExporter(str(tmp_path))
+    exporter.export([record("a@x.com"), record("b@x.com", submitted="2025-07-01 10:00:01")])
+    assert exporter.export([record("a@x.com", version=2, status="complete", submitted="2025-07-02 09:00:00")]) == {
+        "candidates": 1, "responses": 0, "days": 1
+    }
+
+    table = exporter.load_candidates(["email", "version", "interview_status"])
+    rows = sorted(zip(table["email"].to_pylist(), table["version"].to_pylist(),
+                      table["interview_status"].cast("string").to_pylist()))
+    assert rows == [("a@x.com", 2, "complete"), ("b@x.com", 1, "incomplete")]
+    assert summarize(exporter)["statuses"] == {"complete": 1, "incomplete": 1}
+
+
+def test_export_only_appends_records_saved_since_the_last_run(tmp_path, record):
+    exporter = AnalyticsExporter(str(tmp_path))
+    first = [record("a@x.com", technical_responses={
+        "question_1": {"question": "What is a GIL?", "answer": "A lock", "technology": "python", "difficulty": "easy"}
+    })]
+    assert exporter.export(first)["responses"] == 1
+    assert exporter.export(first) == {"candidates": 0, "responses": 0, "days": 0}
+    assert exporter.load_candidates(since="2025-07-02").num_rows == 0
+    assert exporter.dataset("responses").to_table().num_rows == 1
@@ -0,0 +1,114 @@
+"""
+Tests for the memory-mapped candidate archive: lookups, appends, torn appends and refreshing readers.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from candidate_archive import ArchiveError, CandidateArchive, FOOTER, append_archive, build_archive
+
+
+def test_lookups_by_candidate_key_and_email(tmp_path, record):
+    path = str(tmp_path / "candidates.archive")
+    assert build_archive(path, [
+        record("a@example.com", "s1", position="Dev"),
+        record("b@example.com", "s1"),
+        record("a@example.com", "s2", position="Lead"),
+        record("a@example.com", "s1", version=2, position="Senior Dev")
+    ]) == 4
+
+    with CandidateArchive(path) as archive:
+        assert len(archive) == 4
+        assert archive.stats()["live"] == 3
+        assert archive.get("a@example.com#s1")["position"] == "Senior Dev"
+        # An email alone finds every session; get returns the newest
+        assert [archive.key(position) for position in archive.find(" A@Example.com ")] == [
+            "a@example.com#s2", "a@example.com#s1"
+        ]
+        assert archive.get("a@example.com")["position"] == "Senior Dev"
+        assert archive.get("missing@example.com") is None
+        assert sorted(item["email"] for item in archive) == ["a@example.com", "a@example.com", "b@example.com"]
+
+
+def test_append_keeps_only_newer_versions(tmp_path, record):
+    path = str(tmp_path / "candidates.archive")
+    build_archive(path, [record("a@example.com", position="Dev")])
+    assert append_archive(path, [
+        record("a@example.com", position="Dev"),
+        record("a@example.com", version=2, position="Lead"),
+        record("b@example.com")
+    ]) == 2
+    size = os.path.getsize(path)
+    # Nothing new: the file is not touched
+    assert append_archive(path, [record("a@example.com", version=2), record("b@example.com")]) == 0
+    assert os.path.getsize(path) == size
+
+    with CandidateArchive(path) as archive:
+        assert (len(archive), archive.stats()["live"]) == (3, 2)
+        assert archive.get("a@example.com#s1")["position"] == "Lead"
+
+
+def test_torn_append_falls_back_to_the_previous_footer(tmp_path, capsys, record):
+    path = str(tmp_path / "candidates.archive")
+    build_archive(path, [record("a@example.com")])
+    intact = os.path.getsize(path)
+    append_archive(path, [record("b@example.com")])
+    # Crash: the second append's tables and footer never fully reached the disk
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - FOOTER.size // 2)
+
+    with CandidateArchive(path) as archive:
+        assert archive.stats() == {"records": 1, "live": 1, "bytes": intact}
+        assert archive.get("b@example.com") is None
+    assert "unfinished append" in capsys.readouterr().out
+
+    # The next append writes over the torn bytes
+    assert append_archive(path, [record("b@example.com"), record("c@example.com")]) == 2
+    with CandidateArchive(path) as archive:
+        assert sorted(item["email"] for item in archive) == ["a@example.com", "b@example.com", "c@example.com"]
+
+
+def test_open_reader_keeps_its_view_until_refresh(tmp_path, record):
+    path = str(tmp_path / "candidates.archive")
+    build_archive(path, [record("a@example.com")])
+    with CandidateArchive(path) as archive:
+        assert not archive.refresh()
+        append_archive(path, [record("b@example.com")])
+        assert archive.get("b@example.com") is None
+        assert archive.refresh()
+        assert archive.get("b@example.com")["email"] == "b@example.com"
+
+        build_archive(path, [record("c@example.com")])
+        assert archive.refresh()
+        assert [item["email"] for item in archive] == ["c@example.com"]
+
+
+def test_refresh_keeps_the_mapping_when_the_new_file_is_invalid(tmp_path, record):
+    path = str(tmp_path / "candidates.archive")
+    build_archive(path, [record("a@example.com")])
+    with CandidateArchive(path) as archive:
+        with open(path + ".tmp", "wb") as f:
+            f.write(b"\0" * 200)
+        os.replace(path + ".tmp", path)
+        assert not archive.refresh()
+        assert archive.get("a@example.com")["email"] == "a@example.com"
+
+
+def test_invalid_files_are_rejected(tmp_path, record):
+    with pytest.raises(ArchiveError):
+        CandidateArchive(str(tmp_path / "missing.archive"))
+    short = tmp_path / "short.archive"
+    short.write_bytes(b"TSCA")
+    with pytest.raises(ArchiveError):
+        CandidateArchive(str(short))
+
+    path = str(tmp_path / "candidates.archive")
+    build_archive(path, [record("a@example.com")])
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b"\xff")
+    with pytest.raises(ArchiveError):
+        CandidateArchive(path)
@@ -0,0 +1,130 @@
+"""
+Tests for the SQLite candidate index: versioned upserts, tech queries, rebuilds and concurrent writers.
+"""
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import candidate_index
+from candidate_index import CandidateIndex, parse_experience_years
+from candidate_store import CandidateStore
+
+
+@pytest.fixture
+def record(record):
+    """The shared record factory plus the fields the index reads."""
+    def make(email, version=1, techs=("python",), status="complete", submitted="2025-07-01 10:00:00", **fields):
+        return record(email, version=version, **dict({
+            "experience": "3 years", "tech_stack": list(techs), "interview_status": status, "submission_time": submitted
+        }, **fields))
+    return make
+
+
+def emails(rows):
+    return [row["email"] for row in rows]
+
+
+def test_parse_experience_years():
+    assert parse_experience_years("3 years") == 3.0
+    assert parse_experience_years("about 2.5") == 2.5
+    assert parse_experience_years("none") is None
+    assert parse_experience_years(None) is None
+
+
+def test_query_filters_newest_first(tmp_path, record):
+    index = CandidateIndex(str(tmp_path / "index.db"))
+    index.upsert(record("a@example.com", techs=["Python", "SQL"], submitted="2025-07-01 10:00:00"))
+    index.upsert(record("b@example.com", techs=["python", "sql", "go"], submitted="2025-07-03 10:00:00"))
+    index.upsert(record("c@example.com", techs=["python"], submitted="2025-07-02 10:00:00"))
+    index.upsert(record("d@example.com", techs=["python", "sql"], status="abandoned", experience="10"))
+
+    assert emails(index.query(techs=["python", "sql"], status="complete")) == ["b@example.com", "a@example.com"]
+    assert emails(index.query(techs=["python"], submitted_after="2025-07-02")) == ["b@example.com", "c@example.com"]
+    assert emails(index.query(min_experience=5)) == ["d@example.com"]
+    assert emails(index.query(email=" A@Example.com ")) == ["a@example.com"]
+    assert index.query(email="a@example.com")[0]["tech_stack"] == ["python", "sql"]
+    assert emails(index.query(techs=["python"], limit=1)) == ["b@example.com"]
+
+
+def test_common_and_rare_tech_plans_agree(tmp_path, monkeypatch, record):
+    index = CandidateIndex(str(tmp_path / "index.db"))
+    for number in range(30):
+        techs = ["python", "elixir"] if number % 10 == 0 else ["python"]
+        index.upsert(record(f"c{number}@example.com", techs=techs, submitted=f"2025-07-01 10:00:{number:02d}"))
+
+    rare = emails(index.query(techs=["python", "elixir"]))
+    # Too common to drive the query: falls back to the submission time walk
+    monkeypatch.setattr(candidate_index, "RARE_TECH_ROWS", 1)
+    assert emails(index.query(techs=["python", "elixir"])) == rare == [
+        "c20@example.com", "c10@example.com", "c0@example.com"
+    ]
+
+
+def test_older_versions_never_replace_newer(tmp_path, record):
+    index = CandidateIndex(str(tmp_path / "index.db"))
+    index.upsert(record("a@example.com", version=2, techs=["go"], status="complete"))
+    # A late, out-of-order delivery of version 1
+    index.upsert(record("a@example.com", version=1, techs=["python"], status="incomplete"))
+
+    row = index.query(email="a@example.com")[0]
+    assert (row["version"], row["interview_status"], row["tech_stack"]) == (2, "complete", ["go"])
+    index.upsert(record("a@example.com", version=3, techs=["rust"]))
+    assert index.query(email="a@example.com")[0]["tech_stack"] == ["rust"]
+    assert index.stats()["tech_links"] == 1
+
+
+def test_rebuild_from_store_scan_replaces_the_index(tmp_path, record):
+    store = CandidateStore(str(tmp_path / "store"))
+    store.upsert(record("a@example.com", techs=["python"], status="incomplete"))
+    store.upsert(record("a@example.com", techs=["python", "sql"], status="complete"))
+    store.upsert(record("b@example.com", techs=["java"]))
+    store.close()
+
+    index = CandidateIndex(str(tmp_path / "index.db"))
+    index.upsert(record("stale@example.com"))
+    reader = CandidateStore(str(tmp_path / "store"), read_only=True)
+    assert index.rebuild(reader.scan(latest_only=False), batch_size=1) == 3
+    assert index.stats() == {"candidates": 2, "tech_links": 3, "statuses": {"complete": 2}}
+    assert emails(index.query(techs=["sql"])) == ["a@example.com"]
+
+
+def test_outdated_schema_is_recreated(tmp_path, record):
+    path = str(tmp_path / "index.db")
+    CandidateIndex(path).upsert(record("a@example.com"))
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    index = CandidateIndex(path)
+    assert index.stats()["candidates"] == 0
+    index.upsert(record("a@example.com"))
+    assert emails(index.query()) == ["a@example.com"]
+
+
+def test_concurrent_upserts_and_queries(tmp_path, record):
+    index = CandidateIndex(str(tmp_path / "index.db"))
+    errors = []
+
+    def write(worker):
+        try:
+            for number in range(50):
+                index.upsert(record(f"w{worker}-{number}@example.com", techs=["python", f"t{worker}"]))
+                index.query(techs=["python"], limit=5)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert index.stats()["candidates"] == 200
+    assert len(index.query(techs=["t2"], limit=1000)) == 50
@@ -0,0 +1,134 @@
+"""
+Tests for the segmented candidate store: versioning, torn tails, locking and compaction.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from candidate_store import CandidateStore, CandidateStoreError, SEGMENT_PREFIX, encode_record, scan_segments
+
+
+def segment_paths(directory):
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory) if name.startswith(SEGMENT_PREFIX)
+    )
+
+
+def test_upsert_versions_and_skips_unchanged(tmp_path, record):
+    store = CandidateStore(str(tmp_path))
+    first, written = store.upsert(record("a@example.com", position="Dev"))
+    assert written and first["version"] == 1
+    _, written = store.upsert(record("a@example.com", position="Dev"))
+    assert not written
+    second, written = store.upsert(record("a@example.com", position="Lead"))
+    assert written and second["version"] == 2
+    store.close()
+
+    reopened = CandidateStore(str(tmp_path))
+    assert reopened.get("a@example.com#s1")["position"] == "Lead"
+    assert reopened.version("a@example.com#s1") == 2
+    reopened.close()
+
+
+def test_writer_truncates_torn_tail_on_reopen(tmp_path, record):
+    store = CandidateStore(str(tmp_path))
+    store.upsert(record("a@example.com"))
+    store.close()
+    path = segment_paths(str(tmp_path))[-1]
+    intact = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(encode_record(record("b@example.com"))[:-7])
+
+    store = CandidateStore(str(tmp_path))
+    assert os.path.getsize(path) == intact
+    assert store.keys() == ["a@example.com#s1"]
+    store.upsert(record("b@example.com"))
+    store.close()
+
+    reopened = CandidateStore(str(tmp_path), read_only=True)
+    assert sorted(reopened.keys()) == ["a@example.com#s1", "b@example.com#s1"]
+
+
+def test_reader_never_truncates_or_writes(tmp_path, record):
+    store = CandidateStore(str(tmp_path))
+    store.upsert(record("a@example.com"))
+    path = segment_paths(str(tmp_path))[-1]
+    # An append still in progress looks like a torn tail to a reader
+    store._active.write(encode_record(record("b@example.com"))[:-7])
+    store._active.flush()
+    size = os.path.getsize(path)
+
+    reader = CandidateStore(str(tmp_path), read_only=True)
+    assert os.path.getsize(path) == size
+    assert [item["email"] for item in reader.scan()] == ["a@example.com"]
+    with pytest.raises(CandidateStoreError):
+        reader.upsert(record("c@example.com"))
+    with pytest.raises(CandidateStoreError):
+        reader.compact()
+    store.close()
+
+
+def test_second_writer_is_refused_until_the_first_closes(tmp_path):
+    store = CandidateStore(str(tmp_path))
+    with pytest.raises(CandidateStoreError):
+        CandidateStore(str(tmp_path))
+    # Readers are not affected by the writer lock
+    CandidateStore(str(tmp_path), read_only=True).close()
+    store.close()
+    CandidateStore(str(tmp_path)).close()
+
+
+def test_compact_keeps_latest_versions(tmp_path, record):
+    store = CandidateStore(str(tmp_path), segment_bytes=200)
+    for position in ("Dev", "Senior Dev", "Lead"):
+        store.upsert(record("a@example.com", position=position))
+    store.upsert(record("b@example.com", position="QA"))
+    old_segments = segment_paths(str(tmp_path))
+    assert len(old_segments) > 1
+
+    result = store.compact()
+    assert result["records_before"] == 4 and result["records_after"] == 2
+    assert not set(old_segments) & set(segment_paths(str(tmp_path)))
+    assert store.get("a@example.com#s1")["position"] == "Lead"
+    store.upsert(record("c@example.com"))
+    store.close()
+
+    reopened = CandidateStore(str(tmp_path), read_only=True)
+    assert {item["email"]: item["version"] for item in reopened.scan()} == {
+        "a@example.com": 3, "b@example.com": 1, "c@example.com": 1
+    }
+    assert len(list(reopened.scan(latest_only=False))) == 3
+
+
+def test_writer_compacts_itself_while_holding_the_lock(tmp_path, record):
+    store = CandidateStore(str(tmp_path), segment_bytes=300, wait_for_lock=True, compact_segments=3)
+    store.upsert(record("b@example.com", position="QA"))
+    # A long-running app: one candidate saved over and over, never compacted from the CLI
+    for number in range(200):
+        store.upsert(record("a@example.com", answers=number))
+    stats = store.stats()
+    assert stats["segments"] <= 4 and stats["records"] < 20
+    assert store.get("a@example.com#s1")["version"] == 200
+    store.close()
+
+    reopened = CandidateStore(str(tmp_path), read_only=True)
+    assert {item["email"]: item["version"] for item in reopened.scan()} == {"a@example.com": 200, "b@example.com": 1}
+
+
+def test_scan_segments_streams_latest_versions_beside_the_writer(tmp_path, record):
+    store = CandidateStore(str(tmp_path), segment_bytes=200)
+    for position in ("Dev", "Lead"):
+        store.upsert(record("a@example.com", position=position))
+    store.upsert(record("b@example.com", position="QA"))
+    store._active.write(encode_record(record("c@example.com"))[:-7])
+    store._active.flush()
+
+    assert [(item["email"], item["position"]) for item in scan_segments(str(tmp_path))] == [
+        ("a@example.com", "Lead"), ("b@example.com", "QA")
+    ]
+    assert len(list(scan_segments(str(tmp_path), latest_only=False))) == 3
+    assert list(scan_segments(str(tmp_path / "missing"))) == []
+    store.close()
@@ -0,0 +1,123 @@
+"""
+Tests for the LLM retry policy and circuit breaker, driven by the offline fake backend.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from llm_backend import FakeBackend, FakeBackendError
+from llm_retry import (
+    CircuitBreaker, CircuitOpenError, EmptyResponseError, RetryPolicy, attempt_timeout, is_retryable_error
+)
+
+
+def fake_backend(**kwargs):
+    return FakeBackend(**dict({"latency_ms": 0, "latency_sigma": 0, "seed": 1}, **kwargs))
+
+
+def flaky(backend, failures, code=503):
+    """A call that fails `failures` times with the given status code, then asks the backend."""
+    calls = []
+
+    def call(prompt):
+        calls.append(prompt)
+        if len(calls) <= failures:
+            raise FakeBackendError("Injected failure.", code=code)
+        return backend.generate(prompt)
+    return call, calls
+
+
+def fast_policy(**kwargs):
+    return RetryPolicy(**dict({"max_attempts": 4, "deadline": 5.0, "base_delay": 0.001, "max_delay": 0.002}, **kwargs))
+
+
+def test_retryable_errors():
+    assert is_retryable_error(FakeBackendError("Busy.", code=503))
+    assert is_retryable_error(FakeBackendError("Quota.", code=429))
+    assert is_retryable_error(EmptyResponseError("No text."))
+    assert is_retryable_error(TimeoutError())
+    assert is_retryable_error(type("ServiceUnavailable", (Exception,), {})())
+    assert not is_retryable_error(FakeBackendError("Bad request.", code=400))
+    assert not is_retryable_error(CircuitOpenError())
+    assert not is_retryable_error(ValueError())
+
+
+def test_transient_failures_are_retried_until_the_backend_answers():
+    call, calls = flaky(fake_backend(), failures=2)
+    assert "software engineering" in fast_policy().call(call, "Generate 3 questions")
+    assert len(calls) == 3
+
+
+def test_errors_are_raised_when_not_retryable_or_attempts_run_out():
+    call, calls = flaky(fake_backend(), failures=1, code=400)
+    with pytest.raises(FakeBackendError):
+        fast_policy().call(call, "prompt")
+    assert len(calls) == 1
+
+    call, calls = flaky(fake_backend(), failures=10)
+    with pytest.raises(FakeBackendError):
+        fast_policy(max_attempts=3).call(call, "prompt")
+    assert len(calls) == 3
+
+
+def test_each_attempt_is_bounded_by_the_time_left():
+    assert attempt_timeout() is None
+    # Every request hangs for 2 s; the deadline is 0.2 s
+    backend = fake_backend(latency_ms=2000)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        fast_policy(deadline=0.2).call(backend.generate, "prompt")
+    assert time.monotonic() - started < 1.0
+    assert attempt_timeout() is None
+
+
+def test_breaker_opens_rejects_and_recovers_through_one_probe():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    backend = fake_backend(error_rate=1.0)
+    policy = fast_policy(max_attempts=1, breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(FakeBackendError):
+            policy.call(backend.generate, "prompt")
+    assert breaker.stats()["state"] == CircuitBreaker.OPEN
+
+    # Open: calls fail fast without reaching the backend
+    with pytest.raises(CircuitOpenError):
+        policy.call(backend.generate, "prompt")
+    assert backend.calls == 2
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    # Only one probe goes through while half-open
+    assert not breaker.allow_request()
+    breaker.record_success()
+
+    backend.error_rate = 0.0
+    assert policy.call(backend.generate, "prompt")
+    stats = breaker.stats()
+    assert (stats["state"], stats["trips"], stats["recoveries"], stats["rejections"]) == ("closed", 1, 1, 2)
+
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    policy = fast_policy(max_attempts=1, breaker=breaker)
+    backend = fake_backend(error_rate=1.0)
+    with pytest.raises(FakeBackendError):
+        policy.call(backend.generate, "prompt")
+    time.sleep(0.06)
+    with pytest.raises(FakeBackendError):
+        policy.call(backend.generate, "prompt")
+    assert breaker.stats()["state"] == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        policy.call(backend.generate, "prompt")
+
+
+def test_client_errors_do_not_count_against_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1)
+    call, _ = flaky(fake_backend(), failures=5, code=400)
+    with pytest.raises(FakeBackendError):
+        fast_policy(breaker=breaker).call(call, "prompt")
+    assert breaker.stats()["state"] == CircuitBreaker.CLOSED
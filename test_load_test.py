@@ -0,0 +1,45 @@
+"""
+Tests for the load-test harness: percentiles and a small end-to-end run against the fake backend.
+"""
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import config
+import question_bank
+import question_cache
+from load_test import main, percentile
+
+
+def test_percentile_uses_the_nearest_rank():
+    assert percentile([], 50) == 0.0
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert (percentile(values, 50), percentile(values, 95), percentile(values, 100)) == (3.0, 5.0, 5.0)
+    assert percentile([7.0], 99) == 7.0
+
+
+def test_small_run_completes_every_interview(tmp_path, monkeypatch, capsys):
+    # config is already imported, so point the shared cache and bank at the test directory directly
+    monkeypatch.setattr(config, "QUESTION_CACHE_PATH", str(tmp_path / "questions.sqlite3"))
+    monkeypatch.setattr(config, "QUESTION_BANK_PATH", str(tmp_path / "question_bank.sqlite3"))
+    monkeypatch.setattr(question_cache, "_question_cache", None)
+    monkeypatch.setattr(question_bank, "_question_bank", None)
+    output = tmp_path / "results.json"
+
+    assert main([
+        "--candidates", "6", "--concurrency", "3", "--think-ms", "0", "--latency-ms", "5",
+        "--latency-sigma", "0", "--use-local-cache", "--output", str(output)
+    ]) == 0
+    results = json.loads(output.read_text())
+    assert (results["interviews_completed"], results["interviews_failed"]) == (6, 0)
+    states = results["states"]
+    assert states["greeting"]["count"] == 6
+    assert states["confirming_info"]["count"] == 6
+    assert all(stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"] for stats in states.values())
+    # Each interview generates its questions at most once; stacks seen before come from the cache
+    llm = results["llm"]
+    assert 1 <= llm["backend_calls"] <= 6
+    assert llm["question_cache"]["entries"] <= llm["backend_calls"]
+    assert "Load Test Results" in capsys.readouterr().out
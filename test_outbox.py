@@ -0,0 +1,128 @@
+"""
+Tests for the remote-write outbox: crash replay, torn journals, superseded versions and journal ownership.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from candidate_store import encode_record
+from outbox import Outbox, OutboxError, main
+from write_behind import MemorySink
+
+
+def test_pending_entries_survive_a_restart(tmp_path, record):
+    path = str(tmp_path / "outbox.log")
+    outbox = Outbox(path)
+    first = outbox.add(record("a@example.com"))
+    outbox.add(record("b@example.com"))
+    outbox.ack([first])
+    # Crash: the journal is never compacted
+    outbox.close()
+
+    reopened = Outbox(path)
+    assert [item["email"] for _, item in reopened.pending()] == ["b@example.com"]
+    assert reopened.add(record("c@example.com")) == 3
+    reopened.close()
+
+
+def test_torn_journal_tail_is_dropped_by_the_owner_only(tmp_path, record):
+    path = str(tmp_path / "outbox.log")
+    outbox = Outbox(path)
+    outbox.add(record("a@example.com"))
+    outbox.close()
+    intact = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(encode_record({"op": "put", "id": 2, "record": record("b@example.com")})[:-5])
+
+    reader = Outbox(path, read_only=True)
+    assert len(reader.pending()) == 1
+    assert os.path.getsize(path) > intact
+    with pytest.raises(OutboxError):
+        reader.add(record("c@example.com"))
+
+    owner = Outbox(path)
+    assert os.path.getsize(path) == intact
+    owner.add(record("c@example.com"))
+    owner.close()
+    assert [item["email"] for _, item in Outbox(path, read_only=True).pending()] == [
+        "a@example.com", "c@example.com"
+    ]
+
+
+def test_replay_acks_sent_and_superseded_entries(tmp_path, record):
+    outbox = Outbox(str(tmp_path / "outbox.log"))
+    outbox.add(record("a@example.com", version=1))
+    outbox.add(record("a@example.com", version=2))
+    outbox.add(record("b@example.com", version=1))
+    sink = MemorySink()
+
+    result = outbox.replay(sink, batch_size=1, concurrency=2)
+    assert result == {"attempted": 3, "acked": 3, "superseded": 1, "failed": 0}
+    assert sorted((item["email"], item["version"]) for item in sink.records) == [
+        ("a@example.com", 2), ("b@example.com", 1)
+    ]
+    assert outbox.pending() == []
+
+    # A stale version arriving after the newer one was acknowledged is never sent
+    outbox.add(record("a@example.com", version=1))
+    assert outbox.replay(sink)["superseded"] == 1
+    assert len(sink.records) == 2
+    outbox.close()
+
+
+def test_failed_batches_stay_pending_for_the_next_replay(tmp_path, record):
+    path = str(tmp_path / "outbox.log")
+    outbox = Outbox(path)
+    for number in range(4):
+        outbox.add(record(f"c{number}@example.com"))
+
+    result = outbox.replay(MemorySink(fail_batches=1), batch_size=2, concurrency=1)
+    assert (result["acked"], result["failed"]) == (2, 2)
+    outbox.close()
+
+    reopened = Outbox(path)
+    sink = MemorySink()
+    assert reopened.replay(sink)["acked"] == 2
+    assert reopened.pending() == []
+    reopened.close()
+
+
+def test_compact_keeps_pending_entries_and_acked_versions(tmp_path, record):
+    path = str(tmp_path / "outbox.log")
+    outbox = Outbox(path)
+    acked = outbox.add(record("a@example.com", version=2))
+    outbox.add(record("b@example.com"))
+    outbox.ack([acked])
+    outbox.add(record("a@example.com", version=3))
+    before = os.path.getsize(path)
+    outbox.compact()
+    assert os.path.getsize(path) < before
+    outbox.close()
+
+    reopened = Outbox(path)
+    assert [(item["email"], item["version"]) for _, item in reopened.pending()] == [
+        ("b@example.com", 1), ("a@example.com", 3)
+    ]
+    # The acknowledged version 2 is still known after compaction
+    reopened.add(record("a@example.com", version=2))
+    assert reopened.replay(MemorySink())["superseded"] == 1
+    reopened.close()
+
+
+def test_second_owner_is_refused_while_the_journal_is_open(tmp_path, capsys, record):
+    path = str(tmp_path / "outbox.log")
+    outbox = Outbox(path)
+    outbox.add(record("a@example.com"))
+    with pytest.raises(OutboxError):
+        Outbox(path)
+
+    assert main(["--path", path, "drain", "--sink", "memory"]) == 1
+    assert "stop it before running drain" in capsys.readouterr().out
+    assert main(["--path", path, "status"]) == 0
+    outbox.close()
+
+    assert main(["--path", path, "drain", "--sink", "memory"]) == 0
+    assert Outbox(path, read_only=True).pending() == []
@@ -0,0 +1,37 @@
+"""
+Tests for the question bank: slot allocation and pools built by another process while the app runs.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from question_bank import QuestionBank, allocate_question_slots
+
+
+def pool(tech, count):
+    return [(("easy", "medium", "hard")[i % 3], f"{tech} question {i}") for i in range(count)]
+
+
+def test_allocate_question_slots():
+    assert allocate_question_slots([]) == {}
+    assert allocate_question_slots(["python"]) == {"python": 3}
+    assert allocate_question_slots(["python", "go"]) == {"python": 2, "go": 1}
+    assert allocate_question_slots(["a", "b", "c", "d", "e", "f"]) == {"a": 1, "b": 1, "c": 1, "d": 1, "e": 1}
+
+
+def test_pools_built_by_the_cli_are_used_without_a_restart(tmp_path):
+    path = str(tmp_path / "bank.sqlite3")
+    app_bank = QuestionBank(path)
+    cli_bank = QuestionBank(path)
+    assert app_bank.sample_for_stack(["python"]) == ([], ["python"], 3)
+
+    cli_bank.replace_tech("python", pool("python", 10))
+    questions, missing, slots = app_bank.sample_for_stack(["python"])
+    assert (len(questions), missing, slots) == (3, [], 0)
+    assert app_bank.coverage(["python", "go"])["covered"] == ["python"]
+
+    # A rebuild that shrinks the pool: positions past the new size are never drawn
+    cli_bank.replace_tech("python", pool("python", 2))
+    assert sorted(question for _, question in app_bank.sample("python", 5)) == ["python question 0", "python question 1"]
+    assert app_bank.coverage(["python"])["questions"] == 2
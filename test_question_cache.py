@@ -0,0 +1,78 @@
+"""
+Tests for the question cache: tech stack normalization, LRU eviction, expiry and persistence.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import question_cache
+from llm_backend import FakeBackend
+from question_cache import QuestionCache, normalize_tech_stack
+from questions import QUESTION_RESPONSE_SCHEMA, parse_questions_json
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def generated(tech_stack):
+    """Questions the fake backend generates for a stack, in the cached format."""
+    backend = FakeBackend(latency_ms=0, latency_sigma=0, seed=1)
+    reply = backend.generate(f"Generate 3 questions for this tech stack: {tech_stack}", QUESTION_RESPONSE_SCHEMA)
+    return [question.to_dict() for question in parse_questions_json(reply)]
+
+
+def test_equivalent_stacks_share_a_key():
+    assert normalize_tech_stack("Python, SQL") == normalize_tech_stack(["sql", " PYTHON ", "python"]) == "python,sql"
+    assert normalize_tech_stack([]) == ""
+
+
+def test_generated_questions_round_trip_and_survive_a_reopen(tmp_path):
+    path = str(tmp_path / "questions.sqlite3")
+    cache = QuestionCache(path)
+    questions = generated("python, sql")
+    assert cache.get(["python", "sql"]) is None
+    cache.put(["python", "sql"], questions)
+    assert cache.get(["SQL", "Python"]) == questions
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "entries": 1}
+
+    assert QuestionCache(path).get(["python", "sql"]) == questions
+    # Empty stacks and empty results are never cached
+    cache.put([], questions)
+    cache.put(["go"], [])
+    assert cache.stats()["entries"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(question_cache.time, "time", clock)
+    cache = QuestionCache(str(tmp_path / "questions.sqlite3"), max_entries=2)
+    for stack in (["python"], ["go"]):
+        cache.put(stack, generated(stack[0]))
+        clock.now += 1
+    # Reading python makes go the least recently used
+    assert cache.get(["python"])
+    clock.now += 1
+    cache.put(["rust"], generated("rust"))
+
+    assert cache.get(["go"]) is None
+    assert cache.get(["python"]) and cache.get(["rust"])
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_misses(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(question_cache.time, "time", clock)
+    cache = QuestionCache(str(tmp_path / "questions.sqlite3"), ttl_seconds=60)
+    cache.put(["python"], generated("python"))
+    clock.now += 30
+    assert cache.get(["python"])
+    # Reads do not extend the time-to-live
+    clock.now += 31
+    assert cache.get(["python"]) is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,64 @@
+"""
+Tests for structured question parsing: full JSON responses, streamed partial JSON and stored values.
+"""
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from llm_backend import FakeBackend
+from questions import QUESTION_RESPONSE_SCHEMA, TechnicalQuestion, completed_question_texts, parse_questions_json
+
+PROMPT = "Generate 4 technical questions for this tech stack: Python, Go"
+
+
+def test_fake_backend_json_is_parsed_into_questions():
+    reply = FakeBackend(latency_ms=0, latency_sigma=0, seed=1).generate(PROMPT, QUESTION_RESPONSE_SCHEMA)
+    questions = parse_questions_json(reply)
+    assert len(questions) == 4
+    assert [question.technology for question in questions] == ["python", "go", "python", "go"]
+    assert {question.difficulty for question in questions} <= {"easy", "medium", "hard"}
+
+
+def test_malformed_and_partial_items_are_skipped():
+    assert parse_questions_json("not json") == []
+    assert parse_questions_json(None) == []
+    assert parse_questions_json('{"questions": "none"}') == []
+    assert parse_questions_json(json.dumps({"questions": [
+        {"question": "  What is a goroutine?  ", "technology": " Go ", "difficulty": "HARD"},
+        {"question": "", "technology": "go"},
+        {"question": "Explain the GIL.", "difficulty": "trivial"},
+        42,
+        "Plain text question"
+    ]})) == [
+        TechnicalQuestion("What is a goroutine?", "go", "hard"),
+        TechnicalQuestion("Explain the GIL.", "", ""),
+        TechnicalQuestion("Plain text question")
+    ]
+    # A bare list (older cache entries) is accepted too
+    assert parse_questions_json('[{"text": "Q?"}]') == [TechnicalQuestion("Q?")]
+
+
+def test_streamed_chunks_show_only_completed_questions():
+    backend = FakeBackend(latency_ms=0, latency_sigma=0, chunk_count=7, seed=1)
+    received = ""
+    seen = []
+    for chunk in backend.stream(PROMPT, QUESTION_RESPONSE_SCHEMA):
+        received += chunk
+        texts = completed_question_texts(received)
+        # Questions appear in order and never change once shown
+        assert texts[:len(seen)] == seen
+        seen = texts
+    assert seen == [question.text for question in parse_questions_json(received)]
+
+
+def test_completed_question_texts_decodes_escapes():
+    partial = '{"questions": [{"question": "Why use \\"async\\"?\\nExplain.", "technology": "python"}, {"question": "Unfin'
+    assert completed_question_texts(partial) == ['Why use "async"?\nExplain.']
+
+
+def test_questions_round_trip_through_their_stored_form():
+    question = TechnicalQuestion("What is a closure?", "javascript", "medium")
+    assert TechnicalQuestion.from_value(question.to_dict()) == question
+    assert TechnicalQuestion.from_value(question) is question
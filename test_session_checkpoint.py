@@ -0,0 +1,118 @@
+"""
+Tests for the delta checkpoint log: what each commit writes, replay after a restart, torn tails and pruning.
+"""
+import os
+import sys
+import time
+import uuid
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from candidate_store import decode_record, encode_record
+from session_checkpoint import SessionCheckpoint, is_valid_session_id, prune_checkpoints
+
+
+def events(checkpoint):
+    with open(checkpoint.path, "rb") as f:
+        return [decode_record(line) for line in f]
+
+
+def test_session_ids_must_be_app_generated(tmp_path):
+    assert is_valid_session_id(uuid.uuid4().hex)
+    for session_id in (None, "", "../../etc/passwd", uuid.uuid4().hex.upper(), str(uuid.uuid4())):
+        assert not is_valid_session_id(session_id)
+    with pytest.raises(ValueError):
+        SessionCheckpoint(str(tmp_path), "../escape")
+
+
+def test_commits_write_only_the_changes(tmp_path):
+    checkpoint = SessionCheckpoint(str(tmp_path), uuid.uuid4().hex)
+    checkpoint.set("profile_hints", {"name": "Jane"})
+    checkpoint.append("transcript", ["hello", "hi"])
+    checkpoint.update("conversation", {"state": "greeting", "is_active": True})
+    assert checkpoint.commit() == 3
+
+    # Nothing changed
+    checkpoint.set("profile_hints", {"name": "Jane"})
+    checkpoint.append("transcript", ["hello", "hi"])
+    checkpoint.update("conversation", {"state": "greeting", "is_active": True})
+    assert checkpoint.commit() == 0
+
+    checkpoint.append("transcript", ["hello", "hi", "my name is Jane"])
+    checkpoint.update("conversation", {"state": "collecting_info", "is_active": True})
+    assert checkpoint.commit() == 2
+    assert events(checkpoint)[-2:] == [
+        {"op": "append", "name": "transcript", "items": ["my name is Jane"]},
+        {"op": "update", "name": "conversation", "values": {"state": "collecting_info"}}
+    ]
+
+
+def test_load_replays_the_log_and_resumes_deltas(tmp_path):
+    session_id = uuid.uuid4().hex
+    checkpoint = SessionCheckpoint(str(tmp_path), session_id)
+    checkpoint.append("questions", [{"q": 1}], encode=lambda item: dict(item, encoded=True))
+    checkpoint.update("answers", {"0": "first"})
+    checkpoint.commit()
+    checkpoint.update("answers", {"0": "first", "1": "second"})
+    checkpoint.set("status", "incomplete")
+    checkpoint.commit()
+
+    # A new worker process picks the session up
+    resumed = SessionCheckpoint(str(tmp_path), session_id)
+    assert resumed.load() == {
+        "questions": [{"q": 1, "encoded": True}],
+        "answers": {"0": "first", "1": "second"},
+        "status": "incomplete"
+    }
+    resumed.append("questions", [{"q": 1}, {"q": 2}])
+    resumed.update("answers", {"0": "first", "1": "second"})
+    resumed.set("status", "incomplete")
+    assert resumed.commit() == 1
+    assert SessionCheckpoint(str(tmp_path), session_id).load()["questions"] == [{"q": 1, "encoded": True}, {"q": 2}]
+
+
+def test_shorter_list_starts_the_list_over(tmp_path):
+    session_id = uuid.uuid4().hex
+    checkpoint = SessionCheckpoint(str(tmp_path), session_id)
+    checkpoint.append("transcript", ["a", "b", "c"])
+    checkpoint.commit()
+    checkpoint.append("transcript", ["x"])
+    checkpoint.commit()
+    assert events(checkpoint)[-1]["reset"] is True
+    assert SessionCheckpoint(str(tmp_path), session_id).load() == {"transcript": ["x"]}
+
+
+def test_torn_tail_is_truncated_on_load(tmp_path):
+    session_id = uuid.uuid4().hex
+    checkpoint = SessionCheckpoint(str(tmp_path), session_id)
+    checkpoint.update("conversation", {"state": "greeting"})
+    checkpoint.commit()
+    intact = os.path.getsize(checkpoint.path)
+    # The worker died halfway through a commit
+    with open(checkpoint.path, "ab") as f:
+        f.write(encode_record({"op": "update", "name": "conversation", "values": {"state": "ended"}})[:-4])
+
+    resumed = SessionCheckpoint(str(tmp_path), session_id)
+    assert resumed.load() == {"conversation": {"state": "greeting"}}
+    assert os.path.getsize(checkpoint.path) == intact
+    resumed.update("conversation", {"state": "ended"})
+    assert resumed.commit() == 1
+    assert SessionCheckpoint(str(tmp_path), session_id).load() == {"conversation": {"state": "ended"}}
+
+
+def test_discard_and_prune(tmp_path):
+    stale = SessionCheckpoint(str(tmp_path), uuid.uuid4().hex)
+    fresh = SessionCheckpoint(str(tmp_path), uuid.uuid4().hex)
+    discarded = SessionCheckpoint(str(tmp_path), uuid.uuid4().hex)
+    for checkpoint in (stale, fresh, discarded):
+        checkpoint.set("status", "incomplete")
+        checkpoint.commit()
+    old = time.time() - 3600
+    os.utime(stale.path, (old, old))
+
+    discarded.discard()
+    assert discarded.load() is None
+    assert prune_checkpoints(str(tmp_path), 600) == 1
+    assert not os.path.exists(stale.path) and os.path.exists(fresh.path)
@@ -0,0 +1,125 @@
+"""
+Tests for the session registry: idle and memory eviction, running sessions and eviction failures.
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from session_registry import SessionRegistry
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_registry(**kwargs):
+    clock = Clock()
+    registry = SessionRegistry(clock=clock, **kwargs)
+    evicted = []
+    return registry, clock, evicted, lambda session_id, state: evicted.append((session_id, state))
+
+
+def test_idle_sessions_are_evicted_with_their_state():
+    registry, clock, evicted, evict = make_registry(idle_ttl_seconds=60)
+    registry.touch("a", {"id": "a"}, 100)
+    clock.now += 30
+    registry.touch("b", {"id": "b"}, 200)
+    clock.now += 40
+
+    assert registry.sweep(evict) == ["a"]
+    assert evicted == [("a", {"id": "a"})]
+    assert registry.stats()["live_sessions"] == 1
+    assert registry.stats()["total_bytes"] == 200
+    assert registry.stats()["evicted_idle"] == 1
+
+
+def test_memory_ceiling_evicts_least_recently_active_first():
+    registry, clock, evicted, evict = make_registry(idle_ttl_seconds=0, max_total_bytes=250)
+    for session_id in ("a", "b", "c"):
+        registry.touch(session_id, {}, 100)
+        clock.now += 1
+    # Activity moves a session to the back of the line
+    registry.touch("a", {}, 100)
+
+    assert registry.sweep(evict, exclude="b") == ["c"]
+    assert [session["session_id"] for session in registry.sessions()] == ["a", "b"]
+    assert registry.stats()["evicted_memory"] == 1
+
+
+def test_running_sessions_are_never_evicted():
+    registry, clock, evicted, evict = make_registry(idle_ttl_seconds=60, max_total_bytes=50)
+    registry.touch("a", {}, 100)
+    registry.touch("b", {}, 100)
+    clock.now += 120
+
+    with registry.running("a"):
+        # Runs nest: a widget callback, then the script
+        with registry.running("a"):
+            pass
+        assert registry.stats()["running_sessions"] == 1
+        assert registry.sweep(evict) == ["b"]
+        assert [session["running"] for session in registry.sessions()] == [True]
+    assert registry.stats()["running_sessions"] == 0
+    assert registry.sweep(evict) == ["a"]
+
+
+def test_run_starting_during_an_eviction_waits_for_it():
+    registry, clock, _, _ = make_registry(idle_ttl_seconds=60)
+    registry.touch("a", {}, 100)
+    clock.now += 120
+    evicting = threading.Event()
+    order = []
+
+    def slow_evict(session_id, state):
+        evicting.set()
+        time.sleep(0.2)
+        order.append("evicted")
+
+    sweeper = threading.Thread(target=registry.sweep, args=(slow_evict,))
+    sweeper.start()
+    assert evicting.wait(5)
+    with registry.running("a"):
+        order.append("run")
+    sweeper.join(5)
+    assert order == ["evicted", "run"]
+
+
+def test_failed_evictions_are_counted_and_do_not_block_runs():
+    registry, clock, evicted, evict = make_registry(idle_ttl_seconds=60)
+    registry.touch("a", {}, 100)
+    registry.touch("b", {}, 100)
+    clock.now += 120
+
+    def flaky_evict(session_id, state):
+        if session_id == "a":
+            raise OSError("disk full")
+        evict(session_id, state)
+
+    assert registry.sweep(flaky_evict) == ["b"]
+    assert registry.stats()["eviction_failures"] == 1
+    with registry.running("a"):
+        pass
+
+
+def test_forget_and_sweeper_thread():
+    registry, clock, evicted, evict = make_registry(idle_ttl_seconds=60)
+    registry.touch("a", {}, 100)
+    registry.forget("a")
+    assert registry.stats()["total_bytes"] == 0
+
+    registry.touch("b", {}, 100)
+    clock.now += 120
+    registry.start_sweeper(evict, 0.01)
+    registry.start_sweeper(evict, 0.01)
+    deadline = time.monotonic() + 5
+    while not evicted and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert evicted == [("b", {})]
+    assert sum(thread.name == "session-sweeper" for thread in threading.enumerate()) == 1
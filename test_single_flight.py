@@ -0,0 +1,116 @@
+"""
+Tests for single-flight request coalescing: shared results and errors, leaders and waiter timeouts.
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from llm_backend import FakeBackend, FakeBackendError
+from single_flight import SingleFlight, prompt_key
+
+PROMPT = "Generate 3 technical questions for this tech stack: python, go"
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+    start = threading.Barrier(count)
+
+    def run(index):
+        start.wait()
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_prompt_key_depends_on_model_and_prompt():
+    assert prompt_key("gemini", PROMPT) == prompt_key("gemini", PROMPT)
+    assert prompt_key("gemini", PROMPT) != prompt_key("fake", PROMPT)
+    assert prompt_key("gemini", PROMPT) != prompt_key("gemini", PROMPT + " ")
+
+
+def test_identical_concurrent_prompts_call_the_backend_once():
+    flights = SingleFlight()
+    backend = FakeBackend(latency_ms=200, latency_sigma=0, seed=1)
+    key = prompt_key(backend.model_name, PROMPT)
+
+    results = run_concurrently(8, lambda: flights.do(key, lambda: backend.generate(PROMPT), timeout=5))
+    assert backend.calls == 1
+    assert len(set(results)) == 1 and "python" in results[0]
+    stats = flights.stats()
+    assert (stats["calls"], stats["executions"], stats["coalesced"], stats["in_flight"]) == (8, 1, 7, 0)
+
+    # Once the flight has landed, the next caller makes a new request
+    flights.do(key, lambda: backend.generate(PROMPT))
+    assert backend.calls == 2
+
+
+def test_the_leaders_error_is_shared_and_not_cached():
+    flights = SingleFlight()
+    backend = FakeBackend(latency_ms=0, latency_sigma=0, error_rate=1.0, seed=1)
+    key = prompt_key(backend.model_name, PROMPT)
+
+    def slow_failure():
+        # The fake fails before its latency, so hold the flight open long enough for the others to join
+        time.sleep(0.2)
+        return backend.generate(PROMPT)
+
+    results = run_concurrently(4, lambda: flights.do(key, slow_failure, timeout=5))
+    assert backend.calls == 1
+    assert all(isinstance(result, FakeBackendError) and result.code == 503 for result in results)
+    assert flights.stats()["errors"] == 1
+
+    backend.error_rate = 0.0
+    assert "python" in flights.do(key, lambda: backend.generate(PROMPT))
+
+
+def test_waiters_time_out_on_a_hung_leader():
+    flights = SingleFlight()
+    flight, leader = flights.join_or_lead("key")
+    assert leader
+    joined, follower_leads = flights.join_or_lead("key")
+    assert joined is flight and not follower_leads
+    with pytest.raises(TimeoutError):
+        flights.wait(joined, timeout=0.05)
+    assert flights.stats()["timeouts"] == 1
+
+    flights.complete("key", flight, result=["question"])
+    assert flights.wait(joined, timeout=0.05) == ["question"]
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_interrupted_leader_releases_its_waiters():
+    flights = SingleFlight()
+    leading = threading.Event()
+    release = threading.Event()
+
+    def interrupted():
+        leading.set()
+        release.wait(5)
+        raise KeyboardInterrupt
+
+    def lead():
+        with pytest.raises(KeyboardInterrupt):
+            flights.do("key", interrupted)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    assert leading.wait(5)
+    flight, is_leader = flights.join_or_lead("key")
+    assert not is_leader
+    release.set()
+    leader.join(5)
+    with pytest.raises(RuntimeError, match="interrupted"):
+        flights.wait(flight, timeout=5)
@@ -0,0 +1,227 @@
+"""
+Tests for the write-behind queue: batching, retries, outbox redelivery, backpressure and shutdown.
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from outbox import Outbox
+from write_behind import MemorySink, QueueFullError, WriteBehindQueue, latest_versions
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        time.sleep(0.01)
+
+
+class BlockingSink(MemorySink):
+    """Memory sink whose writes wait until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def write_batch(self, records):
+        self.started.set()
+        self.release.wait(5)
+        super().write_batch(records)
+
+
+def test_latest_versions_keeps_one_record_per_identity(record):
+    records = [record(email, version=version) for email, version in [
+        ("a@example.com", 1), ("B@example.com", 1), ("a@example.com", 3), ("b@example.com", 2), ("a@example.com", 2)
+    ]]
+    assert [(item["email"], item["version"]) for item in latest_versions(records)] == [
+        ("a@example.com", 3), ("b@example.com", 2)
+    ]
+
+
+def test_records_are_batched_and_flushed(record):
+    sink = MemorySink()
+    wb = WriteBehindQueue(sink, batch_size=10, flush_interval=0.05)
+    for number in range(25):
+        wb.submit(record(f"c{number}@example.com"))
+    assert wb.flush(timeout=5)
+    assert len(sink.records) == 25
+    assert all(len(batch) <= 10 for batch in sink.batches)
+    assert wb.stats()["written"] == 25
+    wb.close()
+
+
+def test_failed_batches_are_retried_then_dropped_without_an_outbox(record):
+    sink = MemorySink(fail_batches=1)
+    wb = WriteBehindQueue(sink, flush_interval=0.01, retry_delay=0.01)
+    wb.submit(record("a@example.com"))
+    assert wb.flush(timeout=5)
+    assert [item["email"] for item in sink.records] == ["a@example.com"]
+
+    sink.fail_batches = 2
+    wb.max_write_attempts = 2
+    wb.submit(record("b@example.com"))
+    assert wb.flush(timeout=5)
+    stats = wb.stats()
+    assert (stats["write_failures"], stats["dropped"], stats["written"]) == (3, 1, 1)
+    wb.close()
+
+
+def test_failed_batch_is_redelivered_from_the_outbox(tmp_path, record):
+    outbox = Outbox(str(tmp_path / "outbox.log"))
+    sink = MemorySink(fail_batches=1)
+    wb = WriteBehindQueue(sink, flush_interval=0.01, max_write_attempts=1, outbox=outbox,
+                          redelivery_interval=0.1)
+    wb.submit(record("a@example.com"))
+
+    wait_until(lambda: sink.records)
+    assert [item["email"] for item in sink.records] == ["a@example.com"]
+    wb.close()
+    stats = wb.stats()
+    assert (stats["deferred"], stats["redelivered"], stats["outbox_pending"]) == (1, 1, 0)
+    outbox.close()
+
+
+def test_redelivery_never_writes_an_older_version_over_a_newer_one(tmp_path, record):
+    outbox = Outbox(str(tmp_path / "outbox.log"))
+    sink = MemorySink(fail_batches=1)
+    wb = WriteBehindQueue(sink, flush_interval=0.01, max_write_attempts=1, outbox=outbox,
+                          redelivery_interval=0.1)
+    wb.submit(dict(record("a@example.com", version=1), interview_status="incomplete"))
+    wait_until(lambda: wb.stats()["deferred"] == 1)
+    wb.submit(dict(record("a@example.com", version=2), interview_status="complete"))
+
+    wait_until(lambda: wb.stats()["superseded"] == 1)
+    assert wb.flush(timeout=5)
+    wb.close()
+    assert [(item["version"], item["interview_status"]) for item in sink.records] == [(2, "complete")]
+    assert outbox.pending() == []
+    assert wb.stats()["redelivered"] == 0
+    outbox.close()
+
+
+def test_entries_in_flight_are_not_redelivered(tmp_path, record):
+    outbox = Outbox(str(tmp_path / "outbox.log"))
+    sink = BlockingSink()
+    wb = WriteBehindQueue(sink, flush_interval=0.01, outbox=outbox, redelivery_interval=0.05)
+    wb.submit(record("a@example.com"))
+    assert sink.started.wait(5)
+    # Several redelivery intervals pass while the batch is being written
+    time.sleep(0.3)
+    assert wb.enqueue_pending() == 0
+    sink.release.set()
+    assert wb.flush(timeout=5)
+    wb.close()
+
+    assert len(sink.records) == 1
+    assert wb.stats()["redelivered"] == 0
+    outbox.close()
+
+
+def test_pending_entries_from_a_crashed_run_are_queued_at_startup(tmp_path, record):
+    path = str(tmp_path / "outbox.log")
+    crashed = Outbox(path)
+    crashed.add(record("a@example.com"))
+    crashed.add(record("b@example.com"))
+    crashed.close()
+
+    outbox = Outbox(path)
+    sink = MemorySink()
+    wb = WriteBehindQueue(sink, flush_interval=0.01, outbox=outbox, redelivery_interval=0)
+    assert wb.enqueue_pending() == 2
+    assert wb.flush(timeout=5)
+    assert sorted(item["email"] for item in sink.records) == ["a@example.com", "b@example.com"]
+    assert outbox.pending() == []
+    wb.close()
+    outbox.close()
+
+
+def test_full_queue_rejects_but_keeps_the_record_journaled(tmp_path, record):
+    outbox = Outbox(str(tmp_path / "outbox.log"))
+    sink = BlockingSink()
+    wb = WriteBehindQueue(sink, batch_size=1, flush_interval=0.01, max_queue_size=1, submit_timeout=0.05,
+                          outbox=outbox, redelivery_interval=0)
+    wb.submit(record("a@example.com"))
+    assert sink.started.wait(5)
+    wb.submit(record("b@example.com"))
+    with pytest.raises(QueueFullError):
+        wb.submit(record("c@example.com"))
+    assert wb.stats()["rejected"] == 1
+
+    sink.release.set()
+    assert wb.flush(timeout=5)
+    assert [item["email"] for _, item in outbox.pending()] == ["c@example.com"]
+    assert wb.enqueue_pending() == 1
+    assert wb.flush(timeout=5)
+    assert outbox.pending() == []
+    wb.close()
+    outbox.close()
+
+
+def test_close_returns_with_a_full_queue_and_refuses_new_records(record):
+    sink = BlockingSink()
+    wb = WriteBehindQueue(sink, batch_size=1, flush_interval=0.01, max_queue_size=1, submit_timeout=0.05)
+    wb.submit(record("a@example.com"))
+    assert sink.started.wait(5)
+    wb.submit(record("b@example.com"))
+
+    closer = threading.Thread(target=wb.close)
+    closer.start()
+    sink.release.set()
+    closer.join(5)
+    assert not closer.is_alive()
+    wb._worker.join(5)
+    assert not wb._worker.is_alive()
+    assert [item["email"] for item in sink.records] == ["a@example.com", "b@example.com"]
+    with pytest.raises(QueueFullError):
+        wb.submit(record("c@example.com"))
+
+
+def test_journal_is_compacted_while_writes_keep_failing(tmp_path, monkeypatch, record):
+    import outbox as outbox_module
+
+    monkeypatch.setattr(outbox_module, "COMPACT_BYTES", 2048)
+    outbox = Outbox(str(tmp_path / "outbox.log"))
+    sink = MemorySink(fail_batches=10 ** 6)
+    wb = WriteBehindQueue(sink, batch_size=1, flush_interval=0.01, max_write_attempts=1, outbox=outbox,
+                          redelivery_interval=0)
+    # An outage: every save of the same record adds a version and nothing is acknowledged remotely
+    for version in range(1, 201):
+        wb.submit(dict(record("a@example.com", version=version), padding="x" * 100))
+        if version % 20 == 0:
+            assert wb.flush(timeout=5)
+            wb.enqueue_pending()
+    assert wb.flush(timeout=5)
+    wb.close()
+
+    # Uncompacted, the journal would hold all 200 versions (about 48 KB)
+    assert os.path.getsize(outbox.path) < 16 * 1024
+    assert [item["version"] for _, item in outbox.pending()] == [200]
+    outbox.close()
+    assert [item["version"] for _, item in Outbox(outbox.path, read_only=True).pending()] == [200]
+
+
+def test_missing_upsert_key_is_reported_without_retrying(monkeypatch, record):
+    import config
+    from write_behind import RemoteSchemaError, SupabaseSink
+
+    class APIError(Exception):
+        code = "42P10"
+
+    def store_user_data(records):
+        raise APIError("there is no unique or exclusion constraint matching the ON CONFLICT specification")
+
+    monkeypatch.setattr(config, "store_user_data", store_user_data)
+    with pytest.raises(RemoteSchemaError, match="001_users_upsert_key.sql"):
+        SupabaseSink().write_batch([record("a@example.com")])
+
+    wb = WriteBehindQueue(SupabaseSink(), flush_interval=0.01, retry_delay=0.01)
+    wb.submit(record("a@example.com"))
+    assert wb.flush(timeout=5)
+    wb.close()
+    assert (wb.stats()["write_failures"], wb.stats()["dropped"]) == (1, 1)
@@ -3,7 +3,8 @@ Utility functions for the TalentScout Hiring Assistant.
 """
 
 import re
-from typing import Dict, List, Any
+from datetime import datetime
+from typing import Dict, List, Any, Optional
 
 
 def validate_email(email: str) -> bool:
@@ -134,4 +135,39 @@ def parse_tech_stack(tech_stack_text: str) -> List[str]:
             unique_technologies.append(tech)
     
     print(f"DEBUG: Parsed tech stack '{tech_stack_text}' into: {unique_technologies}")
-    return unique_technologies
\ No newline at end of file
+    return unique_technologies
+
+
+def format_message_html(role: str, content: str, timestamp: Optional[str] = None) -> str:
+    """
+    Build the styled HTML of a chat message based on the role.
+
+    Args:
+        role: 'user' or 'assistant'
+        content: Message content
+        timestamp: Optional timestamp for the message
+
+    Returns:
+        str: HTML for st.markdown
+    """
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%H:%M:%S")
+    # Ensure content is properly formatted for HTML
+    content = content.replace("\n", "<br>")
+    if role == "user":
+        return f"""
+        <div class="chat-message user">
+            <div class="message-content">
+                <b>You:</b> {content}
+            </div>
+            <div class="message-timestamp">{timestamp}</div>
+        </div>
+        """
+    return f"""
+        <div class="chat-message assistant">
+            <div class="message-content">
+                <b>Hiring Assistant:</b> {content}
+            </div>
+            <div class="message-timestamp">{timestamp}</div>
+        </div>
+        """
@@ -0,0 +1,461 @@
+"""
+Write-behind persistence for candidate records.
+
+save_user_data hands records to a WriteBehindQueue and returns immediately.
+A background worker groups pending records into bulk inserts, flushed when a
+batch is full or when the oldest pending record has waited flush_interval
+seconds. A bounded queue applies backpressure when the sink falls behind.
+
+With an outbox, every record is journaled before it is queued and
+acknowledged once its batch is written, so records from failed batches or
+a crashed process are replayed instead of lost (see outbox.py). The worker
+re-queues entries still pending in the outbox every redelivery_interval
+seconds, so a failed batch is retried while the app runs, not only at the
+next start.
+
+Sinks implement write_batch(records):
+- SupabaseSink upserts a batch with a single request
+- MemorySink keeps batches in memory (local stand-in for tests)
+"""
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Flush latencies kept for the percentile metrics
+LATENCY_SAMPLES = 256
+
+# Longest the idle worker sleeps before checking for close and redelivery
+POLL_SECONDS = 1.0
+
+
+# Postgres/PostgREST errors meaning the users table lacks the upsert key or a column
+# (missing ON CONFLICT unique index, undefined column, column not in the schema cache)
+SCHEMA_ERROR_CODES = {"42P10", "42703", "PGRST204"}
+
+MIGRATION_PATH = "migrations/001_users_upsert_key.sql"
+
+
+class QueueFullError(Exception):
+    """Raised when a record cannot be queued before the submit timeout."""
+
+
+class RemoteSchemaError(Exception):
+    """Raised when the remote users table is missing the (email, session_id) key or a column."""
+
+
+def latest_versions(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Keep only the newest version of each (email, session_id) identity in a batch.
+
+    Args:
+        records: Batch of candidate records
+
+    Returns:
+        List[Dict]: One record per identity, in first-seen order
+    """
+    latest = {}
+    for record in records:
+        identity = (str(record.get("email", "")).lower(), record.get("session_id"))
+        current = latest.get(identity)
+        if current is None or record.get("version", 0) >= current.get("version", 0):
+            latest[identity] = record
+    return list(latest.values())
+
+
+class SupabaseSink:
+    """Bulk upserts into the Supabase users table."""
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        from config import store_user_data
+
+        try:
+            # One upsert statement cannot touch the same row twice
+            store_user_data(latest_versions(records))
+        except Exception as e:
+            if getattr(e, "code", None) in SCHEMA_ERROR_CODES:
+                raise RemoteSchemaError(
+                    f"The Supabase users table needs the upsert key and columns from {MIGRATION_PATH}: {e}"
+                ) from e
+            raise
+
+
+class MemorySink:
+    """
+    In-memory sink recording every batch it receives.
+    """
+
+    def __init__(self, latency: float = 0.0, fail_batches: int = 0):
+        """
+        Args:
+            latency: Seconds each write takes
+            fail_batches: Number of initial writes that raise an error
+        """
+        self.latency = latency
+        self.fail_batches = fail_batches
+        self.batches = []
+        self._lock = threading.Lock()
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """All records written so far, in order."""
+        with self._lock:
+            return [record for batch in self.batches for record in batch]
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            if self.fail_batches > 0:
+                self.fail_batches -= 1
+                raise ConnectionError("Memory sink write failed.")
+            self.batches.append(list(records))
+
+
+class WriteBehindQueue:
+    """
+    Bounded queue drained into a sink by a background worker.
+    """
+
+    def __init__(
+        self,
+        sink: Any,
+        batch_size: int = 20,
+        flush_interval: float = 2.0,
+        max_queue_size: int = 1000,
+        submit_timeout: float = 1.0,
+        max_write_attempts: int = 3,
+        retry_delay: float = 0.5,
+        outbox: Any = None,
+        redelivery_interval: float = 30.0
+    ):
+        """
+        Args:
+            sink: Object with a write_batch(records) method
+            batch_size: Maximum records per bulk insert
+            flush_interval: Maximum seconds a record waits for its batch to fill
+            max_queue_size: Pending records before submit() blocks
+            submit_timeout: Seconds submit() blocks on a full queue before failing
+            max_write_attempts: Attempts per batch before it is dropped
+            retry_delay: Base delay between attempts (doubled each retry)
+            outbox: Outbox journaling records until they are written, or None
+            redelivery_interval: Seconds between re-queues of entries left pending
+                in the outbox by failed batches (0 = only at startup)
+        """
+        self.sink = sink
+        self.outbox = outbox
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.submit_timeout = submit_timeout
+        self.max_write_attempts = max(1, max_write_attempts)
+        self.retry_delay = retry_delay
+        self.redelivery_interval = redelivery_interval
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        # Outbox entry ids currently queued or being written; never redelivered
+        self._queued_ids = set()
+        self._queued_lock = threading.Lock()
+        self._next_redelivery = time.monotonic() + redelivery_interval
+        self._latencies = []
+        self._closed = False
+        self.counters = {
+            "submitted": 0,
+            "rejected": 0,
+            "written": 0,
+            "batches": 0,
+            "write_failures": 0,
+            "dropped": 0,
+            "deferred": 0,
+            "redelivered": 0,
+            "superseded": 0
+        }
+        self._worker = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._worker.start()
+
+    def submit(self, record: Dict[str, Any]) -> None:
+        """
+        Queue a record for writing.
+
+        Args:
+            record: Candidate record
+
+        Raises:
+            QueueFullError: If the queue stayed full for submit_timeout seconds
+            (with an outbox, the record stays journaled for a later replay)
+        """
+        if self._closed:
+            raise QueueFullError("Write-behind queue is closed.")
+        entry_id = None
+        if self.outbox is not None:
+            # Registered before redelivery can see the entry pending in the outbox
+            with self._queued_lock:
+                entry_id = self.outbox.add(record)
+                self._queued_ids.add(entry_id)
+        try:
+            self._queue.put((entry_id, record), timeout=self.submit_timeout)
+        except queue.Full:
+            self._release([(entry_id, record)])
+            with self._lock:
+                self.counters["rejected"] += 1
+            raise QueueFullError(f"Write-behind queue is full ({self._queue.maxsize} pending records).")
+        with self._lock:
+            self.counters["submitted"] += 1
+
+    def enqueue_pending(self) -> int:
+        """
+        Queue outbox entries left pending by an earlier run or a failed batch, without blocking.
+
+        Entries already queued or being written are skipped, and entries superseded
+        by a newer version of the same record are acknowledged instead of queued,
+        so an old version is never written over a newer one.
+
+        Returns:
+            int: Number of entries queued
+        """
+        if self.outbox is None:
+            return 0
+        queued = 0
+        with self._queued_lock:
+            entries, superseded = self.outbox.deliverable()
+            if superseded:
+                with self._lock:
+                    self.counters["superseded"] += superseded
+            for entry_id, record in entries:
+                if entry_id in self._queued_ids:
+                    continue
+                try:
+                    self._queue.put_nowait((entry_id, record))
+                except queue.Full:
+                    break
+                self._queued_ids.add(entry_id)
+                queued += 1
+        return queued
+
+    def _release(self, batch: List[Tuple[Optional[int], Dict[str, Any]]]) -> None:
+        """Forget that a batch's outbox entries are queued, so redelivery may pick them up."""
+        if self.outbox is None:
+            return
+        with self._queued_lock:
+            self._queued_ids.difference_update(entry_id for entry_id, _ in batch)
+
+    def _redeliver_due(self) -> None:
+        """Re-queue pending outbox entries if the redelivery interval has elapsed."""
+        if self.outbox is None or self._closed or not self.redelivery_interval:
+            return
+        if time.monotonic() < self._next_redelivery:
+            return
+        self._next_redelivery = time.monotonic() + self.redelivery_interval
+        redelivered = self.enqueue_pending()
+        if redelivered:
+            with self._lock:
+                self.counters["redelivered"] += redelivered
+            print(f"DEBUG: Write-behind redelivering {redelivered} pending outbox entries")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued record has been written (or dropped).
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if the queue drained in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Stop accepting records, write what is pending and stop the worker.
+
+        Args:
+            timeout: Maximum seconds to wait for pending records
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            # The worker notices the closed flag once it has drained the queue
+            pass
+        self._worker.join(timeout)
+
+    def _next_batch(self) -> Optional[List[Tuple[Optional[int], Dict[str, Any]]]]:
+        """Block for the next batch; None once the queue is closed and empty."""
+        while True:
+            self._redeliver_due()
+            wait = POLL_SECONDS
+            if self.outbox is not None and self.redelivery_interval:
+                wait = min(wait, max(0.0, self._next_redelivery - time.monotonic()))
+            try:
+                first = self._queue.get(timeout=wait)
+                break
+            except queue.Empty:
+                if self._closed:
+                    return None
+        if first is None:
+            self._queue.task_done()
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                record = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if record is None:
+                # Write what we have, then stop
+                self._queue.task_done()
+                try:
+                    self._queue.put_nowait(None)
+                except queue.Full:
+                    pass
+                break
+            batch.append(record)
+        return batch
+
+    def _write(self, batch: List[Tuple[Optional[int], Dict[str, Any]]]) -> None:
+        """Write a batch with retries, recording latency and outcome."""
+        started = time.perf_counter()
+        for attempt in range(1, self.max_write_attempts + 1):
+            try:
+                self.sink.write_batch([record for _, record in batch])
+                break
+            except Exception as e:
+                with self._lock:
+                    self.counters["write_failures"] += 1
+                print(f"[ERROR] Write-behind batch of {len(batch)} failed (attempt {attempt}): {e}")
+                # Retrying cannot fix the remote schema; the batch waits for redelivery
+                if attempt == self.max_write_attempts or isinstance(e, RemoteSchemaError):
+                    # Journaled records stay pending in the outbox for a later replay
+                    with self._lock:
+                        self.counters["deferred" if self.outbox is not None else "dropped"] += len(batch)
+                    return
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+        if self.outbox is not None:
+            self.outbox.ack([entry_id for entry_id, _ in batch if entry_id is not None])
+
+        latency = time.perf_counter() - started
+        with self._lock:
+            self.counters["written"] += len(batch)
+            self.counters["batches"] += 1
+            self._latencies.append(latency)
+            del self._latencies[:-LATENCY_SAMPLES]
+        print(f"DEBUG: Write-behind flushed {len(batch)} records in {latency * 1000:.1f} ms")
+
+    def _run(self) -> None:
+        """Worker loop."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self._write(batch)
+            finally:
+                self._release(batch)
+                for _ in batch:
+                    self._queue.task_done()
+            if self.outbox is not None:
+                # Keeps the journal bounded while writes fail and entries stay pending
+                try:
+                    self.outbox.compact_if_large()
+                except OSError as e:
+                    print(f"[ERROR] Write-behind could not compact the outbox: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report queue depth, throughput counters and flush latency.
+
+        Returns:
+            Dict: Counters plus queue_depth, outbox_pending and flush latency (ms) p50/p95/max/last
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            last = self._latencies[-1] if self._latencies else 0.0
+            stats = dict(self.counters, queue_depth=self._queue.qsize())
+        stats["outbox_pending"] = self.outbox.stats()["pending"] if self.outbox is not None else 0
+
+        def pct(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+
+        stats.update(
+            flush_latency_p50_ms=pct(0.50),
+            flush_latency_p95_ms=pct(0.95),
+            flush_latency_max_ms=latencies[-1] * 1000 if latencies else 0.0,
+            flush_latency_last_ms=last * 1000
+        )
+        return stats
+
+
+_write_behind_queue = None
+_write_behind_queue_lock = threading.Lock()
+
+
+def create_sink(name: str) -> Any:
+    """
+    Create a sink by name.
+
+    Args:
+        name: "supabase" or "memory"
+
+    Returns:
+        Sink object with write_batch(records)
+    """
+    name = name.lower()
+    if name == "supabase":
+        return SupabaseSink()
+    if name == "memory":
+        return MemorySink()
+    raise ValueError(f"Unknown persistence sink: {name}")
+
+
+def get_write_behind_queue() -> WriteBehindQueue:
+    """
+    Return the process-wide write-behind queue, starting it on first use.
+
+    Records left in the outbox by an earlier run are queued again, and
+    pending records are flushed when the process exits.
+
+    Returns:
+        WriteBehindQueue: Shared queue instance
+    """
+    global _write_behind_queue
+    if _write_behind_queue is None:
+        from config import (
+            PERSIST_SINK,
+            PERSIST_BATCH_SIZE,
+            PERSIST_FLUSH_INTERVAL_SECONDS,
+            PERSIST_QUEUE_MAX_SIZE,
+            PERSIST_SUBMIT_TIMEOUT_SECONDS,
+            PERSIST_REDELIVERY_INTERVAL_SECONDS
+        )
+        from outbox import get_outbox
+        with _write_behind_queue_lock:
+            if _write_behind_queue is None:
+                _write_behind_queue = WriteBehindQueue(
+                    create_sink(PERSIST_SINK),
+                    batch_size=PERSIST_BATCH_SIZE,
+                    flush_interval=PERSIST_FLUSH_INTERVAL_SECONDS,
+                    max_queue_size=PERSIST_QUEUE_MAX_SIZE,
+                    submit_timeout=PERSIST_SUBMIT_TIMEOUT_SECONDS,
+                    outbox=get_outbox(),
+                    redelivery_interval=PERSIST_REDELIVERY_INTERVAL_SECONDS
+                )
+                replayed = _write_behind_queue.enqueue_pending()
+                if replayed:
+                    print(f"DEBUG: Replaying {replayed} pending outbox entries")
+                atexit.register(_write_behind_queue.close)
+    return _write_behind_queue